@@ -0,0 +1,113 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from graph import CompiledGraph, compile_graph, HOPS
+from graph_file import attach_graph, share_graph
+from route import Route
+from route_builder import SEARCH_METRICS
+from shortest_paths import INF, ShortestPathTree
+
+#граф, який робочий процес підключає один раз при старті, і блок спільної пам'яті під його масивами
+_worker_graph: Optional[CompiledGraph] = None
+_worker_memory = None
+#скільки порцій груп припадає на один процес, якщо chunksize не задано
+CHUNKS_PER_PROCESS = 4
+
+
+def _init_worker(name: str) -> None:
+    global _worker_graph, _worker_memory
+    _worker_graph, _worker_memory = attach_graph(name)
+
+
+def _solve_group(graph: CompiledGraph, origin: str, metric: str, requests: List[Tuple[int, str]]):
+    """Один пошук з міста origin на всі міста призначення групи.
+
+    Повертає [(номер запиту, фініш, ребра шляху або None)].
+    """
+    if origin not in graph.index:
+        return [(number, end, None) for number, end in requests]
+    tree = ShortestPathTree(graph, origin, metric)
+    results = []
+    for number, end in requests:
+        #як і FewestStopsStrategy, пошук з найменшою кількістю пересадок не повертає маршрут у те саме місто
+        if end not in graph.index or tree.distance_to(end) == INF or (metric == HOPS and end == origin):
+            results.append((number, end, None))
+        else:
+            results.append((number, end, tree.edges_to(end)))
+    return results
+
+
+def _solve_chunk_in_worker(chunk: List[tuple]):
+    return [(origin, _solve_group(_worker_graph, origin, metric, requests))
+            for origin, metric, requests in chunk]
+
+
+def _group_queries(queries: Iterable[Tuple[str, str, int]]):
+    groups = {}
+    for number, (start, end, search_type) in enumerate(queries):
+        groups.setdefault((start, SEARCH_METRICS[search_type]), []).append((number, end))
+    return groups
+
+
+def iter_route_batch(graph_data, queries: Iterable[Tuple[str, str, int]], compact: bool = False,
+                     processes: Optional[int] = None, chunksize: Optional[int] = None) -> Iterator[tuple]:
+    """Відповідає на пакет запитів (старт, фініш, тип пошуку) по одному пошуку на місто відправлення.
+
+    Видає пари (номер запиту, результат) у порядку завершення груп. Результат -
+    ``Route`` (або ``[]``, якщо шляху немає), а при ``compact=True`` - кортеж
+    ``(старт, фініш, ціна, тривалість, кількість сегментів)`` або ``None``.
+    При ``processes`` групи розподіляються між процесами порціями по ``chunksize``
+    груп: граф публікується один раз у спільній пам'яті, процеси підключаються до
+    неї без копіювання, а результати кожної порції видаються, щойно вона готова.
+    """
+    graph = compile_graph(graph_data)
+    groups = _group_queries(queries)
+
+    if processes is None:
+        for (origin, metric), requests in groups.items():
+            yield from _materialize(graph, origin, _solve_group(graph, origin, metric, requests), compact)
+        return
+
+    tasks = [(origin, metric, requests) for (origin, metric), requests in groups.items()]
+    if chunksize is None:
+        chunksize = max(1, -(-len(tasks) // (processes * CHUNKS_PER_PROCESS)))
+    memory = share_graph(graph)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(memory.name,)) as executor:
+            futures = [executor.submit(_solve_chunk_in_worker, tasks[i:i + chunksize])
+                       for i in range(0, len(tasks), chunksize)]
+            try:
+                for future in as_completed(futures):
+                    for origin, results in future.result():
+                        yield from _materialize(graph, origin, results, compact)
+            finally:
+                #споживач міг припинити ітерацію - решту порцій не рахуємо
+                for future in futures:
+                    future.cancel()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def route_batch(graph_data, queries: Iterable[Tuple[str, str, int]], compact: bool = False,
+                processes: Optional[int] = None, chunksize: Optional[int] = None) -> list:
+    """Те саме, що ``iter_route_batch``, але список результатів у порядку запитів."""
+    queries = list(queries)
+    results = [None] * len(queries)
+    for number, result in iter_route_batch(graph_data, queries, compact, processes, chunksize):
+        results[number] = result
+    return results
+
+
+def _materialize(graph: CompiledGraph, origin: str, results, compact: bool):
+    prices = graph.prices
+    durations = graph.durations
+    for number, end, edges in results:
+        if edges is None:
+            yield number, (None if compact else [])
+        elif compact:
+            yield number, (origin, end, sum(prices[edge] for edge in edges),
+                           sum(durations[edge] for edge in edges), len(edges))
+        else:
+            yield number, Route.from_edges(graph, graph.index[origin], edges)
@@ -0,0 +1,276 @@
+"""
+Бенчмарк пошуку маршрутів і оформлення квитків.
+
+Приклади:
+    python bench.py --sizes 1000 10000
+    python bench.py --save-baseline bench_baseline.json
+    python bench.py --baseline bench_baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from graph import CompiledGraph, DURATION, PRICE
+from loader import GraphBuilder
+from route import Route
+from route_builder import (
+    AStarRouteStrategy,
+    AlternativeRoutesStrategy,
+    BidirectionalRouteStrategy,
+    CheapestRouteStrategy,
+    ConstrainedRouteStrategy,
+    ContractionRouteStrategy,
+    EarliestArrivalStrategy,
+    FastestRouteStrategy,
+    FewestStopsStrategy,
+    ParetoRouteStrategy,
+)
+from ticket import TicketManager
+
+TRANSPORTS = ('Bus', 'Train', 'Plane')
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+PERCENTILES = (50, 90, 99)
+#скільки запитів із загальної кількості виконується під tracemalloc
+MEMORY_QUERIES = 5
+
+
+def _segment(rng: random.Random, destination: str, price: float, duration: float) -> dict:
+    return {'destination': destination, 'price': price, 'duration_hours': duration,
+            'transport_type': rng.choice(TRANSPORTS)}
+
+
+def grid_graph(edges: int, seed: int = 1) -> CompiledGraph:
+    """Сітка side x side з сегментами в обидва боки; 4 * side * (side - 1) ребер."""
+    rng = random.Random(seed)
+    side = max(2, round((1 + math.sqrt(1 + edges)) / 2))
+    builder = GraphBuilder()
+    for row in range(side):
+        for col in range(side):
+            builder.add_city(f'C{row}_{col}')
+    for row in range(side):
+        for col in range(side):
+            for d_row, d_col in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                n_row, n_col = row + d_row, col + d_col
+                if 0 <= n_row < side and 0 <= n_col < side:
+                    builder.add_segment(f'C{row}_{col}', _segment(
+                        rng, f'C{n_row}_{n_col}', rng.randint(50, 500), rng.randint(1, 12)))
+    return builder.build()
+
+
+def scale_free_graph(edges: int, seed: int = 1, links: int = 2) -> CompiledGraph:
+    """Граф Барабаші-Альберт: кожне нове місто з'єднується з ``links`` містами пропорційно їх степеню."""
+    rng = random.Random(seed)
+    cities = max(links + 1, edges // (2 * links) + links)
+    builder = GraphBuilder()
+    for city in range(cities):
+        builder.add_city(f'C{city}')
+    #місто входить у список стільки разів, скільки має сполучень
+    endpoints = list(range(links))
+    for city in range(links, cities):
+        chosen = set()
+        while len(chosen) < links:
+            chosen.add(rng.choice(endpoints))
+        for other in chosen:
+            price, duration = rng.randint(50, 2000), rng.randint(1, 24)
+            builder.add_segment(f'C{city}', _segment(rng, f'C{other}', price, duration))
+            builder.add_segment(f'C{other}', _segment(rng, f'C{city}', price, duration))
+            endpoints.extend((city, other))
+    return builder.build()
+
+
+def geometric_graph(edges: int, seed: int = 1, degree: int = 6) -> CompiledGraph:
+    """Випадковий геометричний граф: міста в одиничному квадраті, сегменти між близькими містами."""
+    rng = random.Random(seed)
+    cities = max(2, edges // degree)
+    radius = math.sqrt(degree / (math.pi * cities))
+    points = [(rng.random(), rng.random()) for _ in range(cities)]
+    cells: Dict[tuple, List[int]] = {}
+    for city, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(city)
+
+    builder = GraphBuilder()
+    for city in range(cities):
+        builder.add_city(f'C{city}')
+    for city, (x, y) in enumerate(points):
+        cell_x, cell_y = int(x / radius), int(y / radius)
+        for d_x in (-1, 0, 1):
+            for d_y in (-1, 0, 1):
+                for other in cells.get((cell_x + d_x, cell_y + d_y), ()):
+                    distance = math.hypot(x - points[other][0], y - points[other][1])
+                    if other != city and distance <= radius:
+                        builder.add_segment(f'C{city}', _segment(
+                            rng, f'C{other}', round(50 + 3000 * distance), round(1 + 40 * distance, 2)))
+    return builder.build()
+
+
+GENERATORS = {
+    'grid': grid_graph,
+    'scale_free': scale_free_graph,
+    'geometric': geometric_graph,
+}
+
+#обмеження ціни для ConstrainedRouteStrategy, грн
+CONSTRAINED_BUDGET = 5_000
+
+#(фабрика стратегії, найбільший граф у ребрах, на якому її ще варто міряти)
+STRATEGIES = {
+    'CheapestRouteStrategy': (CheapestRouteStrategy, None),
+    'FastestRouteStrategy': (FastestRouteStrategy, None),
+    'FewestStopsStrategy': (FewestStopsStrategy, None),
+    'BidirectionalRouteStrategy': (lambda: BidirectionalRouteStrategy(PRICE), None),
+    'AStarRouteStrategy': (lambda: AStarRouteStrategy(PRICE), None),
+    'ContractionRouteStrategy': (lambda: ContractionRouteStrategy(PRICE), 10_000),
+    'ParetoRouteStrategy': (ParetoRouteStrategy, 10_000),
+    'AlternativeRoutesStrategy': (lambda: AlternativeRoutesStrategy(PRICE, k=3), 100_000),
+    'EarliestArrivalStrategy': (lambda: EarliestArrivalStrategy('08:00'), 100_000),
+    #найшвидший маршрут з обмеженням ціни; на великих графах бюджет частіше недосяжний
+    'ConstrainedRouteStrategy': (lambda: ConstrainedRouteStrategy(DURATION, PRICE, CONSTRAINED_BUDGET), 100_000),
+}
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """Перцентиль за найближчим рангом."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+def _summary(timings: List[float], peak: int, setup: float) -> dict:
+    result = {f'p{rank}_ms': percentile(timings, rank) * 1000 for rank in PERCENTILES}
+    result['mean_ms'] = sum(timings) / len(timings) * 1000
+    result['peak_kb'] = peak / 1024
+    result['setup_ms'] = setup * 1000
+    return result
+
+
+def measure(calls: List[Callable[[], object]]) -> dict:
+    """Час кожного виклику і пік пам'яті на перших MEMORY_QUERIES викликах.
+
+    Перший виклик - розігрів: у ньому будуються орієнтири, ієрархії, розклад.
+    """
+    started = time.perf_counter()
+    calls[0]()
+    setup = time.perf_counter() - started
+
+    timings = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        for call in calls[:MEMORY_QUERIES]:
+            call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return _summary(timings, peak, setup)
+
+
+def bench_graph(graph: CompiledGraph, queries: int, seed: int = 1) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    pairs = [(graph.names[rng.randrange(graph.node_count)], graph.names[rng.randrange(graph.node_count)])
+             for _ in range(queries)]
+    results = {}
+    for name, (factory, max_edges) in STRATEGIES.items():
+        if max_edges is not None and graph.edge_count > max_edges:
+            continue
+        strategy = factory()
+        results[name] = measure([lambda start=start, end=end: strategy.find_route(graph, start, end)
+                                 for start, end in pairs])
+
+    routes = [route for route in (CheapestRouteStrategy().find_route(graph, start, end)
+                                  for start, end in pairs) if route]
+    if routes:
+        results['Route'] = measure([lambda route=route: Route(route.cities[0], route.route_list)
+                                    for route in routes])
+        for compact in (False, True):
+            results['TicketManager.compact' if compact else 'TicketManager'] = measure(
+                [lambda route=route, i=i: TicketManager(baggage=bool(i & 1), insurance=bool(i & 2),
+                                                        priority=bool(i & 4), route=route,
+                                                        compact=compact).get_ticket().get_price()
+                 for i, route in enumerate(routes)])
+    return results
+
+
+def run_suite(generators=tuple(GENERATORS), sizes=SIZES, queries: int = 50, seed: int = 1,
+              progress: Optional[Callable[[str], None]] = None) -> Dict[str, dict]:
+    """Результати з ключами ``генератор/ребра/випадок``."""
+    results = {}
+    for generator in generators:
+        for size in sizes:
+            graph = GENERATORS[generator](size, seed)
+            if progress is not None:
+                progress(f"{generator}/{size}: {graph.node_count} міст, {graph.edge_count} сегментів, "
+                         f"домінованих паралельних: {graph.pruned(PRICE).removed_edges} за ціною, "
+                         f"{graph.pruned(DURATION).removed_edges} за тривалістю")
+            for case, result in bench_graph(graph, queries, seed).items():
+                results[f'{generator}/{size}/{case}'] = result
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.25,
+            metric: str = 'p50_ms', min_delta_ms: float = 0.05) -> List[tuple]:
+    """Регресії: (випадок, базове значення, поточне), якщо metric гірший більш ніж на tolerance.
+
+    Зміни, менші за ``min_delta_ms``, вважаються шумом вимірювання.
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None or metric not in base:
+            continue
+        if result[metric] > base[metric] * (1 + tolerance) and result[metric] - base[metric] > min_delta_ms:
+            regressions.append((case, base[metric], result[metric]))
+    return regressions
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    header = f"{'випадок':<58}" + ''.join(f"{column:>11}" for column in
+                                          ('p50 мс', 'p90 мс', 'p99 мс', 'пік КіБ', 'розігрів'))
+    lines = [header, '-' * len(header)]
+    for case, result in results.items():
+        lines.append(f"{case:<58}{result['p50_ms']:>11.3f}{result['p90_ms']:>11.3f}{result['p99_ms']:>11.3f}"
+                     f"{result['peak_kb']:>11.1f}{result['setup_ms']:>11.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк пошуку маршрутів і квитків")
+    parser.add_argument('--graphs', nargs='+', choices=tuple(GENERATORS), default=tuple(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=(10, 100, 1_000, 10_000),
+                        help="розміри графів у сегментах (до 1000000)")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', help="JSON з попереднього прогону для пошуку регресій")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save-baseline', help="зберегти результати як базові")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.graphs, args.sizes, args.queries, args.seed, progress=print)
+    print(format_report(results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+        print(f"Базові результати збережено у {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for case, base, current in regressions:
+            print(f"РЕГРЕСІЯ {case}: {base:.3f} мс -> {current:.3f} мс")
+        if regressions:
+            return 1
+        print("Регресій не виявлено.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from route import Route
+from ticket import TicketManager
+
+#кількість звернень до ціни та опису кожного квитка (як при показі й оплаті)
+READS = 3
+
+
+def _issue(route: Route, count: int, compact: bool) -> list:
+    tickets = []
+    for i in range(count):
+        ticket = TicketManager(baggage=bool(i & 1), insurance=bool(i & 2), priority=bool(i & 4),
+                               route=route, compact=compact).get_ticket()
+        for _ in range(READS):
+            ticket.get_price()
+            ticket.get_description()
+        tickets.append(ticket)
+    return tickets
+
+
+def measure(issue: Callable[[int], list], count: int) -> dict:
+    """Пропускна здатність ``issue(count)`` і пам'ять, яку займають видані квитки.
+
+    ``allocations`` - кількість блоків пам'яті, що лишились за виданими квитками.
+    """
+    started = time.perf_counter()
+    issue(count)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tickets = issue(count)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del tickets
+    return {
+        'tickets_per_second': count / elapsed if elapsed else float('inf'),
+        'allocations': allocations,
+        'peak_bytes': peak,
+    }
+
+
+def run(count: int = 20000) -> List[tuple]:
+    route = Route('Kyiv', [
+        {'destination': 'Lviv', 'price': 500, 'duration_hours': 6, 'transport_type': 'Train'},
+        {'destination': 'Krakow', 'price': 700, 'duration_hours': 5, 'transport_type': 'Bus'},
+    ])
+    return [
+        ('декоратори', measure(lambda n: _issue(route, n, compact=False), count)),
+        ('компактний', measure(lambda n: _issue(route, n, compact=True), count)),
+    ]
+
+
+def main(argv: List[str]) -> int:
+    count = int(argv[1]) if len(argv) > 1 else 20000
+    for name, result in run(count):
+        print(f"{name:>12}: {result['tickets_per_second']:>10.0f} квитків/с, "
+              f"пік пам'яті {result['peak_bytes']} байт, виділень {result['allocations']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
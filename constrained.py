@@ -0,0 +1,198 @@
+import heapq
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from graph import CompiledGraph, PRICE, DURATION
+from k_shortest import metric_weights
+from shortest_paths import INF, astar, reverse_dijkstra
+
+#метрики, на які можна накласти обмеження
+BUDGET_METRICS = (PRICE, DURATION)
+#найбільша кількість уточнень множника Лагранжа
+LARAC_ROUNDS = 16
+#відносний допуск для порівнянь з дробовим множником
+_EPSILON = 1e-9
+#для скількох міст призначення тримати точні межі кожної метрики й маски
+BOUND_CACHE_SIZE = 64
+
+
+def _weights(graph: CompiledGraph, metric: str, modes: Optional[int]):
+    return metric_weights(graph, metric) if modes is None else graph.mode_weights(metric, modes)
+
+
+class _BoundCache:
+    """LRU точних відстаней до міст призначення для однієї метрики й маски графа.
+
+    Межі не залежать від бюджету, тож повторні запити до міста їх не перераховують;
+    кожна займає O(V), тому тримаємо лише ``maxsize`` останніх міст.
+    """
+
+    def __init__(self, graph: CompiledGraph, metric: str, modes: Optional[int], maxsize: int = BOUND_CACHE_SIZE):
+        self.graph = graph
+        self.metric = metric
+        self.modes = modes
+        self.maxsize = maxsize
+        self._bounds: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def get(self, target: int):
+        with self._lock:
+            bound = self._bounds.get(target)
+            if bound is not None:
+                self._bounds.move_to_end(target)
+                return bound
+        #зворотний Дейкстра поза блокуванням, щоб не тримати інші запити
+        bound = reverse_dijkstra(self.graph, _weights(self.graph, self.metric, self.modes), target)
+        with self._lock:
+            self._bounds[target] = bound
+            self._bounds.move_to_end(target)
+            while len(self._bounds) > self.maxsize:
+                self._bounds.popitem(last=False)
+        return bound
+
+
+def _bound(graph: CompiledGraph, metric: str, modes: Optional[int], target: int):
+    return graph.cached(('constrained_bounds', metric, modes),
+                        lambda graph: _BoundCache(graph, metric, modes)).get(target)
+
+
+def _shortest(graph: CompiledGraph, weights, resources, source: int, target: int, factor: float,
+              to_target, resource_bound, stats=None):
+    #(ребра, ціль, ресурс) шляху, найкращого за weights + factor * resources, і опрацьовані міста;
+    #сума точних меж для обох метрик - допустима і монотонна оцінка для A*
+    if factor == 0:
+        combined, heuristic = weights, to_target.__getitem__
+    else:
+        combined = [w + factor * r for w, r in zip(weights, resources)]
+        heuristic = lambda city: to_target[city] + factor * resource_bound[city]
+    #кожен прохід записує у stats власні лічильники купи
+    _, edges, settled = astar(graph, combined, source, target, heuristic, stats)
+    if edges is None:
+        return None, settled
+    return (edges, sum(weights[edge] for edge in edges), sum(resources[edge] for edge in edges)), settled
+
+
+def _larac(graph: CompiledGraph, weights, resources, source: int, target: int, budget: float,
+           to_target, resource_bound, stats=None):
+    """Множник Лагранжа для ``weights + factor * resources`` і допустимий шлях (LARAC).
+
+    Повертає (множник, найкращий за ціллю шлях, допустимий шлях, опрацьовані міста);
+    шлях - (ребра, ціль, ресурс). Якщо найкращий шлях укладається в бюджет,
+    задача вже розв'язана. Множник не мусить бути оптимальним: будь-який дає
+    правильну межу, тож уточнень не більше LARAC_ROUNDS.
+    """
+    cheapest, settled = _shortest(graph, weights, resources, source, target, 0, to_target, resource_bound,
+                                  stats)
+    if cheapest[2] <= budget:
+        return 0, cheapest, cheapest, settled
+    feasible, more = _shortest(graph, resources, weights, source, target, 0, resource_bound, to_target, stats)
+    settled += more
+    #_shortest з переставленими метриками повертає (ребра, ресурс, ціль)
+    feasible = (feasible[0], feasible[2], feasible[1])
+
+    factor = 0
+    for _ in range(LARAC_ROUNDS):
+        factor = (cheapest[1] - feasible[1]) / (feasible[2] - cheapest[2])
+        path, more = _shortest(graph, weights, resources, source, target, factor, to_target, resource_bound,
+                               stats)
+        settled += more
+        value = path[1] + factor * path[2]
+        if value >= (cheapest[1] + factor * cheapest[2]) * (1 - _EPSILON):
+            break
+        if path[2] <= budget:
+            feasible = path
+        else:
+            cheapest = path
+    return factor, cheapest, feasible, settled
+
+
+def constrained_path(graph: CompiledGraph, source: int, target: int, metric: str, budget_metric: str,
+                     budget: float, stats=None,
+                     modes: Optional[int] = None) -> Tuple[float, Optional[List[int]], int]:
+    """Найкращий за ``metric`` шлях, сума ``budget_metric`` якого не перевищує ``budget``.
+
+    Точні нижні межі до ``target`` для цілі й ресурсу - два зворотні Дейкстри,
+    закешовані в графі для ``BOUND_CACHE_SIZE`` останніх міст призначення.
+    З ними LARAC (A* за зваженою сумою метрик): якщо найкращий шлях укладається
+    в бюджет, відповідь готова, інакше він дає множник Лагранжа і допустимий
+    шлях як верхню межу. Далі пошук міток (ціль, ресурс) з купою за ціллю
+    плюс нижньою межею; межа для зваженої суми - третій зворотний Дейкстра.
+    Мітку відкидаємо, якщо найдешевше за ресурсом продовження виходить за
+    бюджет, якщо за лагранжевою межею вона гірша за допустимий шлях або якщо в
+    місті вже опрацьовано мітку з не більшою ціллю і меншим ресурсом. Перша
+    мітка, що дійшла до ``target``, оптимальна.
+    ``modes`` - маска дозволених видів транспорту (``graph.mode_mask``).
+    Повертає (ціль, ребра шляху, кількість опрацьованих міст і міток);
+    якщо шляху в межах бюджету немає - (INF, None, settled).
+    """
+    if budget_metric not in BUDGET_METRICS:
+        raise ValueError(f"Обмеження за метрикою {budget_metric} не підтримується")
+    weights = _weights(graph, metric, modes)
+    resources = _weights(graph, budget_metric, modes)
+    to_target = _bound(graph, metric, modes, target)
+    #для міст, з яких target недосяжний, обидві межі - INF
+    resource_bound = _bound(graph, budget_metric, modes, target)
+    if resource_bound[source] > budget:
+        return INF, None, 0
+
+    factor, cheapest, feasible, settled = _larac(graph, weights, resources, source, target, budget,
+                                                 to_target, resource_bound, stats)
+    if feasible is cheapest:
+        return feasible[1], feasible[0], settled
+
+    #для будь-якого продовження w >= combined_bound - factor * (залишок бюджету)
+    combined_bound = reverse_dijkstra(graph, [w + factor * r for w, r in zip(weights, resources)], target)
+    #мітки, гірші за вже знайдений допустимий шлях, не потрібні
+    limit = feasible[1] + factor * budget + _EPSILON * max(1, abs(feasible[1]) + factor * budget)
+
+    offsets = graph.offsets
+    targets = graph.targets
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    #у межах міста мітки виходять з купи за зростанням цілі, тож досить
+    #пам'ятати найменший ресурс серед уже опрацьованих
+    best_resource = [INF] * graph.node_count
+    #мітка: (місто, ребро, батьківська мітка)
+    labels = [(source, -1, -1)]
+    heap = [(to_target[source], 0, 0, 0)]
+    #лічильники пошуку міток окремо від проходів LARAC, які записали свої
+    popped = 0
+    stale = 0
+
+    while heap:
+        _, cost, used, label = heappop(heap)
+        city = labels[label][0]
+        if used >= best_resource[city]:
+            stale += 1
+            continue
+        best_resource[city] = used
+        popped += 1
+        if city == target:
+            if stats is not None:
+                stats.add_search(popped, stale, len(heap))
+            edges = []
+            while labels[label][1] >= 0:
+                edges.append(labels[label][1])
+                label = labels[label][2]
+            edges.reverse()
+            return cost, edges, settled + popped
+
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            new_used = used + resources[edge]
+            if new_used >= best_resource[neighbor] or new_used + resource_bound[neighbor] > budget:
+                continue
+            new_cost = cost + weights[edge]
+            if new_cost + factor * new_used + combined_bound[neighbor] > limit:
+                continue
+            labels.append((neighbor, edge, label))
+            heappush(heap, (new_cost + to_target[neighbor], new_cost, new_used, len(labels) - 1))
+
+    if stats is not None:
+        stats.add_search(popped, stale, 0)
+    return INF, None, settled + popped
@@ -0,0 +1,225 @@
+import heapq
+from typing import List, Optional, Tuple
+
+from graph import CompiledGraph, compile_graph
+from shortest_paths import INF
+
+
+class ContractionHierarchy:
+    """Contraction hierarchies для однієї метрики (ціна або тривалість).
+
+    Міста по черзі "стягуються" у порядку важливості; якщо найкоротший шлях
+    ``u -> v -> x`` не має обходу (witness), додається ярлик ``u -> x``. Запит -
+    двонапрямлений Дейкстра лише вгору за рангом, тому опрацьовується кілька
+    десятків міст навіть у великій мережі. Ярлик пам'ятає дві дуги, з яких він
+    складений, тож шлях розгортається назад в оригінальні сегменти.
+    """
+
+    def __init__(self, graph: CompiledGraph, metric: str, witness_settle_limit: int = 200):
+        self.graph = graph
+        self.metric = metric
+        self.witness_settle_limit = witness_settle_limit
+        #дуги: оригінальні ребра та ярлики
+        self.arc_source: List[int] = []
+        self.arc_target: List[int] = []
+        self.arc_weight: List[float] = []
+        self.arc_edge: List[int] = []
+        self.arc_children: List[Optional[Tuple[int, int]]] = []
+        self.shortcut_count = 0
+
+        n = graph.node_count
+        self._out = [{} for _ in range(n)]
+        self._in = [{} for _ in range(n)]
+        self._contracted = [False] * n
+
+        weights = graph.weights(metric)
+        for edge in range(graph.edge_count):
+            source = graph.sources[edge]
+            target = graph.targets[edge]
+            if source != target:
+                self._add_arc(source, target, weights[edge], edge, None)
+
+        self.rank = self._contract_all()
+
+        #граф пошуку: вгору для прямого напрямку, "вниз" (у зворотному вигляді) для зворотного
+        self.up = [[] for _ in range(n)]
+        self.down = [[] for _ in range(n)]
+        for city in range(n):
+            for neighbor, arc in self._out[city].items():
+                if self.rank[city] < self.rank[neighbor]:
+                    self.up[city].append((neighbor, self.arc_weight[arc], arc))
+                else:
+                    self.down[neighbor].append((city, self.arc_weight[arc], arc))
+        del self._out, self._in, self._contracted
+
+    @classmethod
+    def for_graph(cls, graph_data, metric: str) -> 'ContractionHierarchy':
+        graph = compile_graph(graph_data)
+        return graph.cached(('contraction', metric), lambda g: cls(g, metric))
+
+    def _add_arc(self, source: int, target: int, weight: float, edge: int, children) -> None:
+        current = self._out[source].get(target)
+        if current is not None and self.arc_weight[current] <= weight:
+            return
+        arc = len(self.arc_weight)
+        self.arc_source.append(source)
+        self.arc_target.append(target)
+        self.arc_weight.append(weight)
+        self.arc_edge.append(edge)
+        self.arc_children.append(children)
+        self._out[source][target] = arc
+        self._in[target][source] = arc
+
+    def _witness_distances(self, source: int, skipped: int, limit: float) -> dict:
+        #обмежений Дейкстра в ще не стягнутому графі, оминаючи місто skipped
+        dist = {source: 0}
+        queue = [(0, source)]
+        settled = 0
+        contracted = self._contracted
+        arc_weight = self.arc_weight
+        while queue and settled < self.witness_settle_limit:
+            current, city = heapq.heappop(queue)
+            if current > dist[city]:
+                continue
+            if current > limit:
+                break
+            settled += 1
+            for neighbor, arc in self._out[city].items():
+                if neighbor == skipped or contracted[neighbor]:
+                    continue
+                new_cost = current + arc_weight[arc]
+                if new_cost < dist.get(neighbor, INF):
+                    dist[neighbor] = new_cost
+                    heapq.heappush(queue, (new_cost, neighbor))
+        return dist
+
+    def _shortcuts(self, city: int):
+        """Ярлики, потрібні при стягуванні міста city."""
+        contracted = self._contracted
+        arc_weight = self.arc_weight
+        incoming = [(u, arc) for u, arc in self._in[city].items() if not contracted[u]]
+        outgoing = [(x, arc) for x, arc in self._out[city].items() if not contracted[x]]
+        if not outgoing:
+            return [], len(incoming)
+        max_out = max(arc_weight[arc] for _, arc in outgoing)
+
+        shortcuts = []
+        for u, in_arc in incoming:
+            limit = arc_weight[in_arc] + max_out
+            witness = self._witness_distances(u, city, limit)
+            for x, out_arc in outgoing:
+                if x == u:
+                    continue
+                need = arc_weight[in_arc] + arc_weight[out_arc]
+                if witness.get(x, INF) > need:
+                    shortcuts.append((u, x, need, in_arc, out_arc))
+        return shortcuts, len(incoming) + len(outgoing)
+
+    def _priority(self, city: int, deleted_neighbors: List[int]) -> int:
+        shortcuts, degree = self._shortcuts(city)
+        return len(shortcuts) - degree + deleted_neighbors[city]
+
+    def _contract_all(self) -> List[int]:
+        n = self.graph.node_count
+        rank = [0] * n
+        deleted_neighbors = [0] * n
+        queue = [(self._priority(city, deleted_neighbors), city) for city in range(n)]
+        heapq.heapify(queue)
+        order = 0
+
+        while queue:
+            _, city = heapq.heappop(queue)
+            #ліниве оновлення: якщо пріоритет зріс, повертаємо місто в чергу
+            priority = self._priority(city, deleted_neighbors)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, city))
+                continue
+
+            shortcuts, _ = self._shortcuts(city)
+            for u, x, need, in_arc, out_arc in shortcuts:
+                before = len(self.arc_weight)
+                self._add_arc(u, x, need, -1, (in_arc, out_arc))
+                self.shortcut_count += len(self.arc_weight) - before
+
+            self._contracted[city] = True
+            rank[city] = order
+            order += 1
+            for neighbor in set(self._out[city]) | set(self._in[city]):
+                if not self._contracted[neighbor]:
+                    deleted_neighbors[neighbor] += 1
+        return rank
+
+    def query(self, source: int, target: int):
+        """Повертає (вартість, ребра шляху, кількість опрацьованих міст)."""
+        if source == target:
+            return 0, [], 1
+
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        dist = ({source: 0}, {target: 0})
+        parents = ({}, {})
+        queues = ([(0, source)], [(0, target)])
+        graphs = (self.up, self.down)
+        best = INF
+        meeting = -1
+        settled = 0
+
+        while queues[0] or queues[1]:
+            if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]):
+                side = 0
+            else:
+                side = 1
+            queue = queues[side]
+            current, city = heappop(queue)
+            if current > dist[side][city]:
+                continue
+            if current >= best:
+                #цей напрямок уже не покращить відповідь
+                queue.clear()
+                continue
+            settled += 1
+
+            other = dist[1 - side].get(city)
+            if other is not None and current + other < best:
+                best = current + other
+                meeting = city
+
+            side_dist = dist[side]
+            side_parents = parents[side]
+            for neighbor, weight, arc in graphs[side][city]:
+                new_cost = current + weight
+                if new_cost < side_dist.get(neighbor, INF):
+                    side_dist[neighbor] = new_cost
+                    side_parents[neighbor] = arc
+                    heappush(queue, (new_cost, neighbor))
+
+        if best == INF:
+            return INF, None, settled
+
+        arcs = []
+        city = meeting
+        while city != source:
+            arc = parents[0][city]
+            arcs.append(arc)
+            city = self.arc_source[arc]
+        arcs.reverse()
+        city = meeting
+        while city != target:
+            arc = parents[1][city]
+            arcs.append(arc)
+            city = self.arc_target[arc]
+        return best, self.unpack(arcs), settled
+
+    def unpack(self, arcs: List[int]) -> List[int]:
+        """Розгортає ярлики в ідентифікатори оригінальних ребер графа."""
+        edges = []
+        stack = list(reversed(arcs))
+        while stack:
+            arc = stack.pop()
+            children = self.arc_children[arc]
+            if children is None:
+                edges.append(self.arc_edge[arc])
+            else:
+                stack.append(children[1])
+                stack.append(children[0])
+        return edges
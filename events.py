@@ -0,0 +1,65 @@
+import logging
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+
+#поріг вище за будь-який рівень: подій ніхто не слухає
+_DISABLED = logging.CRITICAL + 1
+
+logger = logging.getLogger('calculator_vibe')
+
+
+class Event(NamedTuple):
+    """Структурована подія: назва, рівень, шаблон повідомлення та його поля."""
+    name: str
+    level: int
+    template: str
+    fields: Dict[str, object]
+
+    def render(self) -> str:
+        return self.template.format(**self.fields)
+
+
+_hooks: List[Tuple[Callable[[Event], None], int]] = []
+_threshold = _DISABLED
+
+
+def _update_threshold() -> None:
+    global _threshold
+    _threshold = min((level for _, level in _hooks), default=_DISABLED)
+
+
+def subscribe(hook: Callable[[Event], None], level: int = INFO) -> None:
+    _hooks.append((hook, level))
+    _update_threshold()
+
+
+def unsubscribe(hook: Callable[[Event], None]) -> None:
+    _hooks[:] = [(existing, level) for existing, level in _hooks if existing != hook]
+    _update_threshold()
+
+
+def enabled(level: int) -> bool:
+    #дешева перевірка перед формуванням події; без підписників - одне порівняння
+    return level >= _threshold
+
+
+def emit(level: int, name: str, template: str, **fields) -> None:
+    if level < _threshold:
+        return
+    event = Event(name, level, template, fields)
+    for hook, hook_level in list(_hooks):
+        if level >= hook_level:
+            hook(event)
+
+
+def logging_hook(event: Event) -> None:
+    """Пересилає подію у стандартний logging з полями в ``extra``."""
+    logger.log(event.level, event.render(), extra={'event': event.name, 'fields': event.fields})
+
+
+def print_hook(event: Event) -> None:
+    """Виводить повідомлення події так, як його бачить користувач CLI."""
+    print(event.render())
@@ -0,0 +1,93 @@
+from array import array
+from typing import List, NamedTuple, Sequence
+
+from ticket import ADDONS, BAGGAGE, BAGGAGE_PRICE, INSURANCE, INSURANCE_PRICE, PRIORITY, PRIORITY_PRICE
+
+try:
+    import numpy as np
+except ImportError:
+    #без numpy працює та сама арифметика на array('d')
+    np = None
+
+
+def all_addons() -> int:
+    """Маска з усіма зареєстрованими послугами; біти ті самі, що й у CompactTicket."""
+    mask = 0
+    for addon in ADDONS:
+        mask |= addon.flag
+    return mask
+
+
+class FareSchedule(NamedTuple):
+    """Ціни додаткових послуг; за замовчуванням ті, з якими квиток оформлює TicketManager.
+
+    Послуги, додані через ``register_addon``, рахуються за ціною з реєстру.
+    """
+    baggage: float = BAGGAGE_PRICE
+    insurance: float = INSURANCE_PRICE
+    priority: float = PRIORITY_PRICE
+
+    def fees(self):
+        #у порядку реєстрації - тому ж, в якому декоратори загортають квиток і CompactTicket додає збори
+        overrides = {BAGGAGE: self.baggage, INSURANCE: self.insurance, PRIORITY: self.priority}
+        return tuple((addon.flag, overrides.get(addon.flag, addon.price)) for addon in ADDONS)
+
+
+def price_bulk(base_prices: Sequence[float], masks, schedule: FareSchedule = FareSchedule(),
+               use_numpy: bool = True):
+    """Ціни квитків для масивів базових цін маршрутів і масок послуг.
+
+    Збори додаються по черзі, як ``get_price()`` декораторів від найглибшого
+    до зовнішнього, тож результат збігається з ціною квитка до останнього біта.
+    ``masks`` - одна маска для всіх маршрутів або масив масок тієї ж довжини.
+    З numpy повертає ``numpy.ndarray``, без нього - ``array('d')``.
+    """
+    if np is not None and use_numpy:
+        prices = np.array(base_prices, dtype=np.float64)
+        masks = np.broadcast_to(np.asarray(masks, dtype=np.int64), prices.shape)
+        for bit, fee in schedule.fees():
+            prices += np.where(masks & bit, fee, 0.0)
+        return prices
+
+    prices = array('d', base_prices)
+    if isinstance(masks, int):
+        masks = [masks] * len(prices)
+    elif len(masks) != len(prices):
+        raise ValueError("Кількість масок не збігається з кількістю цін")
+    for bit, fee in schedule.fees():
+        for i, mask in enumerate(masks):
+            if mask & bit:
+                prices[i] += fee
+    return prices
+
+
+def price_catalogue(base_prices: Sequence[float], schedule: FareSchedule = FareSchedule(),
+                    use_numpy: bool = True):
+    """Ціни для кожного маршруту з кожною комбінацією послуг.
+
+    З numpy повертає матрицю (маршрути x комбінації зареєстрованих послуг),
+    без нього - список рядків ``array('d')``; стовпчик - маска послуг.
+    Без numpy обчислення не векторизоване: це цикл по маршрутах і масках
+    на чистому Python.
+    """
+    combinations = range(all_addons() + 1)
+    if np is not None and use_numpy:
+        prices = np.repeat(np.asarray(base_prices, dtype=np.float64)[:, None], len(combinations), axis=1)
+        masks = np.arange(len(combinations))
+        for bit, fee in schedule.fees():
+            prices += np.where(masks & bit, fee, 0.0)
+        return prices
+
+    #таблиця зборів будується один раз; для кожної маски - збори в порядку fees()
+    fees = schedule.fees()
+    mask_fees = [tuple(fee for bit, fee in fees if mask & bit) for mask in combinations]
+    rows: List[array] = []
+    for base_price in base_prices:
+        row = array('d')
+        for added in mask_fees:
+            price = base_price
+            for fee in added:
+                price += fee
+            row.append(price)
+        rows.append(row)
+    return rows
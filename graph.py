@@ -0,0 +1,246 @@
+from array import array
+from itertools import count
+from types import MappingProxyType
+from typing import Dict, List, Optional
+
+TRANSPORT_TYPES = ('Bus', 'Train', 'Plane')
+#біт виду транспорту в масці - 1 << його код у TRANSPORT_TYPES
+ALL_MODES = (1 << len(TRANSPORT_TYPES)) - 1
+
+#метрики, за якими шукаємо маршрут
+PRICE = 'price'
+DURATION = 'duration_hours'
+HOPS = 'hops'
+
+_versions = count(1)
+
+
+class CompiledGraph:
+    """Граф маршрутів з містами, заміненими на цілі id, та ребрами у CSR-масивах.
+
+    Ребра міста ``u`` займають індекси ``offsets[u]:offsets[u + 1]`` у масивах
+    ``targets``, ``prices``, ``durations`` і ``transports``. Оригінальні словники
+    сегментів зберігаються у ``segments`` за тим самим індексом ребра як
+    read-only ``MappingProxyType``, тож ``Route`` отримує ті самі дані, що й у
+    ``routes.json``, але не може їх змінити.
+    """
+
+    def __init__(self, names: List[str], offsets, sources, targets, prices, durations,
+                 transports, segments: Optional[List[dict]] = None):
+        self.names = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.sources = sources
+        self.targets = targets
+        self.prices = prices
+        self.durations = durations
+        self.transports = transports
+        self.segments = segments
+        self.version = next(_versions)
+        #похідні структури (зворотні ребра, орієнтири тощо), які будуються один раз
+        self._derived = {}
+
+    def __getstate__(self):
+        #MappingProxyType не серіалізується pickle - передаємо звичайні словники
+        state = self.__dict__.copy()
+        state['_derived'] = {}
+        #масиви зі знімка (memoryview на mmap) передаємо як звичайні масиви
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                state[name] = array(value.format, value.tobytes())
+        if self.segments is not None:
+            state['segments'] = [dict(segment) for segment in self.segments]
+        return state
+
+    def __setstate__(self, state):
+        if state['segments'] is not None:
+            state['segments'] = [MappingProxyType(segment) for segment in state['segments']]
+        self.__dict__.update(state)
+
+    @classmethod
+    def from_dict(cls, graph_data: Dict[str, List[dict]]) -> 'CompiledGraph':
+        names = list(graph_data)
+        index = {name: i for i, name in enumerate(names)}
+        #міста, які зустрічаються лише як пункт призначення
+        for segments in graph_data.values():
+            for segment in segments:
+                city = segment['destination']
+                if city not in index:
+                    index[city] = len(names)
+                    names.append(city)
+
+        offsets = array('l', [0])
+        sources = array('l')
+        targets = array('l')
+        prices = array('d')
+        durations = array('d')
+        transports = array('b')
+        segment_list = []
+        for city_id, city in enumerate(names):
+            for segment in graph_data.get(city, ()):
+                sources.append(city_id)
+                targets.append(index[segment['destination']])
+                prices.append(segment['price'])
+                durations.append(segment['duration_hours'])
+                transports.append(transport_code(segment['transport_type']))
+                segment_list.append(MappingProxyType(segment))
+            offsets.append(len(targets))
+
+        return cls(names, offsets, sources, targets, prices, durations, transports, segment_list)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def weights(self, metric: str):
+        if metric == PRICE:
+            return self.prices
+        if metric == DURATION:
+            return self.durations
+        raise ValueError(f"Невідома метрика: {metric}")
+
+    def pruned(self, *metrics: str) -> 'CompiledGraph':
+        """Граф без домінованих паралельних ребер для пошуку за ``metrics``.
+
+        З кількох сегментів між тими самими містами лишаються ті, яких не
+        перевершує інший сегмент за всіма метриками (для однієї метрики - найкращий,
+        для HOPS - будь-який один). Ребра кожного міста відсортовані за першою
+        метрикою. Сегменти - ті самі оригінальні словники, ``edge_ids`` - номери
+        ребер у повному графі, ``removed_edges`` - скільки ребер відкинуто.
+        Будується один раз для набору метрик.
+        """
+        return self.cached(('pruned', metrics), lambda graph: _build_pruned(graph, metrics))
+
+    def mode_bits(self):
+        """Біт виду транспорту кожного ребра; 0 для невідомого виду."""
+        return self.cached('mode_bits', _build_mode_bits)
+
+    def mode_weights(self, metric: str, modes: int):
+        """Ваги ребер (для HOPS - одиниці), де сегменти поза маскою ``modes`` мають нескінченну вагу.
+
+        Будуються один раз для метрики й маски, тож пошук з фільтром не копіює граф,
+        а заборонене ребро просто не проходить перевірку релаксації.
+        """
+        return self.cached(('mode_weights', metric, modes), lambda graph: _build_mode_weights(graph, metric, modes))
+
+    def cached(self, key, factory):
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = factory(self)
+        return value
+
+    def incoming(self):
+        """CSR-індекс вхідних ребер: ``(in_offsets, in_edges)``, згрупований за містом призначення."""
+        return self.cached('incoming', _build_incoming)
+
+    def segment(self, edge: int) -> dict:
+        if self.segments is not None:
+            return self.segments[edge]
+        #граф завантажено без оригінальних словників - відновлюємо сегмент з масивів,
+        #так само лише для читання
+        code = self.transports[edge]
+        return MappingProxyType({
+            'destination': self.names[self.targets[edge]],
+            'price': _plain_number(self.prices[edge]),
+            'duration_hours': _plain_number(self.durations[edge]),
+            'transport_type': TRANSPORT_TYPES[code] if code >= 0 else None,
+        })
+
+    def path_segments(self, edges) -> List[dict]:
+        return [self.segment(edge) for edge in edges]
+
+
+def mode_mask(*transport_types: str) -> int:
+    """Маска видів транспорту, наприклад ``mode_mask('Train')`` чи ``ALL_MODES & ~mode_mask('Plane')``."""
+    mask = 0
+    for transport_type in transport_types:
+        code = transport_code(transport_type)
+        if code < 0:
+            raise ValueError(f"Невідомий вид транспорту: {transport_type}")
+        mask |= 1 << code
+    return mask
+
+
+def transport_code(transport_type: str) -> int:
+    try:
+        return TRANSPORT_TYPES.index(transport_type)
+    except ValueError:
+        return -1
+
+
+def compile_graph(graph_data) -> CompiledGraph:
+    if isinstance(graph_data, CompiledGraph):
+        return graph_data
+    return CompiledGraph.from_dict(graph_data)
+
+
+def _build_incoming(graph: CompiledGraph):
+    in_offsets = array('l', [0] * (graph.node_count + 1))
+    for target in graph.targets:
+        in_offsets[target + 1] += 1
+    for city in range(graph.node_count):
+        in_offsets[city + 1] += in_offsets[city]
+    in_edges = array('l', [0] * graph.edge_count)
+    fill = array('l', in_offsets)
+    for edge, target in enumerate(graph.targets):
+        in_edges[fill[target]] = edge
+        fill[target] += 1
+    return in_offsets, in_edges
+
+
+def _build_pruned(graph: CompiledGraph, metrics) -> CompiledGraph:
+    columns = [graph.weights(metric) for metric in metrics if metric != HOPS]
+    offsets = graph.offsets
+    graph_targets = graph.targets
+
+    kept = array('l')
+    pruned_offsets = array('l', [0])
+    for city in range(graph.node_count):
+        parallel: Dict[int, List[int]] = {}
+        for edge in range(offsets[city], offsets[city + 1]):
+            parallel.setdefault(graph_targets[edge], []).append(edge)
+        city_edges = []
+        for edges in parallel.values():
+            if len(edges) == 1:
+                city_edges.append((tuple(column[edges[0]] for column in columns), edges[0]))
+                continue
+            #після сортування ребро може домінувати лише над наступними
+            front = []
+            for values, edge in sorted((tuple(column[edge] for column in columns), edge) for edge in edges):
+                if not any(all(kept_value <= value for kept_value, value in zip(kept_values, values))
+                           for kept_values, _ in front):
+                    front.append((values, edge))
+            city_edges.extend(front)
+        city_edges.sort()
+        kept.extend(edge for _, edge in city_edges)
+        pruned_offsets.append(len(kept))
+
+    pruned = CompiledGraph(
+        graph.names, pruned_offsets,
+        array('l', (graph.sources[edge] for edge in kept)),
+        array('l', (graph_targets[edge] for edge in kept)),
+        array('d', (graph.prices[edge] for edge in kept)),
+        array('d', (graph.durations[edge] for edge in kept)),
+        array('b', (graph.transports[edge] for edge in kept)),
+        None if graph.segments is None else [graph.segments[edge] for edge in kept])
+    pruned.edge_ids = kept
+    pruned.removed_edges = graph.edge_count - len(kept)
+    return pruned
+
+
+def _build_mode_bits(graph: CompiledGraph):
+    return array('B', (1 << code if code >= 0 else 0 for code in graph.transports))
+
+
+def _build_mode_weights(graph: CompiledGraph, metric: str, modes: int):
+    weights = [1] * graph.edge_count if metric == HOPS else graph.weights(metric)
+    inf = float('inf')
+    return array('d', (weight if bits & modes else inf for weight, bits in zip(weights, graph.mode_bits())))
+
+
+def _plain_number(value: float):
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,138 @@
+import mmap
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+from graph import CompiledGraph, compile_graph
+
+#формат: заголовок, таблиця рядків (зсуви + utf-8), далі вирівняні по 8 байтів масиви
+MAGIC = b'RGPH'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sIQQQ')
+#(атрибут CompiledGraph, typecode у файлі)
+_ARRAYS = (
+    ('offsets', 'q'),
+    ('sources', 'q'),
+    ('targets', 'q'),
+    ('prices', 'd'),
+    ('durations', 'd'),
+    ('transports', 'b'),
+)
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def _chunks(graph_data) -> List[bytes]:
+    graph = compile_graph(graph_data)
+    encoded = [name.encode('utf-8') for name in graph.names]
+    name_offsets = array('q', [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    blob = b''.join(encoded)
+
+    chunks = [_HEADER.pack(MAGIC, FORMAT_VERSION, graph.node_count, graph.edge_count, len(blob))]
+    position = _HEADER.size
+    for values in [name_offsets] + [array(typecode, getattr(graph, name)) for name, typecode in _ARRAYS]:
+        if not _LITTLE_ENDIAN:
+            values.byteswap()
+        chunks.append(values.tobytes())
+        position += len(values) * values.itemsize
+        chunks.append(b'\0' * _padding(position))
+        position += _padding(position)
+    chunks.append(blob)
+    return chunks
+
+
+def save_graph(graph_data, path: str) -> None:
+    """Записує граф у бінарний знімок, який потім відкривається через mmap."""
+    with open(path, 'wb') as file:
+        for chunk in _chunks(graph_data):
+            file.write(chunk)
+
+
+def load_graph_file(path: str) -> CompiledGraph:
+    """Відкриває знімок через mmap; масиви графа - memoryview на сторінки файлу без копіювання.
+
+    Кілька процесів, що відкрили один файл, ділять ці сторінки через page cache.
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return _from_buffer(buffer, path)
+
+
+def share_graph(graph_data) -> shared_memory.SharedMemory:
+    """Публікує знімок графа в новому блоці спільної пам'яті.
+
+    Власник блоку викликає ``close()`` і ``unlink()``, коли процеси з ним завершили.
+    """
+    chunks = _chunks(graph_data)
+    memory = shared_memory.SharedMemory(create=True, size=sum(len(chunk) for chunk in chunks))
+    position = 0
+    for chunk in chunks:
+        memory.buf[position:position + len(chunk)] = chunk
+        position += len(chunk)
+    return memory
+
+
+def attach_graph(name: str) -> Tuple[CompiledGraph, shared_memory.SharedMemory]:
+    """Граф з блоку спільної пам'яті ``name`` без копіювання масивів.
+
+    Блок треба тримати, доки використовується граф: його масиви - memoryview на цю пам'ять.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    return _from_buffer(memory.buf, name), memory
+
+
+def _from_buffer(buffer, label: str) -> CompiledGraph:
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"Знімок {label} обрізаний")
+    view = memoryview(buffer)
+    magic, version, node_count, edge_count, blob_size = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{label} не є знімком графа")
+
+    position = _HEADER.size
+    lengths = [node_count + 1, node_count + 1] + [edge_count] * (len(_ARRAYS) - 1)
+    typecodes = ['q'] + [typecode for _, typecode in _ARRAYS]
+    arrays = []
+    for length, typecode in zip(lengths, typecodes):
+        size = length * array(typecode).itemsize
+        if position + size > len(buffer):
+            raise ValueError(f"Знімок {label} обрізаний")
+        chunk = view[position:position + size]
+        if _LITTLE_ENDIAN:
+            arrays.append(chunk.cast(typecode))
+        else:
+            values = array(typecode, chunk.tobytes())
+            values.byteswap()
+            arrays.append(values)
+        position += size + _padding(size)
+
+    name_offsets = arrays.pop(0)
+    if position + blob_size > len(buffer):
+        raise ValueError(f"Знімок {label} обрізаний")
+    blob = bytes(buffer[position:position + blob_size])
+    names: List[str] = [blob[name_offsets[i]:name_offsets[i + 1]].decode('utf-8')
+                        for i in range(node_count)]
+    return CompiledGraph(names, *arrays, segments=None)
+
+
+def main(argv: List[str]) -> int:
+    from loader import load_graph
+
+    if len(argv) != 3:
+        print("Використання: python graph_file.py routes.json routes.graph")
+        return 2
+    graph = load_graph(argv[1])
+    save_graph(graph, argv[2])
+    print(f"Граф з {graph.node_count} міст і {graph.edge_count} сегментів збережено у {argv[2]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
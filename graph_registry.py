@@ -0,0 +1,221 @@
+import os
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+
+import events
+from events import INFO, WARNING
+from graph import DURATION, HOPS, PRICE, TRANSPORT_TYPES, CompiledGraph, mode_mask
+from loader import load_graph
+from route_builder import SEARCH_METRICS
+from route_cache import RouteCache
+from shortest_paths import TreeCache
+
+
+def _signatures(graph: CompiledGraph) -> set:
+    names = graph.names
+    return {(names[graph.sources[edge]], names[graph.targets[edge]], graph.prices[edge],
+             graph.durations[edge], TRANSPORT_TYPES[graph.transports[edge]] if graph.transports[edge] >= 0 else None)
+            for edge in range(graph.edge_count)}
+
+
+class GraphDiff:
+    """Різниця між двома версіями мережі в термінах сегментів (місто, сегмент).
+
+    ``improved`` - метрики, за якими в новій версії з'явився сегмент кращий за
+    будь-який старий між тими ж містами. Якщо метрика не покращилась, а всі
+    сегменти кешованого маршруту лишились без змін, маршрут досі оптимальний:
+    будь-який новий шлях не дешевший за відповідний старий. Для пошуку з
+    фільтром видів транспорту те саме рахується лише по дозволених сегментах.
+    """
+
+    def __init__(self, old: CompiledGraph, new: CompiledGraph):
+        self._old_signatures = _signatures(old)
+        self._signatures = _signatures(new)
+        self.added = self._signatures - self._old_signatures
+        self.removed = self._old_signatures - self._signatures
+        self._changes = {}
+        self.improved = self._compare(None)[0]
+
+    def _compare(self, modes: Optional[int]):
+        """(покращені метрики, чи кожен новий сегмент не кращий за старий між тими ж містами) для маски."""
+        changes = self._changes.get(modes)
+        if changes is not None:
+            return changes
+        #з фільтром новий дозволений сегмент може бути кращим за всі дозволені старі,
+        #не покращивши мінімуму разом із забороненими
+        allowed = lambda transport: modes is None or (transport is not None and mode_mask(transport) & modes)
+        known = {}
+        for origin, destination, price, duration, transport in self._old_signatures:
+            if allowed(transport):
+                known.setdefault((origin, destination), []).append((price, duration))
+        improved = set()
+        dominated = True
+        for origin, destination, price, duration, transport in self.added:
+            if not allowed(transport):
+                continue
+            segments = known.get((origin, destination))
+            if segments is None:
+                improved.update((PRICE, DURATION, HOPS))
+                dominated = False
+                continue
+            if price < min(old_price for old_price, _ in segments):
+                improved.add(PRICE)
+            if duration < min(old_duration for _, old_duration in segments):
+                improved.add(DURATION)
+            if not any(old_price <= price and old_duration <= duration for old_price, old_duration in segments):
+                dominated = False
+        changes = self._changes[modes] = (improved, dominated)
+        return changes
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def route_valid(self, route, metric: str, modes: Optional[int] = None) -> bool:
+        improved = self._compare(modes)[0]
+        if not route:
+            #недосяжне місто лишається недосяжним, якщо не з'явилось нових сполучень
+            return HOPS not in improved
+        if metric in improved:
+            return False
+        return all((city, segment['destination'], segment['price'], segment['duration_hours'],
+                    segment['transport_type']) in self._signatures
+                   for city, segment in zip(route.cities, route.route_list))
+
+    def keep(self, start_point: str, end_point: str, search_type, route) -> bool:
+        #пошук за розкладом і невідомі типи не переносимо
+        modes = None
+        if isinstance(search_type, tuple) and 'modes' in search_type:
+            #ключ RouteManager._cache_key: (тип, ..., 'modes', маска)
+            position = search_type.index('modes')
+            modes = search_type[position + 1]
+            search_type = search_type[:position] if position > 1 else search_type[0]
+        if isinstance(search_type, tuple):
+            #оптимум у межах бюджету може змінити сегмент, кращий за старі за поєднанням обох
+            #метрик, хоч і не за кожною окремо; тож переносимо, лише якщо кожен новий сегмент
+            #не кращий за якийсь старий між тими ж містами за обома метриками
+            if search_type[1] == 'budget' and not self._compare(modes)[1]:
+                return False
+            search_type = search_type[0]
+        metric = SEARCH_METRICS.get(search_type)
+        return metric is not None and self.route_valid(route, metric, modes)
+
+
+def _file_stamp(path: str):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_routes(path: str) -> CompiledGraph:
+    #розклад читає поле "departures", а Route має отримати незмінні оригінальні сегменти
+    return load_graph(path, keep_segments=True)
+
+
+class GraphRegistry:
+    """Поточна версія мережі маршрутів з гарячим перезавантаженням.
+
+    Нова версія будується поза гарячим шляхом і підміняється однією операцією
+    присвоєння (RCU): запит, що вже взяв ``registry.graph``, завершується на
+    старому знімку, а наступні бачать новий. Кешовані маршрути, що лишились
+    оптимальними, переносяться на нову версію, решта відкидається. Файл краще
+    оновлювати атомарно (запис у тимчасовий файл і ``os.replace``).
+    """
+
+    def __init__(self, path: str, loader: Callable[[str], CompiledGraph] = load_routes,
+                 cache: Optional[RouteCache] = None, trees: Optional[TreeCache] = None,
+                 poll_interval: float = 2.0):
+        self.path = path
+        self.cache = cache
+        self.trees = trees
+        self.poll_interval = poll_interval
+        self._loader = loader
+        self._lock = Lock()
+        self._stamp = _file_stamp(path)
+        self._failed_stamp = None
+        self._graph = loader(path)
+        self.reloads = 0
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def graph(self) -> CompiledGraph:
+        return self._graph
+
+    def reload(self, force: bool = False) -> bool:
+        """Перечитує файл, якщо він змінився. Повертає True, якщо версію підмінено."""
+        with self._lock:
+            stamp = _file_stamp(self.path)
+            if stamp == self._stamp and not force:
+                return False
+            new = self._loader(self.path)
+            old = self._graph
+            diff = GraphDiff(old, new)
+            self._stamp = stamp
+            #поля поза масивами (наприклад, "departures") порівнюємо за словниками сегментів
+            if not diff.changed and new.names == old.names and new.segments == old.segments:
+                #файл переписано без змін - лишаємо стару версію і кеші
+                return False
+
+            kept = 0
+            if self.cache is not None:
+                #кеш переходить на нову версію до підміни, тож нові запити вже його бачать
+                kept = self.cache.migrate(old.version, new.version, diff.keep)
+            if self.trees is not None:
+                self.trees.invalidate()
+            self._graph = new
+            self.reloads += 1
+        if events.enabled(INFO):
+            events.emit(INFO, 'graph.reloaded', "Мережу маршрутів оновлено: +{added}/-{removed} сегментів, "
+                        "збережено {kept} маршрутів у кеші.", version=new.version,
+                        added=len(diff.added), removed=len(diff.removed), kept=kept)
+        return True
+
+    def apply(self, update):
+        """Застосовує GraphUpdate до поточної версії без перечитування файлу.
+
+        Дерева найкоротших шляхів ремонтуються, а не будуються заново; зміни
+        діють до наступного перезавантаження файлу. Повертає UpdateReport.
+        """
+        from incremental import apply_update
+
+        with self._lock:
+            new, report = apply_update(self._graph, update, self.trees, self.cache)
+            self._graph = new
+        if events.enabled(INFO):
+            events.emit(INFO, 'graph.updated', "Мережу маршрутів змінено: переобчислено {recomputed} міст "
+                        "замість {full_rebuild}.", version=new.version, **report._asdict())
+        return report
+
+    def start(self) -> 'GraphRegistry':
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._watch, name='graph-registry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except (OSError, ValueError) as error:
+                #файл може бути записаний не до кінця - стара версія лишається робочою
+                stamp = self._failed_stamp
+                try:
+                    self._failed_stamp = _file_stamp(self.path)
+                except OSError:
+                    self._failed_stamp = None
+                if stamp != self._failed_stamp and events.enabled(WARNING):
+                    events.emit(WARNING, 'graph.reload_failed', "Не вдалося оновити мережу маршрутів: {error}",
+                                error=str(error))
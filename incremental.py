@@ -0,0 +1,265 @@
+import heapq
+from array import array
+from types import MappingProxyType
+from typing import List, NamedTuple, Optional, Tuple
+
+from graph import DURATION, PRICE, CompiledGraph, compile_graph, transport_code
+from graph_registry import GraphDiff
+from route_cache import RouteCache
+from shortest_paths import INF, ShortestPathTree, TreeCache
+
+#метрики, дерева яких ремонтуються; дерева за кількістю пересадок будуються заново
+REPAIRABLE_METRICS = (PRICE, DURATION)
+
+
+class UpdateReport(NamedTuple):
+    """Підсумок застосування змін: скільки міст переобчислено замість повної перебудови."""
+    trees_repaired: int
+    trees_dropped: int
+    recomputed: int
+    full_rebuild: int
+    routes_kept: int = 0
+
+
+class GraphUpdate:
+    """Набір змін сегментів: нова ціна чи тривалість, новий сегмент, видалений сегмент.
+
+    Сегмент визначається містом відправлення, містом призначення і, якщо між
+    ними кілька сегментів, типом транспорту. ``apply`` не змінює граф, а
+    повертає нову версію разом з відповідністю старих ребер новим.
+    """
+
+    def __init__(self):
+        self._weights = []
+        self._added = []
+        self._removed = []
+
+    def __bool__(self) -> bool:
+        return bool(self._weights or self._added or self._removed)
+
+    def set_weight(self, origin: str, destination: str, transport_type: Optional[str] = None,
+                   price=None, duration_hours=None) -> 'GraphUpdate':
+        fields = {}
+        if price is not None:
+            fields['price'] = price
+        if duration_hours is not None:
+            fields['duration_hours'] = duration_hours
+        if not fields:
+            raise ValueError("Потрібно вказати нову ціну або тривалість")
+        self._weights.append((origin, destination, transport_type, fields))
+        return self
+
+    def add_segment(self, origin: str, segment: dict) -> 'GraphUpdate':
+        self._added.append((origin, segment))
+        return self
+
+    def remove_segment(self, origin: str, destination: str, transport_type: Optional[str] = None) -> 'GraphUpdate':
+        self._removed.append((origin, destination, transport_type))
+        return self
+
+    def apply(self, graph_data) -> Tuple[CompiledGraph, array]:
+        """Повертає (новий граф, edge_map), де edge_map[старе ребро] - нове ребро або -1."""
+        graph = compile_graph(graph_data)
+        prices = array('d', graph.prices)
+        durations = array('d', graph.durations)
+        segments = None if graph.segments is None else list(graph.segments)
+        for origin, destination, transport_type, fields in self._weights:
+            edge = _find_edge(graph, origin, destination, transport_type)
+            prices[edge] = fields.get('price', prices[edge])
+            durations[edge] = fields.get('duration_hours', durations[edge])
+            if segments is not None:
+                segments[edge] = MappingProxyType(dict(segments[edge], **fields))
+
+        removed = set()
+        for origin, destination, transport_type in self._removed:
+            removed.add(_find_edge(graph, origin, destination, transport_type, removed))
+
+        if not self._added and not removed:
+            #ребра не додавались і не видалялись - CSR-структура спільна зі старою версією
+            edge_map = array('l', range(graph.edge_count))
+            return CompiledGraph(graph.names, graph.offsets, graph.sources, graph.targets, prices,
+                                 durations, graph.transports, segments), edge_map
+
+        names = list(graph.names)
+        index = dict(graph.index)
+
+        def city_id(name: str) -> int:
+            city = index.get(name)
+            if city is None:
+                city = index[name] = len(names)
+                names.append(name)
+            return city
+
+        added = {}
+        for origin, segment in self._added:
+            added.setdefault(city_id(origin), []).append(segment)
+            city_id(segment['destination'])
+
+        offsets = array('l', [0])
+        sources = array('l')
+        targets = array('l')
+        new_prices = array('d')
+        new_durations = array('d')
+        transports = array('b')
+        new_segments = None if segments is None else []
+        edge_map = array('l', [-1] * graph.edge_count)
+        for city in range(len(names)):
+            if city < graph.node_count:
+                for edge in range(graph.offsets[city], graph.offsets[city + 1]):
+                    if edge in removed:
+                        continue
+                    edge_map[edge] = len(targets)
+                    sources.append(city)
+                    targets.append(graph.targets[edge])
+                    new_prices.append(prices[edge])
+                    new_durations.append(durations[edge])
+                    transports.append(graph.transports[edge])
+                    if new_segments is not None:
+                        new_segments.append(segments[edge])
+            for segment in added.get(city, ()):
+                sources.append(city)
+                targets.append(index[segment['destination']])
+                new_prices.append(segment['price'])
+                new_durations.append(segment['duration_hours'])
+                transports.append(transport_code(segment['transport_type']))
+                if new_segments is not None:
+                    new_segments.append(MappingProxyType(segment))
+            offsets.append(len(targets))
+
+        return CompiledGraph(names, offsets, sources, targets, new_prices, new_durations,
+                             transports, new_segments), edge_map
+
+
+def _find_edge(graph: CompiledGraph, origin: str, destination: str, transport_type: Optional[str],
+               skip=()) -> int:
+    source = graph.index.get(origin)
+    target = graph.index.get(destination)
+    if source is not None and target is not None:
+        code = None if transport_type is None else transport_code(transport_type)
+        for edge in range(graph.offsets[source], graph.offsets[source + 1]):
+            if graph.targets[edge] == target and edge not in skip and \
+                    (code is None or graph.transports[edge] == code):
+                return edge
+    raise KeyError(f"Немає сегмента {origin} -> {destination}")
+
+
+def changed_edges(old: CompiledGraph, new: CompiledGraph, edge_map, metric: str):
+    """(старі ребра, що подорожчали чи зникли; нові ребра, що подешевшали чи з'явились)."""
+    old_weights = old.weights(metric)
+    new_weights = new.weights(metric)
+    worse = set()
+    better: List[int] = []
+    mapped = bytearray(new.edge_count)
+    for edge, new_edge in enumerate(edge_map):
+        if new_edge < 0:
+            worse.add(edge)
+            continue
+        mapped[new_edge] = 1
+        if new_weights[new_edge] > old_weights[edge]:
+            worse.add(edge)
+        elif new_weights[new_edge] < old_weights[edge]:
+            better.append(new_edge)
+    better.extend(edge for edge in range(new.edge_count) if not mapped[edge])
+    return worse, better
+
+
+def repair_tree(tree: ShortestPathTree, graph: CompiledGraph, edge_map, worse, better):
+    """Ремонтує дерево найкоротших шляхів під нову версію графа (динамічний SSSP).
+
+    Міста, чиє ребро-батько подорожчало чи зникло, разом з усім піддеревом
+    втрачають відстань і отримують найкращу з вхідних ребер від незачеплених
+    міст; кінці ребер, що подешевшали, отримують нову відстань. Далі Дейкстра
+    поширює зміни лише від цих міст. Повертає (нове дерево, переобчислено міст).
+    """
+    weights = graph.weights(tree.metric)
+    sources = graph.sources
+    targets = graph.targets
+    offsets = graph.offsets
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    added_cities = graph.node_count - len(tree.dist)
+    dist = list(tree.dist) + [INF] * added_cities
+    parents = [edge_map[edge] if edge >= 0 else -1 for edge in tree.parents] + [-1] * added_cities
+
+    #корені піддерев, шляхи до яких подорожчали
+    stack = [city for city, edge in enumerate(tree.parents) if edge in worse]
+    affected = []
+    if stack:
+        children = [[] for _ in range(graph.node_count)]
+        for city, edge in enumerate(parents):
+            if edge >= 0:
+                children[sources[edge]].append(city)
+        while stack:
+            city = stack.pop()
+            if dist[city] == INF:
+                continue
+            dist[city] = INF
+            parents[city] = -1
+            affected.append(city)
+            stack.extend(children[city])
+
+    priority_queue = []
+    if affected:
+        in_offsets, in_edges = graph.incoming()
+        for city in affected:
+            for i in range(in_offsets[city], in_offsets[city + 1]):
+                edge = in_edges[i]
+                cost = dist[sources[edge]] + weights[edge]
+                if cost < dist[city]:
+                    dist[city] = cost
+                    parents[city] = edge
+            if dist[city] != INF:
+                heappush(priority_queue, (dist[city], city))
+
+    for edge in better:
+        city = targets[edge]
+        cost = dist[sources[edge]] + weights[edge]
+        if cost < dist[city]:
+            dist[city] = cost
+            parents[city] = edge
+            heappush(priority_queue, (cost, city))
+
+    recomputed = 0
+    while priority_queue:
+        current, city = heappop(priority_queue)
+        if current > dist[city]:
+            continue
+        recomputed += 1
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            new_cost = current + weights[edge]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                parents[neighbor] = edge
+                heappush(priority_queue, (new_cost, neighbor))
+
+    return ShortestPathTree.from_arrays(graph, tree.origin, tree.metric, dist, parents), recomputed
+
+
+def apply_update(graph_data, update: GraphUpdate, trees: Optional[TreeCache] = None,
+                 cache: Optional[RouteCache] = None) -> Tuple[CompiledGraph, UpdateReport]:
+    """Застосовує зміни: нова версія графа, відремонтовані дерева й перенесені маршрути кешу."""
+    old = compile_graph(graph_data)
+    new, edge_map = update.apply(old)
+    changes = {}
+    totals = {'repaired': 0, 'dropped': 0, 'recomputed': 0, 'full': 0}
+
+    def transform(tree: ShortestPathTree):
+        if tree.metric not in REPAIRABLE_METRICS or tree.graph is not old:
+            totals['dropped'] += 1
+            return None
+        if tree.metric not in changes:
+            changes[tree.metric] = changed_edges(old, new, edge_map, tree.metric)
+        repaired, recomputed = repair_tree(tree, new, edge_map, *changes[tree.metric])
+        totals['repaired'] += 1
+        totals['recomputed'] += recomputed
+        #повна перебудова опрацювала б усі досяжні міста
+        totals['full'] += sum(1 for distance in repaired.dist if distance != INF)
+        return repaired
+
+    if trees is not None:
+        trees.migrate(old.version, new.version, transform)
+    kept = 0
+    if cache is not None:
+        kept = cache.migrate(old.version, new.version, GraphDiff(old, new).keep)
+    return new, UpdateReport(totals['repaired'], totals['dropped'], totals['recomputed'], totals['full'], kept)
@@ -0,0 +1,106 @@
+import heapq
+from itertools import count
+from typing import Iterator, List, Tuple
+
+from graph import CompiledGraph, HOPS
+from shortest_paths import INF, reverse_dijkstra
+
+
+def metric_weights(graph: CompiledGraph, metric: str):
+    if metric == HOPS:
+        return [1] * graph.edge_count
+    return graph.weights(metric)
+
+
+def _spur_search(graph: CompiledGraph, weights, source: int, target: int, to_target,
+                 blocked_cities, blocked_edges):
+    """A* від source до target в обхід заблокованих міст і ребер.
+
+    ``to_target`` - точні відстані до target у повному графі; після блокування
+    вони лишаються допустимою оцінкою. Повертає (вартість, ребра, опрацьовано міст).
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    dist = {source: 0}
+    parents = {}
+    settled = 0
+    priority_queue = [(to_target[source], 0, source)]
+
+    while priority_queue:
+        _, current, city = heappop(priority_queue)
+        if current > dist[city]:
+            continue
+        settled += 1
+        if city == target:
+            edges = []
+            while city != source:
+                edge = parents[city]
+                edges.append(edge)
+                city = graph.sources[edge]
+            edges.reverse()
+            return current, edges, settled
+
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            if edge in blocked_edges or neighbor in blocked_cities or to_target[neighbor] == INF:
+                continue
+            new_cost = current + weights[edge]
+            if new_cost < dist.get(neighbor, INF):
+                dist[neighbor] = new_cost
+                parents[neighbor] = edge
+                heappush(priority_queue, (new_cost + to_target[neighbor], new_cost, neighbor))
+
+    return INF, None, settled
+
+
+def k_shortest_paths(graph: CompiledGraph, weights, source: int,
+                     target: int) -> Iterator[Tuple[float, List[int], int]]:
+    """Ледачий генератор шляхів без циклів у порядку зростання вартості (алгоритм Йена).
+
+    Спільна робота між кандидатами: одне зворотне дерево відстаней до target
+    слугує точною оцінкою для всіх A*-пошуків відгалужень, а кожен знайдений
+    шлях розгалужується лише від точки, де він відійшов від батьківського
+    (модифікація Лоулера). Наступний шлях обчислюється лише тоді, коли його
+    запитують. Видає (вартість, ребра шляху, опрацьовано міст).
+    """
+    if source == target:
+        return
+    to_target = reverse_dijkstra(graph, weights, target)
+    if to_target[source] == INF:
+        return
+
+    cost, edges, settled = _spur_search(graph, weights, source, target, to_target, (), ())
+    #ребра, якими вже видані шляхи виходять з кожного спільного префікса
+    branches = {}
+    seen = {tuple(edges)}
+    candidates = []
+    order = count()
+    deviation = 0
+
+    while True:
+        for i in range(len(edges)):
+            branches.setdefault(tuple(edges[:i]), set()).add(edges[i])
+        yield cost, edges, settled
+
+        settled = 0
+        cities = [source] + [graph.targets[edge] for edge in edges]
+        root_cost = sum(weights[edge] for edge in edges[:deviation])
+        for i in range(deviation, len(edges)):
+            root = edges[:i]
+            spur_cost, spur_edges, spur_settled = _spur_search(
+                graph, weights, cities[i], target, to_target, set(cities[:i]), branches[tuple(root)])
+            settled += spur_settled
+            if spur_edges is not None:
+                path = root + spur_edges
+                key = tuple(path)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(candidates, (root_cost + spur_cost, next(order), i, path))
+            root_cost += weights[edges[i]]
+
+        if not candidates:
+            return
+        cost, _, deviation, edges = heapq.heappop(candidates)
@@ -0,0 +1,68 @@
+from typing import List
+
+from graph import CompiledGraph, compile_graph
+from shortest_paths import INF, dijkstra, reverse_dijkstra
+
+
+class Landmarks:
+    """Орієнтири для ALT-оцінки відстані (A*, landmarks, triangle inequality).
+
+    Для кожного орієнтира ``L`` зберігаються відстані ``d(L, v)`` і ``d(v, L)``.
+    З нерівності трикутника ``d(v, t) >= d(L, t) - d(L, v)`` і
+    ``d(v, t) >= d(v, L) - d(t, L)``, тож максимум по орієнтирах - допустима
+    нижня межа для A*.
+    """
+
+    def __init__(self, graph: CompiledGraph, metric: str, count: int = 4):
+        self.graph = graph
+        self.metric = metric
+        self.landmarks: List[int] = []
+        self.from_landmark: List[List[float]] = []
+        self.to_landmark: List[List[float]] = []
+
+        if graph.node_count == 0:
+            return
+        weights = graph.weights(metric)
+        #найвіддаленіші орієнтири: кожен наступний - найдальше місто від уже вибраних
+        closest = [INF] * graph.node_count
+        landmark = 0
+        for _ in range(min(count, graph.node_count)):
+            self.landmarks.append(landmark)
+            forward, _, _ = dijkstra(graph, weights, landmark)
+            self.from_landmark.append(forward)
+            self.to_landmark.append(reverse_dijkstra(graph, weights, landmark))
+            for city in range(graph.node_count):
+                distance = min(forward[city], self.to_landmark[-1][city])
+                if distance < closest[city]:
+                    closest[city] = distance
+            candidates = [city for city in range(graph.node_count)
+                          if city not in self.landmarks and closest[city] != INF]
+            if not candidates:
+                break
+            landmark = max(candidates, key=closest.__getitem__)
+
+    @classmethod
+    def for_graph(cls, graph_data, metric: str, count: int = 4) -> 'Landmarks':
+        graph = compile_graph(graph_data)
+        return graph.cached(('landmarks', metric, count), lambda g: cls(g, metric, count))
+
+    def heuristic(self, target: int):
+        #оцінка для конкретної кінцевої точки; значення орієнтирів до target беремо один раз
+        bounds = [(forward, backward, forward[target], backward[target])
+                  for forward, backward in zip(self.from_landmark, self.to_landmark)]
+
+        def estimate(city: int) -> float:
+            best = 0
+            for forward, backward, landmark_to_target, target_to_landmark in bounds:
+                from_city = forward[city]
+                if from_city != INF:
+                    bound = landmark_to_target - from_city
+                    if bound > best:
+                        best = bound
+                if target_to_landmark != INF:
+                    bound = backward[city] - target_to_landmark
+                    if bound > best:
+                        best = bound
+            return best
+
+        return estimate
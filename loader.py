@@ -0,0 +1,188 @@
+import json
+from array import array
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from graph import CompiledGraph, transport_code
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\r\n'
+
+
+class GraphBuilder:
+    """Збирає CompiledGraph з потоку сегментів без проміжного словника міст.
+
+    Ребра додаються у довільному порядку в компактні масиви, а ``build()``
+    групує їх за містом відправлення (стабільне сортування підрахунком).
+    Словники сегментів зберігаються лише при ``keep_segments=True``.
+    """
+
+    def __init__(self, keep_segments: bool = False):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.sources = array('l')
+        self.targets = array('l')
+        self.prices = array('d')
+        self.durations = array('d')
+        self.transports = array('b')
+        self.segments: Optional[list] = [] if keep_segments else None
+
+    def add_city(self, name: str) -> int:
+        city = self.index.get(name)
+        if city is None:
+            city = self.index[name] = len(self.names)
+            self.names.append(name)
+        return city
+
+    def add_segment(self, origin: str, segment: dict) -> None:
+        self.sources.append(self.add_city(origin))
+        self.targets.append(self.add_city(segment['destination']))
+        self.prices.append(segment['price'])
+        self.durations.append(segment['duration_hours'])
+        self.transports.append(transport_code(segment['transport_type']))
+        if self.segments is not None:
+            self.segments.append(MappingProxyType(segment))
+
+    def build(self) -> CompiledGraph:
+        node_count = len(self.names)
+        offsets = array('l', [0] * (node_count + 1))
+        for source in self.sources:
+            offsets[source + 1] += 1
+        for city in range(node_count):
+            offsets[city + 1] += offsets[city]
+
+        edge_count = len(self.sources)
+        order = array('l', [0] * edge_count)
+        fill = array('l', offsets)
+        for edge, source in enumerate(self.sources):
+            order[fill[source]] = edge
+            fill[source] += 1
+
+        segments = None if self.segments is None else [self.segments[edge] for edge in order]
+        return CompiledGraph(
+            self.names,
+            offsets,
+            array('l', (self.sources[edge] for edge in order)),
+            array('l', (self.targets[edge] for edge in order)),
+            array('d', (self.prices[edge] for edge in order)),
+            array('d', (self.durations[edge] for edge in order)),
+            array('b', (self.transports[edge] for edge in order)),
+            segments,
+        )
+
+
+class _StreamReader:
+    """Інкрементальний розбір JSON з файлу частинами по ``chunk_size`` символів."""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        #відкидаємо вже розібрану частину буфера
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Очікувався '{char}', знайдено '{found or 'кінець файлу'}'")
+        self._position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                #значення може бути обрізане межею частини - дочитуємо
+                if not self._fill():
+                    raise
+                continue
+            #число на межі частини може бути розібране не повністю
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._position = end
+            return value
+
+
+def iter_json_segments(file: TextIO, chunk_size: int = CHUNK_SIZE):
+    """Видає (місто, сегмент) з файлу формату routes.json, не завантажуючи його цілком.
+
+    Для міста без сегментів видається (місто, None).
+    """
+    reader = _StreamReader(file, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        city = reader.value()
+        if not isinstance(city, str):
+            raise ValueError("Назва міста має бути рядком")
+        reader.expect(':')
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.expect(']')
+            yield city, None
+        else:
+            while True:
+                yield city, reader.value()
+                if reader.peek() == ']':
+                    reader.expect(']')
+                    break
+                reader.expect(',')
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
+
+
+def iter_ndjson_segments(file: TextIO):
+    """Видає (місто, сегмент) з файлу, де кожен рядок - сегмент з полем ``origin``."""
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        segment = json.loads(line)
+        try:
+            origin = segment.pop('origin')
+        except KeyError:
+            raise ValueError(f"Рядок {number}: немає поля 'origin'") from None
+        yield origin, segment if 'destination' in segment else None
+
+
+def build_graph(segments: Iterable, keep_segments: bool = False) -> CompiledGraph:
+    builder = GraphBuilder(keep_segments)
+    for city, segment in segments:
+        if segment is None:
+            builder.add_city(city)
+        else:
+            builder.add_segment(city, segment)
+    return builder.build()
+
+
+def load_graph(path: str, keep_segments: bool = False, chunk_size: int = CHUNK_SIZE) -> CompiledGraph:
+    """Завантажує граф з routes.json або з файлу сегментів по рядку (.ndjson/.jsonl)."""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith(('.ndjson', '.jsonl')):
+            return build_graph(iter_ndjson_segments(file), keep_segments)
+        return build_graph(iter_json_segments(file, chunk_size), keep_segments)
@@ -1,29 +1,63 @@
 from route_builder import RouteManager
 from ticket import TicketManager
-import json
+from graph_registry import GraphRegistry
+from route_cache import RouteCache
+from shortest_paths import TreeCache
+from timetable import parse_time
+from loader import iter_json_segments
+import events
+
+ROUTES_PATH = "routes.json"
+
+
+def departure_cities(path: str):
+    #міста, з яких є сегменти, у порядку файлу - як у списку до переходу на реєстр графа
+    with open(path, 'r', encoding='utf-8') as file:
+        return list(dict.fromkeys(city for city, segment in iter_json_segments(file) if segment is not None))
+
 
 def main():
-    routes_dict = json.load(open("routes.json", 'r', encoding='utf-8'))
-    print(f"Доступні міста: {', '.join(routes_dict.keys())}")
+    #статус пошуку показуємо користувачу так само, як і раніше
+    events.subscribe(events.print_hook, events.INFO)
+    cache = RouteCache(maxsize=256)
+    trees = TreeCache()
+    #зміни у routes.json підхоплюються без перезапуску
+    registry = GraphRegistry(ROUTES_PATH, cache=cache, trees=trees).start()
+    print(f"Доступні міста: {', '.join(departure_cities(ROUTES_PATH))}")
     while True:
+        #весь запит виконується на одному знімку графа
+        graph = registry.graph
         start_city = input("Введіть місто відправлення: ")
-        if start_city not in routes_dict.keys():
+        #місто лише як пункт призначення не має сегментів, з яких можна продати квиток
+        start = graph.index.get(start_city)
+        if start is None or graph.offsets[start] == graph.offsets[start + 1]:
             print("На жаль, ми ще не продаємо квитки з цього міста. Можете обрати місто зі списку.")
             continue
 
         destination_city = input("Введіть місто прибуття: ")
-        if destination_city not in routes_dict.keys():
+        if destination_city not in graph.index:
             print("На жаль, ми ще не продаємо квитки в це місто. Можете обрати місто зі списку.")
             continue
 
         search_mode = input("Для пошуку найшвидшого маршруту введіть 1,\n" \
         "Для пошуку найдешевшого маршруту введіть 2, \n" \
-        "Для пошуку маршруту з найменшо кількістю пересадок, введіть 3: ")
-        if search_mode not in ('1', '2', '3'):
+        "Для пошуку маршруту з найменшо кількістю пересадок, введіть 3, \n" \
+        "Для пошуку маршруту з найранішим прибуттям за розкладом, введіть 4: ")
+        if search_mode not in ('1', '2', '3', '4'):
             print("Такого типу пошуку немає. Будь ласка, розпочніть спочатку.")
             continue
 
-        route_manager = RouteManager(int(search_mode), routes_dict, start_city, destination_city)
+        departure = None
+        if search_mode == '4':
+            departure = input("Введіть час відправлення (ГГ:ХХ): ")
+            try:
+                parse_time(departure)
+            except ValueError:
+                print("Некоректний час. Будь ласка, розпочніть спочатку.")
+                continue
+
+        route_manager = RouteManager(int(search_mode), graph, start_city, destination_city,
+                                     cache=cache, trees=trees, departure=departure)
         
         route = route_manager.get_route()
         route.describe()
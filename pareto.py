@@ -0,0 +1,81 @@
+import heapq
+from itertools import count
+from typing import List, Tuple
+
+from graph import CompiledGraph, PRICE, DURATION, HOPS
+
+#порядок критеріїв для ранжування результатів
+RANKINGS = {
+    PRICE: lambda label: (label[0], label[1], label[2]),
+    DURATION: lambda label: (label[1], label[0], label[2]),
+    HOPS: lambda label: (label[2], label[0], label[1]),
+}
+
+
+def _covered(bag, price, duration, hops) -> bool:
+    #мітка не гірша за нову за всіма критеріями
+    for bag_price, bag_duration, bag_hops in bag:
+        if bag_price <= price and bag_duration <= duration and bag_hops <= hops:
+            return True
+    return False
+
+
+def pareto_paths(graph: CompiledGraph, source: int, target: int,
+                 max_labels_per_city: int = 16) -> List[Tuple[float, float, int, List[int]]]:
+    """Парето-оптимальні шляхи за (ціна, тривалість, кількість сегментів) за один прохід.
+
+    Мітки витягуються з купи у лексикографічному порядку, тож мітка, що вже
+    потрапила в кошик міста, ніколи не буде домінована пізнішою. Нові мітки
+    відкидаються, якщо їх домінує кошик міста або кошик кінцевої точки.
+    ``max_labels_per_city`` обмежує розмір кошика, щоб пошук не розростався.
+    Повертає [(ціна, тривалість, сегменти, ребра шляху)].
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    prices = graph.prices
+    durations = graph.durations
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    bags = [[] for _ in range(graph.node_count)]
+    target_bag = bags[target]
+    #мітка: (ціна, тривалість, сегменти, місто, ребро, батьківська мітка)
+    labels = [(0, 0, 0, source, -1, -1)]
+    tiebreak = count()
+    heap = [(0, 0, 0, next(tiebreak), 0)]
+    found = []
+
+    while heap:
+        price, duration, hops, _, label = heappop(heap)
+        city = labels[label][3]
+        bag = bags[city]
+        if _covered(bag, price, duration, hops) or len(bag) >= max_labels_per_city:
+            continue
+        if city != target and _covered(target_bag, price, duration, hops):
+            continue
+        bag.append((price, duration, hops))
+        if city == target:
+            found.append(label)
+            continue
+
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            new_price = price + prices[edge]
+            new_duration = duration + durations[edge]
+            new_hops = hops + 1
+            if _covered(bags[neighbor], new_price, new_duration, new_hops) \
+                    or _covered(target_bag, new_price, new_duration, new_hops):
+                continue
+            labels.append((new_price, new_duration, new_hops, neighbor, edge, label))
+            heappush(heap, (new_price, new_duration, new_hops, next(tiebreak), len(labels) - 1))
+
+    results = []
+    for label in found:
+        price, duration, hops = labels[label][:3]
+        edges = []
+        while labels[label][4] >= 0:
+            edges.append(labels[label][4])
+            label = labels[label][5]
+        edges.reverse()
+        results.append((price, duration, hops, edges))
+    return results
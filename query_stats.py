@@ -0,0 +1,206 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+
+import events
+from events import INFO
+
+#поля QueryStats, що зводяться в гістограми
+FIELDS = ('nodes_popped', 'edges_relaxed', 'heap_pushes', 'stale_skipped',
+          'reconstruction_seconds', 'wall_seconds')
+
+#межі кошиків: 1, 2, 4, ... для лічильників і 1 мкс, 2 мкс, ... для часу
+COUNT_BOUNDS = tuple(float(2 ** i) for i in range(25))
+SECONDS_BOUNDS = tuple(1e-6 * 2 ** i for i in range(25))
+
+
+class QueryStats:
+    """Статистика одного пошуку маршруту.
+
+    ``edges_relaxed`` - ребра, що покращили відстань; ``stale_skipped`` -
+    застарілі записи купи, пропущені при вилученні.
+    """
+
+    __slots__ = ('strategy', 'found') + FIELDS + ('_started',)
+
+    def __init__(self, strategy: str = ''):
+        self.strategy = strategy
+        self.found = False
+        self.nodes_popped = 0
+        self.edges_relaxed = 0
+        self.heap_pushes = 0
+        self.stale_skipped = 0
+        self.reconstruction_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._started = time.perf_counter()
+
+    def add_search(self, popped: int, stale: int, remaining: int, starts: int = 1) -> None:
+        """Лічильники купи з підсумків пошуку: кожен запис або вилучено, або лишився в купі."""
+        pushes = popped + stale + remaining
+        self.nodes_popped += popped
+        self.stale_skipped += stale
+        self.heap_pushes += pushes
+        #кожне покращення відстані - один запис у купі, крім стартових
+        self.edges_relaxed += max(0, pushes - starts)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in ('strategy', 'found') + FIELDS}
+
+
+class Histogram:
+    """Гістограма з фіксованими межами кошиків (останній кошик - усе, що більше)."""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Верхня межа кошика, в який потрапляє квантиль q."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': list(zip(self.bounds + (float('inf'),), self.buckets)),
+        }
+
+
+#приймач метрик: sink(назва метрики, мітки, знімок гістограми)
+MetricsSink = Callable[[str, Dict[str, str], dict], None]
+
+
+class QueryMetrics:
+    """Гістограми статистики запитів за стратегією і полем."""
+
+    def __init__(self, sink: Optional[MetricsSink] = None):
+        self.sink = sink
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = Lock()
+        self.queries = 0
+
+    def record(self, stats: QueryStats) -> None:
+        with self._lock:
+            self.queries += 1
+            for name in FIELDS:
+                key = (stats.strategy, name)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    bounds = SECONDS_BOUNDS if name.endswith('_seconds') else COUNT_BOUNDS
+                    histogram = self._histograms[key] = Histogram(bounds)
+                histogram.observe(getattr(stats, name))
+
+    def histogram(self, strategy: str, name: str) -> Optional[Histogram]:
+        return self._histograms.get((strategy, name))
+
+    def export(self, sink: Optional[MetricsSink] = None) -> int:
+        """Передає знімки всіх гістограм у sink; повертає їх кількість."""
+        sink = sink or self.sink
+        if sink is None:
+            raise ValueError("Не задано приймач метрик")
+        with self._lock:
+            snapshots = [(key, histogram.snapshot()) for key, histogram in self._histograms.items()]
+        for (strategy, name), snapshot in snapshots:
+            sink(f'route_query_{name}', {'strategy': strategy}, snapshot)
+        return len(snapshots)
+
+
+class MemorySink:
+    """Приймач, що зберігає останні знімки; зручний для тестів і налагодження."""
+
+    def __init__(self):
+        self.metrics: Dict[Tuple[str, str], dict] = {}
+
+    def __call__(self, name: str, labels: Dict[str, str], snapshot: dict) -> None:
+        self.metrics[(name, labels.get('strategy', ''))] = snapshot
+
+
+def events_sink(name: str, labels: Dict[str, str], snapshot: dict) -> None:
+    """Приймач, що публікує метрики як події (їх отримують logging_hook та інші підписники)."""
+    if events.enabled(INFO):
+        events.emit(INFO, 'metrics.histogram', "{metric} [{strategy}]: {count} запитів, "
+                    "p50={p50:g}, p99={p99:g}", metric=name, strategy=labels.get('strategy', ''),
+                    count=snapshot['count'], p50=snapshot['p50'], p99=snapshot['p99'])
+
+
+#глобальний збирач; None - інструментування вимкнене
+_metrics: Optional[QueryMetrics] = None
+
+
+def enable(sink: Optional[MetricsSink] = None) -> QueryMetrics:
+    global _metrics
+    _metrics = QueryMetrics(sink)
+    return _metrics
+
+
+def disable() -> None:
+    global _metrics
+    _metrics = None
+
+
+def metrics() -> Optional[QueryMetrics]:
+    return _metrics
+
+
+def begin(strategy, stats: Optional[QueryStats] = None) -> Optional[QueryStats]:
+    """Статистика для нового запиту або None, якщо її ніхто не збирає."""
+    if stats is None:
+        if _metrics is None:
+            return None
+        stats = QueryStats()
+    stats.strategy = type(strategy).__name__
+    stats._started = time.perf_counter()
+    return stats
+
+
+def finish(stats: QueryStats, route) -> None:
+    stats.found = bool(route)
+    stats.wall_seconds = time.perf_counter() - stats._started
+    if _metrics is not None:
+        _metrics.record(stats)
+
+
+class _Timer:
+    __slots__ = ('stats', '_started')
+
+    def __init__(self, stats: QueryStats):
+        self.stats = stats
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.stats.reconstruction_seconds += time.perf_counter() - self._started
+
+
+_NO_TIMER = nullcontext()
+
+
+def reconstruction(stats: Optional[QueryStats]):
+    """Контекст, що додає свій час до reconstruction_seconds; без статистики нічого не робить."""
+    return _NO_TIMER if stats is None else _Timer(stats)
+
@@ -1,11 +1,106 @@
-from typing import List, Union
+from types import MappingProxyType
+from typing import List, Optional, Union
 
 class Route:
-    def __init__(self, start_city: str, route_list: List):
-        self.route_list = route_list
-        self.cities: List[str] = [start_city] + [segment['destination'] for segment in self.route_list]
-        self.price: Union[float, int] = sum([segment['price'] for segment in self.route_list])
-        self.duration: Union[float, int] = sum([segment['duration_hours'] for segment in self.route_list])
+    #маршрут незмінний, тому один об'єкт можна безпечно віддавати з кешу
+    __slots__ = ('nodes_settled', '_graph', '_parents', '_source', '_target', '_edges',
+                 '_route_list', '_cities', '_price', '_duration')
+
+    def __init__(self, start_city: str, route_list: List, nodes_settled: Optional[int] = None):
+        route_list = tuple(route_list)
+        #скільки міст опрацював пошук, що знайшов маршрут (для порівняння алгоритмів)
+        object.__setattr__(self, 'nodes_settled', nodes_settled)
+        for name in ('_graph', '_parents', '_source', '_target', '_edges', '_price', '_duration'):
+            object.__setattr__(self, name, None)
+        object.__setattr__(self, '_route_list', route_list)
+        object.__setattr__(self, '_cities', (start_city,) + tuple(segment['destination'] for segment in route_list))
+
+    @classmethod
+    def from_parents(cls, graph, parents, source: int, target: int,
+                     nodes_settled: Optional[int] = None) -> 'Route':
+        """Маршрут за масивом ребер-предків пошуку, без відновлення шляху.
+
+        Ребра, сегменти, міста й суми обчислюються при першому зверненні і лише раз.
+        Масив ``parents`` після пошуку не змінюється, тож його можна тримати до того,
+        але він займає O(V): маршрут, який довго зберігається (наприклад, у кеші),
+        варто спершу перевести на ребра через ``edges``.
+        """
+        route = cls.__new__(cls)
+        for name, value in (('nodes_settled', nodes_settled), ('_graph', graph), ('_parents', parents),
+                            ('_source', source), ('_target', target), ('_edges', None),
+                            ('_route_list', None), ('_cities', None), ('_price', None), ('_duration', None)):
+            object.__setattr__(route, name, value)
+        return route
+
+    @classmethod
+    def from_edges(cls, graph, source: int, edges, nodes_settled: Optional[int] = None) -> 'Route':
+        """Маршрут за списком ребер скомпільованого графа; сегменти будуються при першому зверненні."""
+        route = cls.from_parents(graph, None, source, None, nodes_settled)
+        object.__setattr__(route, '_edges', tuple(edges))
+        return route
+
+    @property
+    def edges(self) -> Optional[tuple]:
+        """Ребра графа, з яких складається маршрут; None для маршруту зі звичайних сегментів."""
+        #одночасне перше звернення з кількох потоків лише обчислить те саме значення двічі
+        #_parents читаємо один раз: інший потік може тим часом його скинути
+        parents = self._parents
+        if self._edges is None and parents is not None:
+            from shortest_paths import path_edges
+            object.__setattr__(self, '_edges', tuple(path_edges(self._graph, parents,
+                                                                self._source, self._target)))
+            #дерево предків більше не потрібне - не тримаємо його в кеші маршрутів
+            object.__setattr__(self, '_parents', None)
+        return self._edges
+
+    @property
+    def route_list(self) -> tuple:
+        if self._route_list is None:
+            segment = self._graph.segment
+            object.__setattr__(self, '_route_list', tuple(segment(edge) for edge in self.edges))
+        return self._route_list
+
+    @property
+    def cities(self) -> tuple:
+        if self._cities is None:
+            names, targets = self._graph.names, self._graph.targets
+            object.__setattr__(self, '_cities', (names[self._source],) +
+                               tuple(names[targets[edge]] for edge in self.edges))
+        return self._cities
+
+    @property
+    def price(self) -> Union[float, int]:
+        if self._price is None:
+            object.__setattr__(self, '_price', sum(segment['price'] for segment in self.route_list))
+        return self._price
+
+    @property
+    def duration(self) -> Union[float, int]:
+        if self._duration is None:
+            object.__setattr__(self, '_duration', sum(segment['duration_hours'] for segment in self.route_list))
+        return self._duration
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Route є незмінним, атрибут '{name}' не можна змінити")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Route є незмінним, атрибут '{name}' не можна видалити")
+
+    def __reduce__(self):
+        #pickle і copy не можуть відновити стан через заборонений __setattr__;
+        #лінивий маршрут віддаємо вже обчисленим, без графа й масиву предків
+        if self._graph is not None:
+            self.edges, self.route_list, self.cities, self.price, self.duration
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                state[name] = None if name in ('_graph', '_parents') else getattr(self, name)
+        #сегменти графа - MappingProxyType, який не серіалізується; відновлюємо їх теж незмінними
+        frozen = state['_route_list'] is not None and any(isinstance(segment, MappingProxyType)
+                                                          for segment in state['_route_list'])
+        if frozen:
+            state['_route_list'] = tuple(dict(segment) for segment in state['_route_list'])
+        return _restore_route, (type(self), state, frozen)
 
     def describe(self):
         print(f"Маршрут проходить через {len(self.cities)} міст:")
@@ -34,4 +129,13 @@ class Route:
         return self.duration
     
     def get_price(self) -> Union[float, int]:
-        return self.price
\ No newline at end of file
+        return self.price
+
+
+def _restore_route(cls, state, frozen=False):
+    if frozen:
+        state['_route_list'] = tuple(MappingProxyType(segment) for segment in state['_route_list'])
+    route = cls.__new__(cls)
+    for name, value in state.items():
+        object.__setattr__(route, name, value)
+    return route
@@ -1,195 +1,545 @@
-from typing import List, Dict
-import heapq
-from collections import deque
+from itertools import islice
+from typing import Iterator, List, Dict, Optional
 from route import Route
+from graph import compile_graph, PRICE, DURATION, HOPS
+from shortest_paths import (INF, astar, bfs, bidirectional_dijkstra, dijkstra, path_edges, ShortestPathTree,
+                            TreeCache)
+from landmarks import Landmarks
+from contraction import ContractionHierarchy
+from pareto import RANKINGS, pareto_paths
+from k_shortest import k_shortest_paths, metric_weights
+from constrained import BUDGET_METRICS, constrained_path
+from timetable import Timetable, format_time, parse_time
+from route_cache import RouteCache
+from routing_table import RoutingTable
 from abc import ABC, abstractmethod
+import events
+from events import INFO
+import query_stats
+from query_stats import QueryStats
 
 class ISearchStrategy(ABC):
     @abstractmethod
-    def find_route(self, start: str, end: str) -> List:
+    def find_route(self, graph_data, start_point: str, end_point: str):
         pass
 
-class CheapestRouteStrategy(ISearchStrategy):
-    def find_route(self, graph_data: dict, start_point: str, end_point: str):
-        print(f"Пошук НАЙДЕШЕВШОГО маршруту з {start_point} до {end_point}...")
-        
-        #dict to store price to each destination
-        costs = {city: float('inf') for city in graph_data}
-        costs[start_point] = 0
-        
-        #child: father dict
-        parents = {city: None for city in graph_data}
-        
-        #heap to store the cheapest
-        priority_queue = [(0, start_point)] 
-        
-        processed = set()
-
-        while priority_queue:
-            current_cost, current_city = heapq.heappop(priority_queue)
-
-            #skip if the cheapest route was found
-            if current_cost > costs[current_city] or current_city in processed:
-                continue
-
-            processed.add(current_city)
-            
-            if current_city == end_point:
-                break 
-
-            # check neighbours
-            if current_city in graph_data:
-                for segment in graph_data[current_city]:
-                    neighbor_city = segment["destination"]
-                    segment_price = segment["price"]
-                    
-                    new_cost = current_cost + segment_price
-                    
-                    if new_cost < costs[neighbor_city]:
-                        costs[neighbor_city] = new_cost
-                        #track our route
-                        parents[neighbor_city] = {
-                            "from": current_city, 
-                            "segment_details": segment
-                        }
-                        heapq.heappush(priority_queue, (new_cost, neighbor_city))
 
-        
-        #represent route
-        if costs[end_point] == float('inf'):
-            print("Шлях не знайдено.")
+class InstrumentedStrategy(ISearchStrategy):
+    """Стратегія, що заповнює QueryStats, коли його передано або ввімкнено збір метрик.
+
+    Підкласи реалізують ``_search``; без статистики зайвої роботи немає.
+    """
+
+    def find_route(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats] = None):
+        stats = query_stats.begin(self, stats)
+        if stats is None:
+            return self._search(graph_data, start_point, end_point, None)
+        route = self._search(graph_data, start_point, end_point, stats)
+        query_stats.finish(stats, route)
+        return route
+
+    @abstractmethod
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        pass
+
+
+#повідомлення про початок пошуку для кожного типу пошуку RouteManager
+SEARCH_TITLES = {
+    1: "Пошук НАЙШВИДШОГО маршруту з {start} до {end}...",
+    2: "Пошук НАЙДЕШЕВШОГО маршруту з {start} до {end}...",
+    3: "Пошук маршруту з НАЙМЕНШОЮ КІЛЬКІСТЮ ПЕРЕСАДОК з {start} до {end}...",
+}
+
+#повідомлення про знайдений маршрут для кожного типу пошуку RouteManager
+SEARCH_FOUND = {
+    1: "Знайдено шлях.",
+    2: "Знайдено шлях",
+    3: "Знайдено шлях. Кількість сегментів: {segments}",
+}
+
+
+def _search_started(template: str, start_point: str, end_point: str) -> None:
+    if events.enabled(INFO):
+        events.emit(INFO, 'search.started', template, start=start_point, end=end_point)
+
+
+def _route_found(route: Route, template: str = SEARCH_FOUND[1]) -> None:
+    if events.enabled(INFO):
+        events.emit(INFO, 'search.found', template, segments=len(route.route_list),
+                    nodes_settled=route.nodes_settled)
+
+
+def _route_not_found(start_point: str, end_point: str) -> None:
+    if events.enabled(INFO):
+        events.emit(INFO, 'search.not_found', "Шлях не знайдено.", start=start_point, end=end_point)
+
+
+def _timetable_started(start_point: str, end_point: str, departure: int) -> None:
+    if events.enabled(INFO):
+        events.emit(INFO, 'search.started', "Пошук маршруту з НАЙРАНІШИМ ПРИБУТТЯМ з {start} до {end} "
+                    "після {departure}...", start=start_point, end=end_point, departure=format_time(departure))
+
+
+def _timetable_found(route) -> None:
+    if events.enabled(INFO):
+        events.emit(INFO, 'search.found', "Знайдено шлях. Прибуття: {arrival}.",
+                    segments=len(route.route_list), arrival=format_time(route.arrival))
+
+
+def _reconstruct(stats: Optional[QueryStats], route: Route) -> Route:
+    #маршрут лінивий; коли збирається статистика, сегменти відновлюються одразу,
+    #щоб reconstruction_seconds вимірював саме цю роботу, а не конструктор
+    if stats is not None:
+        with query_stats.reconstruction(stats):
+            route.route_list
+    return route
+
+
+def _weights(graph, metric: str, modes: Optional[int]):
+    #без маски - масиви графа; з маскою - закешовані ваги, де заборонені сегменти нескінченні
+    return metric_weights(graph, metric) if modes is None else graph.mode_weights(metric, modes)
+
+
+def _search_graph(graph_data, modes: Optional[int], *metrics: str):
+    #без фільтра шукаємо по графу без домінованих паралельних ребер; маска могла б
+    #заборонити саме те ребро, що лишилось, тому з нею - повний граф
+    graph = compile_graph(graph_data)
+    return graph.pruned(*metrics) if modes is None else graph
+
+
+def _full_route(full_graph, graph, source: int, edges, settled: int) -> Route:
+    #пошук іде по графу без домінованих паралельних ребер; маршрут будуємо над повним графом,
+    #щоб route.edges були номерами ребер графа, переданого стратегії
+    edge_ids = getattr(graph, 'edge_ids', None)
+    if edge_ids is not None:
+        edges = [edge_ids[edge] for edge in edges]
+    return Route.from_edges(full_graph, source, edges, settled)
+
+
+def _shortest_route(graph_data, start_point: str, end_point: str, metric: str, stats: Optional[QueryStats],
+                    modes: Optional[int] = None):
+    full_graph = compile_graph(graph_data)
+    graph = _search_graph(full_graph, modes, metric)
+    target = graph.index[end_point]
+    source = graph.index.get(start_point)
+    if source is None:
+        _route_not_found(start_point, end_point)
+        return []
+
+    dist, parents, settled = dijkstra(graph, _weights(graph, metric, modes), source, target, stats)
+
+    #represent route
+    if dist[target] == INF:
+        _route_not_found(start_point, end_point)
+        return []
+
+    edges = path_edges(graph, parents, source, target)
+    return _reconstruct(stats, _full_route(full_graph, graph, source, edges, settled))
+
+
+class CheapestRouteStrategy(InstrumentedStrategy):
+    def __init__(self, modes: Optional[int] = None):
+        #маска дозволених видів транспорту (graph.mode_mask); None - будь-які
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started(SEARCH_TITLES[2], start_point, end_point)
+        route = _shortest_route(graph_data, start_point, end_point, PRICE, stats, self.modes)
+        if route:
+            _route_found(route, SEARCH_FOUND[2])
+        return route
+
+class FastestRouteStrategy(InstrumentedStrategy):
+    def __init__(self, modes: Optional[int] = None):
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started(SEARCH_TITLES[1], start_point, end_point)
+        route = _shortest_route(graph_data, start_point, end_point, DURATION, stats, self.modes)
+        if route:
+            _route_found(route)
+        return route
+    
+class FewestStopsStrategy(InstrumentedStrategy):
+    def __init__(self, modes: Optional[int] = None):
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started(SEARCH_TITLES[3], start_point, end_point)
+
+        full_graph = compile_graph(graph_data)
+        graph = _search_graph(full_graph, self.modes, HOPS)
+        source = graph.index.get(start_point)
+        target = graph.index.get(end_point)
+        if source is None or target is None:
+            _route_not_found(start_point, end_point)
             return []
 
-        path = []
-        temp_city = end_point
-        
-        while temp_city != start_point:
-            parent_info = parents[temp_city]
-            if parent_info is None:
-                break 
-                
-            path.insert(0, parent_info["segment_details"]) 
-            temp_city = parent_info["from"]
-
-        print(f"Знайдено шлях")
-        return Route(start_point, path)
-
-class FastestRouteStrategy(ISearchStrategy):
-    def find_route(self, graph_data: dict, start_point: str, end_point: str):
-        print(f"Пошук НАЙШВИДШОГО маршруту з {start_point} до {end_point}...")
-        
-        #dict to store time for each destination
-        time = {city: float('inf') for city in graph_data}
-        time[start_point] = 0
-        
-        #child: father dict
-        parents = {city: None for city in graph_data}
-        
-        #heap to store the fastest
-        priority_queue = [(0, start_point)] 
-        
-        processed = set()
-
-        while priority_queue:
-            current_time, current_city = heapq.heappop(priority_queue)
-
-            #skip if the cheapest route was found
-            if current_time > time[current_city] or current_city in processed:
-                continue
-
-            processed.add(current_city)
-            
-            if current_city == end_point:
-                break 
-
-            # check neighbours
-            if current_city in graph_data:
-                for segment in graph_data[current_city]:
-                    neighbor_city = segment["destination"]
-                    segment_time = segment["duration_hours"]
-                    
-                    new_time = current_time + segment_time
-                    
-                    if new_time < time[neighbor_city]:
-                        time[neighbor_city] = new_time
-                        #track our route
-                        parents[neighbor_city] = {
-                            "from": current_city, 
-                            "segment_details": segment
-                        }
-                        heapq.heappush(priority_queue, (new_time, neighbor_city))
+        if self.modes is None:
+            dist, parents, settled = bfs(graph, source, target, stats)
+        else:
+            #з фільтром - Дейкстра по одиничних вагах, де заборонені сегменти нескінченні
+            dist, parents, settled = dijkstra(graph, graph.mode_weights(HOPS, self.modes),
+                                              source, target, stats)
+        if dist[target] == INF or source == target:
+            _route_not_found(start_point, end_point)
+            return []
 
-        
-        #represent route
-        if time[end_point] == float('inf'):
-            print("Шлях не знайдено.")
+        edges = path_edges(graph, parents, source, target)
+        route = _reconstruct(stats, _full_route(full_graph, graph, source, edges, settled))
+        _route_found(route, SEARCH_FOUND[3])
+        return route
+
+
+class BidirectionalRouteStrategy(InstrumentedStrategy):
+    """Двонапрямлений Дейкстра за ціною або тривалістю."""
+
+    def __init__(self, metric: str = PRICE, modes: Optional[int] = None):
+        self.metric = metric
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Двонапрямлений пошук маршруту з {start} до {end}...", start_point, end_point)
+        full_graph = compile_graph(graph_data)
+        graph = _search_graph(full_graph, self.modes, self.metric)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None:
+            _route_not_found(start_point, end_point)
             return []
 
-        path = []
-        temp_city = end_point
-        
-        while temp_city != start_point:
-            parent_info = parents[temp_city]
-            if parent_info is None:
-                break 
-                
-            path.insert(0, parent_info["segment_details"]) 
-            temp_city = parent_info["from"]
-
-        print(f"Знайдено шлях.")
-        return Route(start_point, path)
-    
-class FewestStopsStrategy(ISearchStrategy):
-    def find_route(self, graph_data: Dict, start_point: str, end_point: str) -> List[Dict]:
-        print(f"Пошук маршруту з НАЙМЕНШОЮ КІЛЬКІСТЮ ПЕРЕСАДОК з {start_point} до {end_point}...")
-        
-        
-        queue = deque( [(start_point, [])] )
-        
-        visited = {start_point} 
-
-        # BFS implementation
-        while queue:
-            current_city, path_segments = queue.popleft()
-            #check the neighbour
-            if current_city in graph_data:
-                for segment in graph_data[current_city]:
-                    neighbor_city = segment["destination"]
-                    
-                    if neighbor_city not in visited:
-
-                        new_path = path_segments + [segment]
-                        
-                        #check if in the end
-                        if neighbor_city == end_point:
-                            print(f"Знайдено шлях. Кількість сегментів: {len(new_path)}")
-                            return Route(start_point, new_path)
-                        
-                        
-                        visited.add(neighbor_city)
-                        queue.append( (neighbor_city, new_path) )
-
-        print("Шлях не знайдено.")
-        return []
+        cost, edges, settled = bidirectional_dijkstra(graph, _weights(graph, self.metric, self.modes),
+                                                      source, target, stats)
+        if edges is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        route = _reconstruct(stats, _full_route(full_graph, graph, source, edges, settled))
+        _route_found(route)
+        return route
+
+
+class AStarRouteStrategy(InstrumentedStrategy):
+    """A* з нижніми межами від орієнтирів (ALT), обчисленими один раз для графа."""
+
+    def __init__(self, metric: str = PRICE, landmarks: int = 4, modes: Optional[int] = None):
+        self.metric = metric
+        self.landmarks = landmarks
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Пошук маршруту A* з {start} до {end}...", start_point, end_point)
+        full_graph = compile_graph(graph_data)
+        graph = _search_graph(full_graph, self.modes, self.metric)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        #відстані без домінованих ребер ті самі, тож орієнтири повного графа підходять і тут,
+        #а з фільтром лишаються нижніми межами
+        heuristic = Landmarks.for_graph(full_graph, self.metric, self.landmarks).heuristic(target)
+        cost, edges, settled = astar(graph, _weights(graph, self.metric, self.modes), source, target,
+                                     heuristic, stats)
+        if edges is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        route = _reconstruct(stats, _full_route(full_graph, graph, source, edges, settled))
+        _route_found(route)
+        return route
     
 
+class ContractionRouteStrategy(InstrumentedStrategy):
+    """Запит по contraction hierarchies; ієрархія будується один раз для графа і метрики."""
+
+    def __init__(self, metric: str = PRICE):
+        self.metric = metric
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Пошук маршруту по ієрархії з {start} до {end}...", start_point, end_point)
+        graph = compile_graph(graph_data)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        cost, edges, settled = ContractionHierarchy.for_graph(graph, self.metric).query(source, target)
+        if stats is not None:
+            stats.nodes_popped += settled
+        if edges is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        route = _reconstruct(stats, Route.from_edges(graph, source, edges, settled))
+        _route_found(route)
+        return route
+
+
+class ParetoRouteStrategy(InstrumentedStrategy):
+    """Усі Парето-оптимальні маршрути за (ціна, тривалість, пересадки) за один пошук.
+
+    Повертає список ``Route``, упорядкований за критерієм ``rank_by``.
+    """
+
+    def __init__(self, rank_by: str = PRICE, max_labels_per_city: int = 16):
+        if rank_by not in RANKINGS:
+            raise ValueError(f"Невідомий критерій: {rank_by}")
+        self.rank_by = rank_by
+        self.max_labels_per_city = max_labels_per_city
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Пошук компромісних маршрутів з {start} до {end}...", start_point, end_point)
+        graph = compile_graph(graph_data)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None or source == target:
+            _route_not_found(start_point, end_point)
+            return []
+
+        paths = pareto_paths(graph, source, target, self.max_labels_per_city)
+        if not paths:
+            _route_not_found(start_point, end_point)
+            return []
+
+        paths.sort(key=RANKINGS[self.rank_by])
+        routes = [_reconstruct(stats, Route.from_edges(graph, source, edges)) for _, _, _, edges in paths]
+        if events.enabled(INFO):
+            events.emit(INFO, 'search.found', "Знайдено {count} компромісних маршрутів.", count=len(routes))
+        return routes
+
+
+class AlternativeRoutesStrategy(InstrumentedStrategy):
+    """До ``k`` найкращих маршрутів без циклів за однією метрикою (алгоритм Йена).
+
+    ``find_route`` повертає список ``Route`` за зростанням вартості, а
+    ``iter_routes`` видає маршрути по одному, обчислюючи наступний лише на запит.
+    """
+
+    def __init__(self, metric: str = PRICE, k: int = 3, modes: Optional[int] = None):
+        if k <= 0:
+            raise ValueError("k має бути додатним")
+        self.metric = metric
+        self.k = k
+        self.modes = modes
+
+    def iter_routes(self, graph_data, start_point: str, end_point: str) -> Iterator[Route]:
+        graph = compile_graph(graph_data)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None:
+            return
+        for _, edges, settled in k_shortest_paths(graph, _weights(graph, self.metric, self.modes), source, target):
+            yield Route.from_edges(graph, source, edges, settled)
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Пошук альтернативних маршрутів з {start} до {end}...", start_point, end_point)
+        routes = list(islice(self.iter_routes(graph_data, start_point, end_point), self.k))
+        if stats is not None:
+            stats.nodes_popped += sum(route.nodes_settled for route in routes)
+        if not routes:
+            _route_not_found(start_point, end_point)
+        elif events.enabled(INFO):
+            events.emit(INFO, 'search.found', "Знайдено {count} альтернативних маршрутів.", count=len(routes))
+        return routes
+
+
+class ConstrainedRouteStrategy(InstrumentedStrategy):
+    """Найкращий за ``metric`` маршрут, сума ``budget_metric`` якого не більша за ``budget``.
+
+    Наприклад, найшвидший маршрут дешевший за 2000 грн чи найдешевший коротший за 10 годин.
+    """
+
+    def __init__(self, metric: str, budget_metric: str, budget: float, modes: Optional[int] = None):
+        if budget_metric not in BUDGET_METRICS:
+            raise ValueError(f"Обмеження за метрикою {budget_metric} не підтримується")
+        self.metric = metric
+        self.budget_metric = budget_metric
+        self.budget = budget
+        self.modes = modes
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _search_started("Пошук маршруту з {start} до {end} в межах бюджету...", start_point, end_point)
+        full_graph = compile_graph(graph_data)
+        graph = _search_graph(full_graph, self.modes, self.metric, self.budget_metric)
+        target = graph.index[end_point]
+        source = graph.index.get(start_point)
+        if source is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        cost, edges, settled = constrained_path(graph, source, target, self.metric, self.budget_metric,
+                                                self.budget, stats, self.modes)
+        if edges is None:
+            _route_not_found(start_point, end_point)
+            return []
+
+        route = _reconstruct(stats, _full_route(full_graph, graph, source, edges, settled))
+        _route_found(route)
+        return route
+
+
+class EarliestArrivalStrategy(InstrumentedStrategy):
+    """Найраніше прибуття за розкладом (Connection Scan Algorithm) з відправленням не раніше заданого."""
+
+    def __init__(self, departure, timetable: Optional[Timetable] = None):
+        self.departure = parse_time(departure)
+        self.timetable = timetable
+
+    def _search(self, graph_data, start_point: str, end_point: str, stats: Optional[QueryStats]):
+        _timetable_started(start_point, end_point, self.departure)
+        graph = compile_graph(graph_data)
+        timetable = self.timetable if self.timetable is not None else Timetable.for_graph(graph)
+        if start_point not in graph.index:
+            _route_not_found(start_point, end_point)
+            return []
+
+        route = timetable.journey(start_point, end_point, self.departure)
+        if route:
+            _timetable_found(route)
+        else:
+            _route_not_found(start_point, end_point)
+        return route
+
+
+#метрика, яку оптимізує кожен тип пошуку RouteManager
+SEARCH_METRICS = {1: DURATION, 2: PRICE, 3: HOPS}
+
+#метрика, яку обмежує бюджет для типів пошуку 1 і 2
+SEARCH_BUDGETS = {1: PRICE, 2: DURATION}
+
+#тип пошуку за розкладом; потребує часу відправлення
+TIMETABLE_SEARCH = 4
+
+#алгоритми точкового пошуку для типів 1 і 2, крім звичайного Дейкстри
+ALGORITHMS = {
+    'bidirectional': BidirectionalRouteStrategy,
+    'astar': AStarRouteStrategy,
+    'ch': ContractionRouteStrategy,
+}
+
+
 class RouteManager:
-    def __init__(self, search_type: int, graph_data: Dict, start_point: str, dest_point: str):
+    def __init__(self, search_type: int, graph_data, start_point: str, dest_point: str,
+                 cache: Optional[RouteCache] = None, trees: Optional[TreeCache] = None,
+                 table: Optional[RoutingTable] = None, algorithm: str = 'dijkstra',
+                 departure=None, timetable: Optional[Timetable] = None, budget: Optional[float] = None,
+                 modes: Optional[int] = None):
+        if search_type == TIMETABLE_SEARCH and departure is None:
+            raise ValueError("Для пошуку за розкладом потрібен час відправлення")
+        #бюджет обмежує іншу метрику: ціну найшвидшого маршруту чи тривалість найдешевшого
+        if budget is not None and (search_type not in SEARCH_BUDGETS or algorithm != 'dijkstra'):
+            raise ValueError(f"Бюджет не підтримується для типу пошуку {search_type}")
+        if algorithm != 'dijkstra' and (algorithm not in ALGORITHMS or search_type not in (1, 2)):
+            raise ValueError(f"Алгоритм {algorithm} не підтримується для типу пошуку {search_type}")
+        #маска видів транспорту (graph.mode_mask); ієрархія і розклад побудовані для всіх сегментів
+        if modes is not None and (search_type == TIMETABLE_SEARCH or algorithm == 'ch'):
+            raise ValueError("Фільтр видів транспорту не підтримується для цього пошуку")
         self.search_type = search_type
-        self.graph_data = graph_data
+        #граф компілюється один раз; CompiledGraph можна передавати між менеджерами
+        self.graph_data = compile_graph(graph_data)
         self.start_point = start_point
         self.dest_point = dest_point
+        self.cache = cache
+        self.trees = trees
+        self.table = table
+        self.algorithm = algorithm
+        self.departure = None if departure is None else parse_time(departure)
+        self.timetable = timetable
+        self.budget = budget
+        self.modes = modes
 
     def get_route(self) -> Route:
-        if self.search_type == 1:
-            strategy = FastestRouteStrategy() 
+        if self.cache is None:
+            return self._search()
+        searched = []
+
+        def search():
+            searched.append(True)
+            route = self._search()
+            if isinstance(route, Route):
+                #лінивий маршрут тримає весь масив предків пошуку (O(V)) до першого звернення;
+                #відновлюємо ребра до того, як маршрут потрапить у кеш
+                route.edges
+            return route
+
+        route = self.cache.get_or_compute(self.graph_data.version, self.start_point,
+                                          self.dest_point, self._cache_key(), search)
+        if not searched:
+            #маршрут з кешу супроводжується тими ж подіями, що й пошук
+            self._report(route)
+        return route
+
+    def _cache_key(self):
+        if self.search_type == TIMETABLE_SEARCH:
+            return (self.search_type, self.departure)
+        if self.budget is not None:
+            key = (self.search_type, 'budget', self.budget)
+        elif self.algorithm == 'dijkstra':
+            key = self.search_type
+        else:
+            key = (self.search_type, self.algorithm)
+        if self.modes is None:
+            return key
+        return (key if isinstance(key, tuple) else (key,)) + ('modes', self.modes)
+
+    def get_routes(self, destinations: List[str]) -> Dict[str, Route]:
+        #один пошук з міста відправлення на всі міста призначення
+        metric = SEARCH_METRICS[self.search_type]
+        if self.modes is None:
+            tree = (self.trees or TreeCache(maxsize=1)).get(self.graph_data, self.start_point, metric)
+        else:
+            dist, parents, _ = dijkstra(self.graph_data, self.graph_data.mode_weights(metric, self.modes),
+                                        self.graph_data.index[self.start_point])
+            tree = ShortestPathTree.from_arrays(self.graph_data, self.start_point, metric, dist, parents)
+        return {destination: self._report(tree.route_to(destination), destination)
+                for destination in destinations}
+
+    def _search(self) -> Route:
+        if self.search_type == TIMETABLE_SEARCH:
+            strategy = EarliestArrivalStrategy(self.departure, self.timetable)
+            return strategy.find_route(self.graph_data, self.start_point, self.dest_point)
+
+        if self.budget is not None:
+            strategy = ConstrainedRouteStrategy(SEARCH_METRICS[self.search_type],
+                                                SEARCH_BUDGETS[self.search_type], self.budget, self.modes)
+            return strategy.find_route(self.graph_data, self.start_point, self.dest_point)
+
+        #таблиця і дерева з кешу рахуються по всіх сегментах, тож з фільтром - звичайний пошук
+        if self.modes is None and self.table is not None and self.table.graph is self.graph_data:
+            return self._report(self.table.route(self.start_point, self.dest_point,
+                                                 SEARCH_METRICS[self.search_type]))
+
+        if self.modes is None and self.trees is not None:
+            return self._report(self.trees.route(self.graph_data, self.start_point, self.dest_point,
+                                                 SEARCH_METRICS[self.search_type]))
+
+        if self.algorithm != 'dijkstra':
+            #фільтр для 'ch' відхиляється в конструкторі
+            options = {} if self.modes is None else {'modes': self.modes}
+            strategy = ALGORITHMS[self.algorithm](SEARCH_METRICS[self.search_type], **options)
+        elif self.search_type == 1:
+            strategy = FastestRouteStrategy(self.modes)
         elif self.search_type == 2:
-            strategy = CheapestRouteStrategy()
+            strategy = CheapestRouteStrategy(self.modes)
         elif self.search_type == 3:
-            strategy = FewestStopsStrategy()
+            strategy = FewestStopsStrategy(self.modes)
         
         return strategy.find_route(self.graph_data, self.start_point, self.dest_point)
-    
-
-    
 
+    def _report(self, route, dest_point: Optional[str] = None):
+        #відповідь з кешу, таблиці чи дерева супроводжується тими ж подіями, що й пошук стратегією
+        dest_point = self.dest_point if dest_point is None else dest_point
+        if self.search_type == TIMETABLE_SEARCH:
+            _timetable_started(self.start_point, dest_point, self.departure)
+        else:
+            _search_started(SEARCH_TITLES[self.search_type], self.start_point, dest_point)
+        if not route:
+            _route_not_found(self.start_point, dest_point)
+        elif self.search_type == TIMETABLE_SEARCH:
+            _timetable_found(route)
+        else:
+            _route_found(route, SEARCH_FOUND[self.search_type])
+        return route
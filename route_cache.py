@@ -0,0 +1,101 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+#позначка для кешованого "шлях не знайдено"
+_NOT_FOUND = object()
+
+
+class RouteCache:
+    """Обмежений LRU/TTL кеш результатів пошуку.
+
+    Ключ - (версія графа, старт, фініш, тип пошуку). Щойно приходить запит з
+    новішою версією графа, усі записи старої версії відкидаються; запити, що
+    ще виконуються на старій версії, обчислюються без кешу і нічого не
+    відкидають. ``migrate`` переносить ще чинні записи на нову версію.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize має бути додатним")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, graph_version: int, start_point: str, end_point: str,
+                       search_type, compute: Callable):
+        key = (graph_version, start_point, end_point, search_type)
+        with self._lock:
+            self._check_version(graph_version)
+            if graph_version == self._version:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    expires_at, value = entry
+                    if expires_at is None or expires_at > self._clock():
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return [] if value is _NOT_FOUND else value
+                    del self._entries[key]
+                    self.evictions += 1
+            self.misses += 1
+
+        #пошук виконуємо поза блокуванням, щоб не тримати інші запити
+        route = compute()
+
+        with self._lock:
+            if graph_version != self._version:
+                return route
+            expires_at = None if self.ttl is None else self._clock() + self.ttl
+            self._entries[key] = (expires_at, route if route else _NOT_FOUND)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return route
+
+    def migrate(self, old_version: int, new_version: int, keep: Callable) -> int:
+        """Переносить записи версії old_version, для яких keep(старт, фініш, тип, маршрут)
+        істинний, на new_version; решта відкидається. Повертає кількість перенесених."""
+        with self._lock:
+            entries = self._entries if self._version == old_version else {}
+            migrated: OrderedDict = OrderedDict()
+            for (_, start_point, end_point, search_type), (expires_at, value) in entries.items():
+                route = [] if value is _NOT_FOUND else value
+                if keep(start_point, end_point, search_type, route):
+                    migrated[(new_version, start_point, end_point, search_type)] = (expires_at, value)
+            self.evictions += len(self._entries) - len(migrated)
+            self._entries = migrated
+            self._version = new_version
+        return len(migrated)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def _check_version(self, graph_version: int) -> None:
+        #версії графа лише зростають; старіша версія - це запит на старому знімку
+        if self._version is None or graph_version > self._version:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+            self._version = graph_version
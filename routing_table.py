@@ -0,0 +1,164 @@
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from graph import CompiledGraph, compile_graph, PRICE, DURATION, HOPS
+from route import Route
+from shortest_paths import bfs, dijkstra
+
+#формат файлу: заголовок, коди метрик, далі матриці n*n int32 (ребро-попередник)
+MAGIC = b'RTBL'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sIIII8s')
+_METRIC_CODES = {DURATION: 1, PRICE: 2, HOPS: 3}
+_METRICS_BY_CODE = {code: metric for metric, code in _METRIC_CODES.items()}
+
+
+def graph_fingerprint(graph: CompiledGraph) -> bytes:
+    """8-байтовий відбиток графа, щоб не застосувати таблицю до іншої мережі."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update('\0'.join(graph.names).encode('utf-8'))
+    for values in (graph.offsets, graph.targets, graph.prices, graph.durations):
+        digest.update(array('d', values).tobytes())
+    return digest.digest()
+
+
+class RoutingTable:
+    """Попередньо обчислені відповіді для всіх пар міст і всіх метрик.
+
+    Для кожної метрики зберігається матриця ``pred[origin * n + city]`` з id
+    ребра, яким маршрут з ``origin`` приходить у ``city``. Відповідь на запит -
+    прохід по цій матриці від кінця до початку, без жодного пошуку.
+    """
+
+    def __init__(self, graph: CompiledGraph, matrices: Dict[str, object], buffer=None):
+        self.graph = graph
+        self.matrices = matrices
+        self._buffer = buffer
+
+    @classmethod
+    def build(cls, graph_data, metrics=(DURATION, PRICE, HOPS)) -> 'RoutingTable':
+        graph = compile_graph(graph_data)
+        matrices = {}
+        for metric in metrics:
+            matrix = array('i')
+            for source in range(graph.node_count):
+                if metric == HOPS:
+                    _, parents, _ = bfs(graph, source)
+                else:
+                    _, parents, _ = dijkstra(graph, graph.weights(metric), source)
+                matrix.extend(parents)
+            matrices[metric] = matrix
+        return cls(graph, matrices)
+
+    def save(self, path: str) -> None:
+        graph = self.graph
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, graph.node_count, graph.edge_count,
+                                    len(self.matrices), graph_fingerprint(graph)))
+            file.write(array('i', [_METRIC_CODES[metric] for metric in self.matrices]).tobytes())
+            for matrix in self.matrices.values():
+                if sys.byteorder == 'little':
+                    file.write(memoryview(matrix).cast('B'))
+                else:
+                    swapped = array('i', matrix)
+                    swapped.byteswap()
+                    file.write(swapped.tobytes())
+
+    @classmethod
+    def load(cls, path: str, graph_data) -> 'RoutingTable':
+        """Відкриває таблицю через mmap: матриці читаються прямо зі сторінок файлу."""
+        graph = compile_graph(graph_data)
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, node_count, edge_count, metric_count, fingerprint = \
+                _HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} не є таблицею маршрутів")
+            if (node_count, edge_count) != (graph.node_count, graph.edge_count) \
+                    or fingerprint != graph_fingerprint(graph):
+                raise ValueError(f"Таблиця {path} побудована для іншого графа")
+
+            offset = _HEADER.size
+            codes = array('i', buffer[offset:offset + 4 * metric_count])
+            if sys.byteorder != 'little':
+                codes.byteswap()
+            offset += 4 * metric_count
+            size = 4 * node_count * node_count
+            matrices = {}
+            for code in codes:
+                chunk = memoryview(buffer)[offset:offset + size]
+                if sys.byteorder == 'little':
+                    matrices[_METRICS_BY_CODE[code]] = chunk.cast('i')
+                else:
+                    matrix = array('i', chunk.tobytes())
+                    matrix.byteswap()
+                    matrices[_METRICS_BY_CODE[code]] = matrix
+                offset += size
+        except Exception:
+            buffer.close()
+            raise
+        return cls(graph, matrices, buffer)
+
+    def close(self) -> None:
+        if self._buffer is None:
+            return
+        for matrix in self.matrices.values():
+            if isinstance(matrix, memoryview):
+                matrix.release()
+        self.matrices = {}
+        self._buffer.close()
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def edges(self, start_point: str, end_point: str, metric: str) -> Optional[List[int]]:
+        graph = self.graph
+        source = graph.index[start_point]
+        target = graph.index[end_point]
+        pred = self.matrices[metric]
+        base = source * graph.node_count
+        sources = graph.sources
+
+        edges = []
+        city = target
+        while city != source:
+            edge = pred[base + city]
+            if edge < 0:
+                return None
+            edges.append(edge)
+            city = sources[edge]
+        edges.reverse()
+        return edges
+
+    def route(self, start_point: str, end_point: str, metric: str):
+        edges = self.edges(start_point, end_point, metric)
+        #як і FewestStopsStrategy, пошук за пересадками до міста відправлення нічого не знаходить
+        if edges is None or (metric == HOPS and start_point == end_point):
+            return []
+        return Route.from_edges(self.graph, self.graph.index[start_point], edges)
+
+
+def main(argv: List[str]) -> int:
+    import json
+
+    if len(argv) != 3:
+        print("Використання: python routing_table.py routes.json routes.rtbl")
+        return 2
+    with open(argv[1], 'r', encoding='utf-8') as file:
+        graph = compile_graph(json.load(file))
+    RoutingTable.build(graph).save(argv[2])
+    print(f"Таблицю для {graph.node_count} міст збережено у {argv[2]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -23,7 +23,7 @@ def run_tests_with_coverage():
     
     # Ініціалізуємо об'єкт coverage
     cov = coverage.Coverage(
-        source=['route', 'route_builder', 'ticket'],
+        source=['route', 'route_builder', 'ticket', 'graph', 'route_cache', 'shortest_paths', 'routing_table', 'landmarks', 'contraction', 'batch', 'events', 'service', 'pareto', 'timetable', 'loader', 'graph_file', 'graph_registry', 'incremental', 'k_shortest', 'fare', 'bench', 'query_stats', 'constrained'],
         omit=['test_*.py', '*/__pycache__/*']
     )
     
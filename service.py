@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+from graph import compile_graph, mode_mask
+from loader import load_graph
+from route_builder import RouteManager, SEARCH_METRICS
+from route_cache import RouteCache
+from ticket import TicketManager
+
+#максимальна довжина одного рядка запиту
+MAX_LINE = 64 * 1024
+
+
+class ServiceBusy(Exception):
+    pass
+
+
+class RouteService:
+    """Asyncio-сервіс маршрутів і квитків з протоколом JSON-рядків.
+
+    Кожен рядок запиту - JSON-об'єкт з полем ``op`` (``cities``, ``route``,
+    ``ticket``), кожен рядок відповіді - ``{"ok": true, ...}`` або
+    ``{"ok": false, "error": ...}``. Граф і кеш спільні для всіх з'єднань,
+    пошук виконується в executor, тож цикл подій не блокується. Одночасно
+    виконується не більше ``max_concurrency`` пошуків; якщо в черзі вже
+    ``max_pending`` запитів, нові одразу отримують ``busy``.
+    """
+
+    def __init__(self, graph_data, max_concurrency: int = 4, max_pending: int = 64,
+                 executor: Optional[Executor] = None, cache: Optional[RouteCache] = None):
+        if max_concurrency <= 0 or max_pending < max_concurrency:
+            raise ValueError("Потрібно 0 < max_concurrency <= max_pending")
+        self.graph = compile_graph(graph_data)
+        self.cache = cache if cache is not None else RouteCache()
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._executor = executor
+        self._own_executor = executor is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.pending = 0
+        self.rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_LINE)
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    #рядок довший за MAX_LINE
+                    writer.write(_encode({'ok': False, 'error': 'Запит занадто довгий'}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(_encode(await self.handle_line(line)))
+                #не читаємо наступний запит, поки клієнт не забрав відповідь
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'ok': False, 'error': 'Некоректний JSON'}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Запит має бути JSON-об\'єктом'}
+        return await self.handle_request(request)
+
+    async def handle_request(self, request: dict) -> dict:
+        operation = request.get('op')
+        try:
+            if operation == 'cities':
+                return {'ok': True, 'cities': list(self.graph.names)}
+            if operation == 'route':
+                return {'ok': True, 'route': await self._run(self._route, request)}
+            if operation == 'ticket':
+                return {'ok': True, 'ticket': await self._run(self._ticket, request)}
+            return {'ok': False, 'error': f"Невідома операція: {operation}"}
+        except ServiceBusy:
+            return {'ok': False, 'error': 'busy'}
+        except (KeyError, ValueError, TypeError) as error:
+            return {'ok': False, 'error': str(error)}
+
+    async def _run(self, function, request: dict):
+        #backpressure: обмежуємо чергу, а не лише кількість одночасних пошуків
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceBusy()
+        self.pending += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, function, request)
+        finally:
+            self.pending -= 1
+
+    def _find_route(self, request: dict):
+        search_type = int(request.get('mode', 2))
+        if search_type not in SEARCH_METRICS:
+            raise ValueError(f"Невідомий тип пошуку: {search_type}")
+        for field in ('start', 'end'):
+            if request.get(field) not in self.graph.index:
+                raise ValueError(f"Невідоме місто: {request.get(field)}")
+        budget = request.get('budget')
+        modes = request.get('modes')
+        #рядок розпакувався б у mode_mask посимвольно
+        if modes is not None and not isinstance(modes, list):
+            raise ValueError("Поле modes має бути списком видів транспорту, наприклад [\"Train\"]")
+        manager = RouteManager(search_type, self.graph, request['start'], request['end'],
+                               cache=self.cache, algorithm=request.get('algorithm', 'dijkstra'),
+                               budget=None if budget is None else float(budget),
+                               modes=None if modes is None else mode_mask(*modes))
+        return manager.get_route()
+
+    def _route(self, request: dict):
+        route = self._find_route(request)
+        if not route:
+            return None
+        return {
+            'cities': list(route.cities),
+            'price': route.price,
+            'duration': route.duration,
+            'segments': [dict(segment) for segment in route.route_list],
+        }
+
+    def _ticket(self, request: dict):
+        route = self._find_route(request)
+        if not route:
+            return None
+        ticket = TicketManager(baggage=_flag(request, 'baggage'), insurance=_flag(request, 'insurance'),
+                               priority=_flag(request, 'priority'), route=route).get_ticket()
+        return {'description': ticket.get_description(), 'price': ticket.get_price()}
+
+
+class RouteClient:
+    """Простий клієнт протоколу JSON-рядків для тестів і скриптів."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> 'RouteClient':
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+        return self
+
+    async def request(self, payload: dict) -> dict:
+        self._writer.write(_encode(payload))
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def _flag(request: dict, field: str) -> bool:
+    #"false" чи 0 не повинні непомітно ставати послугою або її відсутністю
+    value = request.get(field, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"Поле {field} має бути true або false")
+    return value
+
+
+def _encode(response: dict) -> bytes:
+    return (json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+async def _serve(args) -> None:
+    service = RouteService(load_graph(args.routes, keep_segments=True), max_concurrency=args.concurrency,
+                           max_pending=args.pending)
+    server = await service.start(args.host, args.port)
+    print(f"Сервіс маршрутів слухає {service.address[0]}:{service.address[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Asyncio-сервіс пошуку маршрутів")
+    parser.add_argument('routes', nargs='?', default='routes.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--pending', type=int, default=64)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("Сервіс зупинено.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+import heapq
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import List
+
+from graph import CompiledGraph, compile_graph, HOPS
+from route import Route
+
+INF = float('inf')
+
+
+def dijkstra(graph: CompiledGraph, weights, source: int, target: int = -1, stats=None):
+    """Дейкстра по CSR-масивах.
+
+    Повертає (відстані, ребро-батько для кожного міста, кількість опрацьованих міст).
+    ``stats`` (QueryStats) заповнюється після пошуку, тож цикл не сповільнюється.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    dist = [INF] * graph.node_count
+    parents = [-1] * graph.node_count
+    dist[source] = 0
+
+    settled = 0
+    stale = 0
+
+    #heap to store the best
+    priority_queue = [(0, source)]
+
+    while priority_queue:
+        current, city = heappop(priority_queue)
+
+        #skip if the better route was found
+        if current > dist[city]:
+            stale += 1
+            continue
+
+        settled += 1
+        if city == target:
+            break
+
+        # check neighbours
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            new_cost = current + weights[edge]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                #track our route
+                parents[neighbor] = edge
+                heappush(priority_queue, (new_cost, neighbor))
+
+    if stats is not None:
+        stats.add_search(settled, stale, len(priority_queue))
+    return dist, parents, settled
+
+
+def reverse_dijkstra(graph: CompiledGraph, weights, target: int):
+    """Дейкстра по вхідних ребрах: відстані від кожного міста до ``target``."""
+    in_offsets, in_edges = graph.incoming()
+    sources = graph.sources
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    dist = [INF] * graph.node_count
+    dist[target] = 0
+    priority_queue = [(0, target)]
+
+    while priority_queue:
+        current, city = heappop(priority_queue)
+        if current > dist[city]:
+            continue
+        for i in range(in_offsets[city], in_offsets[city + 1]):
+            edge = in_edges[i]
+            neighbor = sources[edge]
+            new_cost = current + weights[edge]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                heappush(priority_queue, (new_cost, neighbor))
+
+    return dist
+
+
+def bfs(graph: CompiledGraph, source: int, target: int = -1, stats=None):
+    """BFS по CSR-масивах.
+
+    Повертає (кількість сегментів, ребро-батько для кожного міста, кількість опрацьованих міст).
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+
+    dist = [INF] * graph.node_count
+    parents = [-1] * graph.node_count
+    dist[source] = 0
+    settled = 0
+    queue = deque([source])
+
+    while queue:
+        city = queue.popleft()
+        settled += 1
+        hops = dist[city] + 1
+        #check the neighbour
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            if dist[neighbor] != INF:
+                continue
+            dist[neighbor] = hops
+            parents[neighbor] = edge
+            #check if in the end
+            if neighbor == target:
+                if stats is not None:
+                    stats.add_search(settled, 0, len(queue) + 1)
+                return dist, parents, settled
+            queue.append(neighbor)
+
+    if stats is not None:
+        stats.add_search(settled, 0, 0)
+    return dist, parents, settled
+
+
+def path_edges(graph: CompiledGraph, parents, source: int, target: int) -> List[int]:
+    edges = []
+    sources = graph.sources
+    city = target
+    while city != source:
+        edge = parents[city]
+        if edge < 0:
+            break
+        edges.append(edge)
+        city = sources[edge]
+    edges.reverse()
+    return edges
+
+
+class ShortestPathTree:
+    """Повне дерево найкоротших шляхів з одного міста за однією метрикою."""
+
+    __slots__ = ('graph', 'origin', 'metric', 'dist', 'parents')
+
+    def __init__(self, graph: CompiledGraph, origin: str, metric: str):
+        self.graph = graph
+        self.origin = origin
+        self.metric = metric
+        source = graph.index[origin]
+        if metric == HOPS:
+            self.dist, self.parents, _ = bfs(graph, source)
+        else:
+            self.dist, self.parents, _ = dijkstra(graph, graph.weights(metric), source)
+
+    @classmethod
+    def from_arrays(cls, graph: CompiledGraph, origin: str, metric: str, dist, parents) -> 'ShortestPathTree':
+        """Дерево з уже обчислених відстаней і ребер-батьків (наприклад, після ремонту)."""
+        tree = cls.__new__(cls)
+        tree.graph = graph
+        tree.origin = origin
+        tree.metric = metric
+        tree.dist = dist
+        tree.parents = parents
+        return tree
+
+    def distance_to(self, end_point: str):
+        return self.dist[self.graph.index[end_point]]
+
+    def edges_to(self, end_point: str) -> List[int]:
+        target = self.graph.index[end_point]
+        if self.dist[target] == INF:
+            return []
+        return path_edges(self.graph, self.parents, self.graph.index[self.origin], target)
+
+    def route_to(self, end_point: str):
+        #маршрут відновлюється з дерева при першому зверненні, без нового пошуку;
+        #як і FewestStopsStrategy, пошук за пересадками до міста відправлення нічого не знаходить
+        if self.distance_to(end_point) == INF or (self.metric == HOPS and end_point == self.origin):
+            return []
+        graph = self.graph
+        return Route.from_parents(graph, self.parents, graph.index[self.origin], graph.index[end_point])
+
+
+class TreeCache:
+    """LRU кеш дерев найкоротших шляхів за (версія графа, місто, метрика)."""
+
+    def __init__(self, maxsize: int = 64):
+        if maxsize <= 0:
+            raise ValueError("maxsize має бути додатним")
+        self.maxsize = maxsize
+        self._trees: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def get(self, graph_data, origin: str, metric: str) -> ShortestPathTree:
+        graph = compile_graph(graph_data)
+        key = (origin, metric)
+        with self._lock:
+            if self._version is None or graph.version > self._version:
+                #граф змінився - старі дерева вже невірні
+                self._trees.clear()
+                self._version = graph.version
+            #запит на старому знімку графа будує дерево без кешу
+            tree = self._trees.get(key) if graph.version == self._version else None
+            if tree is not None:
+                self._trees.move_to_end(key)
+                self.hits += 1
+                return tree
+            self.misses += 1
+
+        tree = ShortestPathTree(graph, origin, metric)
+
+        with self._lock:
+            if graph.version == self._version:
+                self._trees[key] = tree
+                while len(self._trees) > self.maxsize:
+                    self._trees.popitem(last=False)
+        return tree
+
+    def route(self, graph_data, start_point: str, end_point: str, metric: str):
+        return self.get(graph_data, start_point, metric).route_to(end_point)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._trees.clear()
+
+    def migrate(self, old_version: int, new_version: int, transform) -> int:
+        """Переносить дерева версії old_version на new_version через transform(дерево).
+
+        transform повертає нове дерево або None, якщо дерево треба відкинути.
+        Повертає кількість перенесених дерев.
+        """
+        with self._lock:
+            trees = list(self._trees.items()) if self._version == old_version else []
+        #ремонт дерев виконуємо поза блокуванням
+        migrated: OrderedDict = OrderedDict()
+        for key, tree in trees:
+            tree = transform(tree)
+            if tree is not None:
+                migrated[key] = tree
+        with self._lock:
+            if self._version is not None and self._version > new_version:
+                return 0
+            self._trees = migrated
+            self._version = new_version
+        return len(migrated)
+
+
+def bidirectional_dijkstra(graph: CompiledGraph, weights, source: int, target: int, stats=None):
+    """Дейкстра одночасно від початку (вихідні ребра) і від кінця (вхідні ребра).
+
+    Повертає (вартість, ребра шляху, кількість опрацьованих міст);
+    якщо шляху немає - (INF, None, settled).
+    """
+    if source == target:
+        return 0, [], 1
+
+    offsets = graph.offsets
+    targets = graph.targets
+    sources = graph.sources
+    in_offsets, in_edges = graph.incoming()
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    dist_f = {source: 0}
+    dist_b = {target: 0}
+    parents_f = {}
+    parents_b = {}
+    done_f = set()
+    done_b = set()
+    queue_f = [(0, source)]
+    queue_b = [(0, target)]
+    best = INF
+    meeting = -1
+    settled = 0
+    stale = 0
+
+    while queue_f and queue_b:
+        #зупиняємось, коли жоден з напрямків уже не може покращити знайдений шлях
+        if queue_f[0][0] + queue_b[0][0] >= best:
+            break
+
+        if queue_f[0][0] <= queue_b[0][0]:
+            current, city = heappop(queue_f)
+            if city in done_f:
+                stale += 1
+                continue
+            done_f.add(city)
+            settled += 1
+            for edge in range(offsets[city], offsets[city + 1]):
+                neighbor = targets[edge]
+                new_cost = current + weights[edge]
+                if new_cost < dist_f.get(neighbor, INF):
+                    dist_f[neighbor] = new_cost
+                    parents_f[neighbor] = edge
+                    heappush(queue_f, (new_cost, neighbor))
+                total = new_cost + dist_b.get(neighbor, INF)
+                if total < best and dist_f[neighbor] == new_cost:
+                    best = total
+                    meeting = neighbor
+        else:
+            current, city = heappop(queue_b)
+            if city in done_b:
+                stale += 1
+                continue
+            done_b.add(city)
+            settled += 1
+            for i in range(in_offsets[city], in_offsets[city + 1]):
+                edge = in_edges[i]
+                neighbor = sources[edge]
+                new_cost = current + weights[edge]
+                if new_cost < dist_b.get(neighbor, INF):
+                    dist_b[neighbor] = new_cost
+                    parents_b[neighbor] = edge
+                    heappush(queue_b, (new_cost, neighbor))
+                total = new_cost + dist_f.get(neighbor, INF)
+                if total < best and dist_b[neighbor] == new_cost:
+                    best = total
+                    meeting = neighbor
+
+    if stats is not None:
+        stats.add_search(settled, stale, len(queue_f) + len(queue_b), starts=2)
+    if best == INF:
+        return INF, None, settled
+
+    edges = []
+    city = meeting
+    while city != source:
+        edge = parents_f[city]
+        edges.append(edge)
+        city = sources[edge]
+    edges.reverse()
+    city = meeting
+    while city != target:
+        edge = parents_b[city]
+        edges.append(edge)
+        city = targets[edge]
+    return best, edges, settled
+
+
+def astar(graph: CompiledGraph, weights, source: int, target: int, heuristic, stats=None):
+    """A* з допустимою оцінкою ``heuristic(city)`` відстані до ``target``.
+
+    Повертає (вартість, ребра шляху, кількість опрацьованих міст);
+    якщо шляху немає - (INF, None, settled).
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    dist = {source: 0}
+    parents = {}
+    settled = 0
+    stale = 0
+    priority_queue = [(heuristic(source), 0, source)]
+
+    while priority_queue:
+        _, current, city = heappop(priority_queue)
+        if current > dist[city]:
+            stale += 1
+            continue
+        settled += 1
+        if city == target:
+            if stats is not None:
+                stats.add_search(settled, stale, len(priority_queue))
+            return current, path_edges(graph, parents, source, target), settled
+
+        for edge in range(offsets[city], offsets[city + 1]):
+            neighbor = targets[edge]
+            new_cost = current + weights[edge]
+            if new_cost < dist.get(neighbor, INF):
+                estimate = heuristic(neighbor)
+                if estimate == INF:
+                    #з цього міста кінцевої точки не досягти
+                    continue
+                dist[neighbor] = new_cost
+                parents[neighbor] = edge
+                heappush(priority_queue, (new_cost + estimate, new_cost, neighbor))
+
+    if stats is not None:
+        stats.add_search(settled, stale, 0)
+    return INF, None, settled
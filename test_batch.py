@@ -0,0 +1,77 @@
+import pickle
+import unittest
+from batch import iter_route_batch, route_batch
+from graph import compile_graph
+from route import Route
+from route_builder import RouteManager
+from test_route_builder import make_grid_graph
+
+
+class TestRouteBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(5))
+        self.queries = [
+            ('C0_0', 'C4_4', 1),
+            ('C0_0', 'C2_3', 2),
+            ('C3_1', 'C0_4', 3),
+            ('C0_0', 'C1_1', 2),
+            ('C4_4', 'C0_0', 1),
+        ]
+
+    def test_results_match_route_manager(self):
+        """Тест що пакетні відповіді збігаються з RouteManager"""
+        results = route_batch(self.graph, self.queries)
+        for (start, end, search_type), route in zip(self.queries, results):
+            expected = RouteManager(search_type, self.graph, start, end).get_route()
+            self.assertIsInstance(route, Route)
+            self.assertEqual(route.price if search_type == 2 else route.duration,
+                             expected.price if search_type == 2 else expected.duration)
+            self.assertEqual(len(route.route_list) if search_type == 3 else route.cities[-1],
+                             len(expected.route_list) if search_type == 3 else expected.cities[-1])
+
+    def test_compact_results(self):
+        """Тест компактних кортежів"""
+        results = route_batch(self.graph, self.queries, compact=True)
+        routes = route_batch(self.graph, self.queries)
+        for result, route in zip(results, routes):
+            self.assertEqual(result, (route.cities[0], route.cities[-1], route.price,
+                                      route.duration, len(route.route_list)))
+
+    def test_one_search_per_origin(self):
+        """Тест що запити з одного міста і метрикою об'єднуються в одну групу"""
+        numbers = [number for number, _ in iter_route_batch(self.graph, self.queries)]
+        self.assertEqual(numbers[:3], [0, 1, 3])
+        self.assertEqual(sorted(numbers), list(range(len(self.queries))))
+
+    def test_unknown_and_unreachable(self):
+        """Тест невідомого міста та відсутнього маршруту"""
+        graph = compile_graph({'Kyiv': [], 'Lviv': []})
+        results = route_batch(graph, [('Kyiv', 'Lviv', 2), ('Mars', 'Kyiv', 1), ('Kyiv', 'Kyiv', 3)])
+        self.assertEqual(results, [[], [], []])
+        self.assertEqual(route_batch(graph, [('Kyiv', 'Lviv', 2)], compact=True), [None])
+
+    def test_process_pool(self):
+        """Тест розподілу пакета між процесами"""
+        self.assertEqual(route_batch(self.graph, self.queries, compact=True, processes=2),
+                         route_batch(self.graph, self.queries, compact=True))
+
+    def test_process_pool_chunks(self):
+        """Тест порцій груп і потокової видачі з процесів"""
+        numbers = [number for number, _ in iter_route_batch(self.graph, self.queries, processes=2, chunksize=1)]
+        self.assertEqual(sorted(numbers), list(range(len(self.queries))))
+        routes = route_batch(self.graph, self.queries, processes=2, chunksize=10)
+        for route, expected in zip(routes, route_batch(self.graph, self.queries)):
+            self.assertEqual(route.cities, expected.cities)
+            self.assertEqual(route.route_list, expected.route_list)
+
+    def test_graph_is_picklable(self):
+        """Тест що скомпільований граф передається в інші процеси"""
+        copy = pickle.loads(pickle.dumps(self.graph))
+        self.assertEqual(copy.names, self.graph.names)
+        self.assertEqual(copy.segment(0), self.graph.segment(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+import bench
+from shortest_paths import INF, bfs
+
+
+class TestBench(unittest.TestCase):
+
+    def test_generators(self):
+        """Тест розмірів і зв'язності синтетичних графів"""
+        for name, generator in bench.GENERATORS.items():
+            graph = generator(2000, seed=3)
+            self.assertGreater(graph.edge_count, 1000, name)
+            self.assertLess(graph.edge_count, 3000, name)
+            dist, _, _ = bfs(graph, 0)
+            reachable = sum(1 for hops in dist if hops != INF)
+            #сітка і граф Барабаші-Альберт зв'язні, геометричний - майже
+            self.assertGreater(reachable, graph.node_count * 0.8, name)
+            self.assertEqual(generator(2000, seed=3).edge_count, graph.edge_count)
+
+    def test_percentile(self):
+        """Тест перцентилів за найближчим рангом"""
+        values = list(range(1, 101))
+        self.assertEqual(bench.percentile(values, 50), 50)
+        self.assertEqual(bench.percentile(values, 99), 99)
+        self.assertEqual(bench.percentile([7], 90), 7)
+
+    def test_suite_covers_all_cases(self):
+        """Тест що набір міряє всі стратегії, Route і квитки"""
+        results = bench.run_suite(['grid'], [100], queries=3)
+        cases = {key.split('/')[-1] for key in results}
+        self.assertTrue(set(bench.STRATEGIES) <= cases)
+        self.assertTrue({'Route', 'TicketManager', 'TicketManager.compact'} <= cases)
+        for result in results.values():
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertGreater(result['peak_kb'], 0)
+
+    def test_compare_flags_regressions(self):
+        """Тест порівняння з базовими результатами"""
+        baseline = {'a': {'p50_ms': 1.0}, 'b': {'p50_ms': 1.0}, 'c': {'p50_ms': 0.001}}
+        results = {'a': {'p50_ms': 1.1}, 'b': {'p50_ms': 2.0}, 'c': {'p50_ms': 0.01}, 'd': {'p50_ms': 5.0}}
+        self.assertEqual(bench.compare(results, baseline, tolerance=0.25), [('b', 1.0, 2.0)])
+
+    def test_cli_baseline(self):
+        """Тест збереження базових результатів і перевірки регресій"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'baseline.json')
+            args = ['--graphs', 'grid', '--sizes', '10', '--queries', '2']
+            self.assertEqual(bench.main(args + ['--save-baseline', path]), 0)
+            with open(path, 'r', encoding='utf-8') as file:
+                baseline = json.load(file)
+            for base_p50, expected in ((1000.0, 0), (-1.0, 1)):
+                for result in baseline.values():
+                    result['p50_ms'] = base_p50
+                with open(path, 'w', encoding='utf-8') as file:
+                    json.dump(baseline, file)
+                self.assertEqual(bench.main(args + ['--baseline', path]), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import random
+import unittest
+import constrained
+from constrained import constrained_path
+from graph import compile_graph, PRICE, DURATION, HOPS
+from k_shortest import metric_weights
+from query_stats import QueryStats
+from route_builder import ConstrainedRouteStrategy, RouteManager
+from route_cache import RouteCache
+from shortest_paths import INF
+from test_route_builder import make_grid_graph
+
+
+def brute_force(graph, source, target, metric, budget_metric, budget):
+    """Перебір усіх простих шляхів"""
+    weights = metric_weights(graph, metric)
+    resources = graph.weights(budget_metric)
+    best = INF
+    stack = [(source, 0, 0, {source})]
+    while stack:
+        city, cost, used, visited = stack.pop()
+        if used > budget:
+            continue
+        if city == target:
+            best = min(best, cost)
+            continue
+        for edge in range(graph.offsets[city], graph.offsets[city + 1]):
+            neighbor = graph.targets[edge]
+            if neighbor not in visited:
+                stack.append((neighbor, cost + weights[edge], used + resources[edge], visited | {neighbor}))
+    return best
+
+
+class TestConstrainedPath(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [
+                {'destination': 'Lviv', 'price': 500, 'duration_hours': 6, 'transport_type': 'Train'},
+                {'destination': 'Krakow', 'price': 2500, 'duration_hours': 2, 'transport_type': 'Plane'},
+                {'destination': 'Rivne', 'price': 300, 'duration_hours': 5, 'transport_type': 'Bus'},
+            ],
+            'Lviv': [{'destination': 'Krakow', 'price': 700, 'duration_hours': 5, 'transport_type': 'Bus'}],
+            'Rivne': [{'destination': 'Krakow', 'price': 600, 'duration_hours': 9, 'transport_type': 'Bus'}],
+            'Krakow': [],
+        }
+        self.graph = compile_graph(self.graph_data)
+
+    def test_fastest_under_price(self):
+        """Тест найшвидшого маршруту в межах ціни"""
+        for budget, duration in ((3000, 2), (2000, 11), (1000, 14)):
+            route = RouteManager(1, self.graph, 'Kyiv', 'Krakow', budget=budget).get_route()
+            self.assertEqual(route.duration, duration)
+            self.assertLessEqual(route.price, budget)
+        self.assertEqual(RouteManager(1, self.graph, 'Kyiv', 'Krakow', budget=800).get_route(), [])
+
+    def test_cheapest_under_duration(self):
+        """Тест найдешевшого маршруту в межах тривалості"""
+        self.assertEqual(RouteManager(2, self.graph, 'Kyiv', 'Krakow', budget=14).get_route().price, 900)
+        self.assertEqual(RouteManager(2, self.graph, 'Kyiv', 'Krakow', budget=11).get_route().price, 1200)
+        self.assertEqual(RouteManager(2, self.graph, 'Kyiv', 'Krakow', budget=10).get_route().price, 2500)
+
+    def test_post_filtering_is_not_enough(self):
+        """Тест що оптимум у межах бюджету не є найкращим маршрутом без обмеження"""
+        fastest = RouteManager(1, self.graph, 'Kyiv', 'Krakow').get_route()
+        self.assertGreater(fastest.price, 2000)
+        self.assertEqual(RouteManager(1, self.graph, 'Kyiv', 'Krakow', budget=2000).get_route().cities,
+                         ('Kyiv', 'Lviv', 'Krakow'))
+
+    def test_matches_brute_force(self):
+        """Тест порівняння з повним перебором на випадкових графах"""
+        rng = random.Random(5)
+        for _ in range(200):
+            size = rng.randint(2, 7)
+            graph = compile_graph({
+                f'N{city}': [{'destination': f'N{rng.randrange(size)}', 'price': rng.randint(0, 20),
+                              'duration_hours': rng.randint(0, 10), 'transport_type': 'Bus'}
+                             for _ in range(rng.randint(0, 4))]
+                for city in range(size)})
+            for metric, budget_metric in ((DURATION, PRICE), (PRICE, DURATION), (HOPS, PRICE)):
+                source, target, budget = rng.randrange(size), rng.randrange(size), rng.randint(0, 40)
+                cost, edges, _ = constrained_path(graph, source, target, metric, budget_metric, budget)
+                self.assertEqual(cost, brute_force(graph, source, target, metric, budget_metric, budget))
+                if edges is not None:
+                    self.assertLessEqual(sum(graph.weights(budget_metric)[edge] for edge in edges), budget)
+
+    def test_grid_and_stats(self):
+        """Тест на сітці та статистика пошуку"""
+        graph = compile_graph(make_grid_graph(15))
+        start, end = graph.names[0], graph.names[-1]
+        cheapest = RouteManager(2, graph, start, end).get_route()
+        stats = QueryStats()
+        route = ConstrainedRouteStrategy(DURATION, PRICE, cheapest.price).find_route(graph, start, end, stats)
+        self.assertLessEqual(route.price, cheapest.price)
+        self.assertLessEqual(route.duration, cheapest.duration)
+        self.assertEqual(stats.nodes_popped, route.nodes_settled)
+        self.assertTrue(stats.found)
+        #кожен прохід LARAC і пошук міток починаються з одного стартового запису купи
+        passes = stats.heap_pushes - stats.edges_relaxed
+        self.assertGreater(passes, 2)
+        self.assertGreaterEqual(stats.heap_pushes, stats.nodes_popped + stats.stale_skipped)
+
+    def test_bounds_cached_per_target(self):
+        """Тест що межі до міста призначення рахуються один раз для графа"""
+        source, target = self.graph.index['Kyiv'], self.graph.index['Krakow']
+        first = constrained_path(self.graph, source, target, DURATION, PRICE, 1500)
+        bound = constrained._bound(self.graph, PRICE, None, target)
+        self.assertEqual(bound[source], 900)
+        self.assertEqual(constrained_path(self.graph, source, target, DURATION, PRICE, 3000)[0], 2)
+        self.assertEqual(constrained_path(self.graph, source, target, DURATION, PRICE, 1500), first)
+        self.assertIs(constrained._bound(self.graph, PRICE, None, target), bound)
+        self.assertIsNot(constrained._bound(compile_graph(self.graph_data), PRICE, None, target), bound)
+
+    def test_bounds_cache_is_bounded(self):
+        """Тест що межі тримаються лише для кількох останніх міст призначення"""
+        bounds = constrained._BoundCache(self.graph, PRICE, None, maxsize=2)
+        kyiv = bounds.get(self.graph.index['Kyiv'])
+        for city in ('Lviv', 'Krakow'):
+            bounds.get(self.graph.index[city])
+        self.assertEqual(len(bounds), 2)
+        self.assertIsNot(bounds.get(self.graph.index['Kyiv']), kyiv)
+        self.assertEqual(bounds.get(self.graph.index['Kyiv']), kyiv)
+
+    def test_budget_in_cache_key(self):
+        """Тест що різні бюджети кешуються окремо"""
+        cache = RouteCache()
+        for budget in (3000, 2000, None):
+            RouteManager(1, self.graph, 'Kyiv', 'Krakow', cache=cache, budget=budget).get_route()
+        self.assertEqual(len(cache), 3)
+
+    def test_invalid_budget(self):
+        """Тест недопустимих комбінацій бюджету"""
+        with self.assertRaises(ValueError):
+            RouteManager(3, self.graph, 'Kyiv', 'Krakow', budget=10)
+        with self.assertRaises(ValueError):
+            RouteManager(1, self.graph, 'Kyiv', 'Krakow', algorithm='astar', budget=10)
+        with self.assertRaises(ValueError):
+            ConstrainedRouteStrategy(PRICE, HOPS, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
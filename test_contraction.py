@@ -0,0 +1,72 @@
+import json
+import os
+import unittest
+from contraction import ContractionHierarchy
+from graph import compile_graph, PRICE, DURATION
+from route import Route
+from route_builder import CheapestRouteStrategy, ContractionRouteStrategy, RouteManager
+from shortest_paths import INF, dijkstra
+from test_route_builder import make_grid_graph
+
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(8, seed=11))
+
+    def test_query_matches_dijkstra(self):
+        """Тест що ієрархія дає ті самі відстані, що й Дейкстра"""
+        for metric in (PRICE, DURATION):
+            hierarchy = ContractionHierarchy(self.graph, metric)
+            weights = self.graph.weights(metric)
+            for source in range(0, self.graph.node_count, 7):
+                dist, _, _ = dijkstra(self.graph, weights, source)
+                for target in range(self.graph.node_count):
+                    cost, edges, _ = hierarchy.query(source, target)
+                    self.assertEqual(cost, dist[target])
+                    self.assertEqual(sum(weights[edge] for edge in edges), cost)
+
+    def test_unpacked_path_is_connected(self):
+        """Тест що розгорнутий шлях складається з послідовних сегментів"""
+        hierarchy = ContractionHierarchy(self.graph, PRICE)
+        _, edges, _ = hierarchy.query(0, self.graph.node_count - 1)
+        self.assertEqual(self.graph.sources[edges[0]], 0)
+        self.assertEqual(self.graph.targets[edges[-1]], self.graph.node_count - 1)
+        for first, second in zip(edges, edges[1:]):
+            self.assertEqual(self.graph.targets[first], self.graph.sources[second])
+
+    def test_unreachable(self):
+        """Тест відсутнього маршруту"""
+        graph = compile_graph({
+            'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}],
+            'Lviv': [],
+            'Lutsk': []
+        })
+        hierarchy = ContractionHierarchy(graph, PRICE)
+        self.assertEqual(hierarchy.query(1, 0), (INF, None, hierarchy.query(1, 0)[2]))
+        self.assertEqual(hierarchy.query(0, 1)[0], 500)
+
+    def test_strategy_on_routes_json(self):
+        """Тест стратегії на реальній мережі з сегментами з routes.json"""
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'routes.json'),
+                  'r', encoding='utf-8') as file:
+            graph = compile_graph(json.load(file))
+        for start in graph.names:
+            for end in graph.names:
+                expected = CheapestRouteStrategy().find_route(graph, start, end)
+                route = ContractionRouteStrategy(PRICE).find_route(graph, start, end)
+                self.assertIsInstance(route, Route)
+                self.assertEqual(route.price, expected.price)
+        ContractionRouteStrategy(PRICE).find_route(graph, 'Lutsk', 'Odesa').describe()
+
+    def test_manager_with_ch(self):
+        """Тест вибору ієрархії через менеджер"""
+        route = RouteManager(1, self.graph, 'C0_0', 'C7_7', algorithm='ch').get_route()
+        self.assertEqual(route.cities[-1], 'C7_7')
+        self.assertIs(ContractionHierarchy.for_graph(self.graph, DURATION),
+                      ContractionHierarchy.for_graph(self.graph, DURATION))
+
+
+if __name__ == '__main__':
+    unittest.main()
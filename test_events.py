@@ -0,0 +1,98 @@
+import contextlib
+import io
+import unittest
+import events
+from route import Route
+from route_builder import CheapestRouteStrategy, FewestStopsStrategy, RouteManager
+from route_cache import RouteCache
+from shortest_paths import TreeCache
+from ticket import TicketManager
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.received = []
+        self.graph_data = {
+            'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}],
+            'Lviv': []
+        }
+
+    def tearDown(self):
+        events.unsubscribe(self.received.append)
+        events.unsubscribe(events.logging_hook)
+
+    def test_disabled_by_default(self):
+        """Тест що без підписників стратегії нічого не виводять"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            CheapestRouteStrategy().find_route(self.graph_data, 'Kyiv', 'Lviv')
+            TicketManager(True, True, False, Route('Kyiv', [])).get_ticket()
+        self.assertEqual(output.getvalue(), '')
+        self.assertFalse(events.enabled(events.WARNING))
+
+    def test_search_events(self):
+        """Тест подій пошуку та їх тексту"""
+        events.subscribe(self.received.append)
+        CheapestRouteStrategy().find_route(self.graph_data, 'Kyiv', 'Lviv')
+        FewestStopsStrategy().find_route(self.graph_data, 'Lviv', 'Kyiv')
+        self.assertEqual([event.name for event in self.received],
+                         ['search.started', 'search.found', 'search.started', 'search.not_found'])
+        self.assertEqual(self.received[0].render(), "Пошук НАЙДЕШЕВШОГО маршруту з Kyiv до Lviv...")
+        self.assertEqual(self.received[1].fields['segments'], 1)
+
+    def test_found_messages_per_search_type(self):
+        """Тест тексту подій кожного типу пошуку для стратегії, кешу та дерев"""
+        found = {1: "Знайдено шлях.", 2: "Знайдено шлях", 3: "Знайдено шлях. Кількість сегментів: 1"}
+        events.subscribe(self.received.append)
+        for search_type, message in found.items():
+            for options in ({}, {'trees': TreeCache()}, {'cache': RouteCache()}):
+                manager = RouteManager(search_type, self.graph_data, 'Kyiv', 'Lviv', **options)
+                #другий запит до кешу береться з нього, без пошуку
+                for _ in range(2 if 'cache' in options else 1):
+                    del self.received[:]
+                    manager.get_route()
+                    self.assertEqual([event.name for event in self.received], ['search.started', 'search.found'])
+                    self.assertEqual(self.received[1].render(), message)
+        del self.received[:]
+        RouteManager(2, self.graph_data, 'Lviv', 'Kyiv', trees=TreeCache()).get_routes(['Lviv', 'Kyiv'])
+        self.assertEqual([event.render() for event in self.received],
+                         ["Пошук НАЙДЕШЕВШОГО маршруту з Lviv до Lviv...", "Знайдено шлях",
+                          "Пошук НАЙДЕШЕВШОГО маршруту з Lviv до Kyiv...", "Шлях не знайдено."])
+
+    def test_level_filter(self):
+        """Тест що підписник отримує лише події свого рівня"""
+        events.subscribe(self.received.append, events.INFO)
+        TicketManager(True, False, False, Route('Kyiv', [])).get_ticket()
+        self.assertEqual(self.received, [])
+        events.unsubscribe(self.received.append)
+        events.subscribe(self.received.append, events.DEBUG)
+        TicketManager(True, False, False, Route('Kyiv', [])).get_ticket()
+        self.assertEqual(self.received[0].name, 'ticket.addons')
+        self.assertTrue(self.received[0].fields['baggage'])
+
+    def test_unsubscribe_disables(self):
+        """Тест що після відписки події не формуються"""
+        events.subscribe(self.received.append)
+        events.unsubscribe(self.received.append)
+        self.assertFalse(events.enabled(events.INFO))
+
+    def test_print_hook(self):
+        """Тест виводу повідомлення для CLI"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            events.print_hook(events.Event('search.not_found', events.INFO, "Шлях не знайдено.", {}))
+        self.assertEqual(output.getvalue(), "Шлях не знайдено.\n")
+
+    def test_logging_hook(self):
+        """Тест пересилання подій у logging"""
+        events.subscribe(events.logging_hook)
+        with self.assertLogs('calculator_vibe', level='INFO') as logs:
+            CheapestRouteStrategy().find_route(self.graph_data, 'Kyiv', 'Lviv')
+        self.assertEqual(logs.records[0].event, 'search.started')
+        self.assertIn("Знайдено шлях", logs.output[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from fare import BAGGAGE, INSURANCE, PRIORITY, FareSchedule, all_addons, np, price_bulk, price_catalogue
+from route import Route
+from ticket import (ADDONS, BaggageDecorator, CompactTicket, InsuranceDecorator, PriorityBoardingDecorator,
+                    SimpleTicket, TicketManager, addon_mask, register_addon)
+
+ALL_ADDONS = BAGGAGE | INSURANCE | PRIORITY
+
+
+def decorated_price(base_price, mask, schedule):
+    """Ціна через ланцюжок декораторів"""
+    ticket = SimpleTicket(base_price, "A - B")
+    if mask & BAGGAGE:
+        ticket = BaggageDecorator(ticket, schedule.baggage)
+    if mask & INSURANCE:
+        ticket = InsuranceDecorator(ticket, schedule.insurance)
+    if mask & PRIORITY:
+        ticket = PriorityBoardingDecorator(ticket, schedule.priority)
+    return ticket.get_price()
+
+
+class TestFare(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        rng = random.Random(5)
+        self.base_prices = [rng.uniform(100, 5000) for _ in range(200)] + [0, 1500]
+        self.masks = [rng.randint(0, ALL_ADDONS) for _ in self.base_prices]
+        self.schedule = FareSchedule(baggage=312.37, insurance=0.1, priority=199.99)
+
+    def check_bulk(self, use_numpy):
+        prices = price_bulk(self.base_prices, self.masks, self.schedule, use_numpy=use_numpy)
+        expected = [decorated_price(base, mask, self.schedule) for base, mask in zip(self.base_prices, self.masks)]
+        self.assertEqual(list(prices), expected)
+
+    def check_catalogue(self, use_numpy):
+        rows = price_catalogue(self.base_prices, self.schedule, use_numpy=use_numpy)
+        for base, row in zip(self.base_prices, rows):
+            self.assertEqual(list(row), [decorated_price(base, mask, self.schedule)
+                                         for mask in range(ALL_ADDONS + 1)])
+
+    def test_bulk_matches_decorators(self):
+        """Тест що масова ціна збігається з ціною декораторів до біта"""
+        self.check_bulk(use_numpy=False)
+
+    def test_catalogue_matches_decorators(self):
+        """Тест цін усього каталогу для всіх комбінацій послуг"""
+        self.check_catalogue(use_numpy=False)
+
+    @unittest.skipIf(np is None, "numpy не встановлено")
+    def test_numpy_bulk(self):
+        """Тест векторизованого обчислення через numpy"""
+        self.check_bulk(use_numpy=True)
+        self.check_catalogue(use_numpy=True)
+        self.assertEqual(price_catalogue(self.base_prices).shape, (len(self.base_prices), ALL_ADDONS + 1))
+
+    def test_matches_ticket_manager(self):
+        """Тест узгодженості з цінами TicketManager"""
+        route = Route('Kyiv', [{'destination': 'Lviv', 'price': 1000, 'duration_hours': 6,
+                                'transport_type': 'Train'}])
+        for mask in range(ALL_ADDONS + 1):
+            ticket = TicketManager(baggage=bool(mask & BAGGAGE), insurance=bool(mask & INSURANCE),
+                                   priority=bool(mask & PRIORITY), route=route).get_ticket()
+            self.assertEqual(price_bulk([route.get_price()], mask)[0], ticket.get_price())
+
+    def test_single_mask(self):
+        """Тест однієї маски для всіх маршрутів"""
+        prices = price_bulk([100, 200], addon_mask(baggage=True, priority=True), use_numpy=False)
+        self.assertEqual(list(prices), [750.0, 850.0])
+        self.assertEqual(addon_mask(), 0)
+        self.assertEqual(addon_mask(True, True, True), ALL_ADDONS)
+        with self.assertRaises(ValueError):
+            price_bulk([100, 200], [1], use_numpy=False)
+
+    def test_registered_addon(self):
+        """Тест що масова ціна враховує послуги, зареєстровані пізніше"""
+        meal = register_addon('meal', "Харчування", 120.0)
+        self.addCleanup(ADDONS.pop)
+        self.assertEqual(all_addons(), ALL_ADDONS | meal)
+        masks = [meal, meal | BAGGAGE, ALL_ADDONS | meal, 0]
+        prices = price_bulk([1000.0] * len(masks), masks, use_numpy=False)
+        self.assertEqual(list(prices), [CompactTicket(1000.0, "A - B", mask).get_price() for mask in masks])
+        row = price_catalogue([1000.0], self.schedule, use_numpy=False)[0]
+        self.assertEqual(len(row), all_addons() + 1)
+        self.assertEqual(row[meal | INSURANCE], 1000.0 + 120.0 + self.schedule.insurance)
+
+
+if __name__ == '__main__':
+    unittest.main()
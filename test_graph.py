@@ -0,0 +1,104 @@
+import unittest
+from graph import ALL_MODES, CompiledGraph, compile_graph, mode_mask, PRICE, DURATION, HOPS
+from route_builder import CheapestRouteStrategy, FastestRouteStrategy, RouteManager
+
+
+class TestCompiledGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [
+                {'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'},
+                {'destination': 'Lviv', 'price': 450, 'duration_hours': 8, 'transport_type': 'Bus'},
+                {'destination': 'Warsaw', 'price': 1800, 'duration_hours': 1.5, 'transport_type': 'Plane'}
+            ],
+            'Lviv': [
+                {'destination': 'Kyiv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}
+            ]
+        }
+        self.graph = CompiledGraph.from_dict(self.graph_data)
+
+    def test_city_ids(self):
+        """Тест присвоєння id містам, включно з містами лише призначення"""
+        self.assertEqual(self.graph.names, ['Kyiv', 'Lviv', 'Warsaw'])
+        self.assertEqual(self.graph.index['Warsaw'], 2)
+        self.assertEqual(self.graph.node_count, 3)
+
+    def test_csr_arrays(self):
+        """Тест CSR-розкладки ребер"""
+        self.assertEqual(list(self.graph.offsets), [0, 3, 4, 4])
+        self.assertEqual(list(self.graph.targets), [1, 1, 2, 0])
+        self.assertEqual(list(self.graph.sources), [0, 0, 0, 1])
+        self.assertEqual(list(self.graph.prices), [500, 450, 1800, 500])
+        self.assertEqual(list(self.graph.durations), [5, 8, 1.5, 5])
+        self.assertEqual(list(self.graph.transports), [1, 0, 2, 1])
+        self.assertEqual(self.graph.edge_count, 4)
+
+    def test_segments_keep_original_dicts(self):
+        """Тест що ребра посилаються на оригінальні сегменти лише для читання"""
+        segment = self.graph.segment(1)
+        self.assertEqual(segment, self.graph_data['Kyiv'][1])
+        with self.assertRaises(TypeError):
+            segment['price'] = 0
+
+    def test_segment_rebuilt_without_originals(self):
+        """Тест відновлення сегмента з масивів"""
+        self.graph.segments = None
+        self.assertEqual(self.graph.segment(2), self.graph_data['Kyiv'][2])
+        with self.assertRaises(TypeError):
+            self.graph.segment(2)['price'] = 0
+
+    def test_weights(self):
+        """Тест вибору масиву ваг за метрикою"""
+        self.assertIs(self.graph.weights(PRICE), self.graph.prices)
+        self.assertIs(self.graph.weights(DURATION), self.graph.durations)
+        with self.assertRaises(ValueError):
+            self.graph.weights('distance')
+
+    def test_mode_weights(self):
+        """Тест масок видів транспорту і ваг з фільтром"""
+        trains = mode_mask('Train')
+        self.assertEqual(mode_mask('Bus', 'Train', 'Plane'), ALL_MODES)
+        self.assertEqual(list(self.graph.mode_bits()), [2, 1, 4, 2])
+        inf = float('inf')
+        self.assertEqual(list(self.graph.mode_weights(PRICE, trains)), [500, inf, inf, 500])
+        self.assertEqual(list(self.graph.mode_weights(HOPS, ALL_MODES & ~trains)), [inf, 1, 1, inf])
+        self.assertIs(self.graph.mode_weights(PRICE, trains), self.graph.mode_weights(PRICE, trains))
+        with self.assertRaises(ValueError):
+            mode_mask('Ship')
+
+    def test_pruned_parallel_edges(self):
+        """Тест відкидання домінованих паралельних сегментів"""
+        by_price = self.graph.pruned(PRICE)
+        self.assertIs(self.graph.pruned(PRICE), by_price)
+        self.assertEqual(list(by_price.edge_ids), [1, 2, 3])
+        self.assertEqual(by_price.removed_edges, 1)
+        self.assertIs(by_price.segment(0), self.graph.segment(1))
+        self.assertEqual(by_price.names, self.graph.names)
+        #ребра міста відсортовані за метрикою
+        self.assertEqual(list(self.graph.pruned(DURATION).edge_ids), [2, 0, 3])
+        both = self.graph.pruned(PRICE, DURATION)
+        self.assertEqual(both.removed_edges, 0)
+        self.assertEqual(list(both.edge_ids), [1, 0, 2, 3])
+        self.assertEqual(self.graph.pruned(HOPS).removed_edges, 1)
+
+    def test_compile_graph_reuses_compiled(self):
+        """Тест що скомпільований граф не компілюється повторно"""
+        self.assertIs(compile_graph(self.graph), self.graph)
+        self.assertNotEqual(compile_graph(self.graph_data).version, self.graph.version)
+
+    def test_strategies_accept_compiled_graph(self):
+        """Тест пошуку по скомпільованому графу"""
+        self.assertEqual(CheapestRouteStrategy().find_route(self.graph, 'Kyiv', 'Lviv').price, 450)
+        self.assertEqual(FastestRouteStrategy().find_route(self.graph, 'Kyiv', 'Lviv').duration, 5)
+
+    def test_manager_compiles_once(self):
+        """Тест що RouteManager зберігає скомпільований граф"""
+        manager = RouteManager(2, self.graph, 'Kyiv', 'Warsaw')
+        self.assertIs(manager.graph_data, self.graph)
+        self.assertEqual(manager.get_route().price, 1800)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import pickle
+import tempfile
+import unittest
+from graph import compile_graph
+from graph_file import attach_graph, load_graph_file, main, save_graph, share_graph
+from loader import load_graph
+from route_builder import (AStarRouteStrategy, CheapestRouteStrategy, FastestRouteStrategy,
+                           FewestStopsStrategy)
+from routing_table import graph_fingerprint
+from test_loader import ROUTES_PATH, edge_set
+from test_route_builder import make_grid_graph
+
+
+class TestGraphFile(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'routes.graph')
+        self.graph = compile_graph(make_grid_graph(5))
+        save_graph(self.graph, self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Тест що знімок відновлює той самий граф"""
+        loaded = load_graph_file(self.path)
+        self.assertEqual(loaded.names, self.graph.names)
+        self.assertEqual(list(loaded.offsets), list(self.graph.offsets))
+        self.assertEqual(edge_set(loaded), edge_set(self.graph))
+        self.assertEqual(graph_fingerprint(loaded), graph_fingerprint(self.graph))
+        self.assertIsInstance(loaded.targets, memoryview)
+
+    def test_strategies_on_snapshot(self):
+        """Тест пошуку маршрутів прямо по знімку"""
+        loaded = load_graph_file(self.path)
+        start, end = self.graph.names[0], self.graph.names[-1]
+        for strategy in (CheapestRouteStrategy(), FastestRouteStrategy(), FewestStopsStrategy(),
+                         AStarRouteStrategy('price')):
+            expected = strategy.find_route(self.graph, start, end)
+            route = strategy.find_route(loaded, start, end)
+            self.assertEqual(route.price, expected.price)
+            self.assertEqual(route.duration, expected.duration)
+            self.assertEqual(route.cities, expected.cities)
+
+    def test_unicode_names(self):
+        """Тест назв міст не латиницею"""
+        graph = compile_graph({'Київ': [{'destination': 'Львів', 'price': 500, 'duration_hours': 6,
+                                         'transport_type': 'Train'}], 'Львів': []})
+        save_graph(graph, self.path)
+        loaded = load_graph_file(self.path)
+        self.assertEqual(loaded.names, ['Київ', 'Львів'])
+        self.assertEqual(loaded.segment(0)['destination'], 'Львів')
+
+    def test_rejects_bad_files(self):
+        """Тест чужого та обрізаного файлу"""
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        broken = os.path.join(self.tmpdir.name, 'broken.graph')
+        for content in (b'JUNK' + data[4:], data[:len(data) // 2], data[:10]):
+            with open(broken, 'wb') as file:
+                file.write(content)
+            with self.assertRaises(ValueError):
+                load_graph_file(broken)
+
+    def test_pickle(self):
+        """Тест що граф зі знімка можна передати в інший процес"""
+        loaded = pickle.loads(pickle.dumps(load_graph_file(self.path)))
+        self.assertEqual(edge_set(loaded), edge_set(self.graph))
+
+    def test_cli(self):
+        """Тест конвертера routes.json у знімок"""
+        self.assertEqual(main(['graph_file.py']), 2)
+        self.assertEqual(main(['graph_file.py', ROUTES_PATH, self.path]), 0)
+        self.assertEqual(edge_set(load_graph_file(self.path)), edge_set(load_graph(ROUTES_PATH)))
+
+
+    def test_shared_memory(self):
+        """Тест публікації графа у спільній пам'яті"""
+        memory = share_graph(self.graph)
+        self.addCleanup(memory.unlink)
+        self.addCleanup(memory.close)
+        graph, attached = attach_graph(memory.name)
+        self.assertEqual(graph.names, self.graph.names)
+        self.assertEqual(list(graph.targets), list(self.graph.targets))
+        self.assertIsInstance(graph.prices, memoryview)
+        start, end = graph.names[0], graph.names[-1]
+        self.assertEqual(CheapestRouteStrategy().find_route(graph, start, end).price,
+                         CheapestRouteStrategy().find_route(self.graph, start, end).price)
+        del graph
+        attached.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import events
+from graph import mode_mask
+from graph_registry import GraphDiff, GraphRegistry
+from incremental import GraphUpdate
+from route_builder import RouteManager
+from route_cache import RouteCache
+from shortest_paths import TreeCache
+
+
+def make_routes(kyiv_lviv=500, lviv_krakow=700, kyiv_krakow=1500):
+    return {
+        'Kyiv': [
+            {'destination': 'Lviv', 'price': kyiv_lviv, 'duration_hours': 6, 'transport_type': 'Train'},
+            {'destination': 'Krakow', 'price': kyiv_krakow, 'duration_hours': 2, 'transport_type': 'Plane'},
+        ],
+        'Lviv': [
+            {'destination': 'Krakow', 'price': lviv_krakow, 'duration_hours': 5, 'transport_type': 'Bus'},
+        ],
+        'Krakow': [],
+        'Odesa': [],
+    }
+
+
+class TestGraphRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'routes.json')
+        self.write(make_routes())
+        self.cache = RouteCache()
+        self.trees = TreeCache()
+        self.registry = GraphRegistry(self.path, cache=self.cache, trees=self.trees, poll_interval=0.01)
+
+    def tearDown(self):
+        self.registry.stop()
+        self.tmpdir.cleanup()
+
+    def write(self, routes):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(routes, file)
+        #гарантуємо нову позначку часу навіть на грубих файлових системах
+        self.stamp = getattr(self, 'stamp', 0) + 1_000_000_000
+        os.utime(self.path, ns=(self.stamp, self.stamp))
+
+    def cheapest(self, graph, end='Krakow'):
+        return RouteManager(2, graph, 'Kyiv', end, cache=self.cache).get_route()
+
+    def test_reload_swaps_snapshot(self):
+        """Тест що нова версія підміняє стару, а старий знімок не змінюється"""
+        old = self.registry.graph
+        self.assertFalse(self.registry.reload())
+        self.write(make_routes(kyiv_krakow=900))
+        self.assertTrue(self.registry.reload())
+        new = self.registry.graph
+        self.assertGreater(new.version, old.version)
+        self.assertEqual(self.cheapest(old).price, 1200)
+        self.assertEqual(self.cheapest(new).price, 900)
+
+    def test_default_loader_keeps_departures(self):
+        """Тест що розклад з файлу доступний пошуку через реєстр"""
+        routes = make_routes()
+        routes['Kyiv'][0]['departures'] = ['09:30']
+        self.write(routes)
+        self.registry.reload()
+        route = RouteManager(4, self.registry.graph, 'Kyiv', 'Lviv', departure='09:00').get_route()
+        self.assertEqual(route.route_list[0]['departure'], '09:30')
+        with self.assertRaises(TypeError):
+            self.registry.graph.segment(0)['price'] = 0
+
+    def test_unchanged_file_keeps_version(self):
+        """Тест перезапису файлу без змін"""
+        old = self.registry.graph
+        self.write(make_routes())
+        self.assertFalse(self.registry.reload())
+        self.assertIs(self.registry.graph, old)
+
+    def test_cache_keeps_still_optimal_routes(self):
+        """Тест що маршрут лишається в кеші, якщо його сегменти не змінились"""
+        self.cheapest(self.registry.graph)
+        self.write(make_routes(kyiv_krakow=2000))
+        self.registry.reload()
+        self.assertEqual(len(self.cache), 1)
+        calls = self.cache.misses
+        self.assertEqual(self.cheapest(self.registry.graph).price, 1200)
+        self.assertEqual(self.cache.misses, calls)
+
+    def test_cache_drops_improved_routes(self):
+        """Тест що маршрут відкидається, якщо з'явився дешевший сегмент"""
+        self.cheapest(self.registry.graph)
+        self.cheapest(self.registry.graph, 'Odesa')
+        self.write(make_routes(kyiv_krakow=900))
+        self.registry.reload()
+        #недосяжна Одеса лишається недосяжною
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cheapest(self.registry.graph).price, 900)
+
+    def test_cache_drops_changed_routes(self):
+        """Тест що маршрут відкидається, якщо змінився його сегмент"""
+        self.cheapest(self.registry.graph)
+        self.write(make_routes(lviv_krakow=800))
+        self.registry.reload()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cheapest(self.registry.graph).price, 1300)
+
+    def test_cache_drops_budget_routes(self):
+        """Тест що маршрут у межах бюджету відкидається, якщо подешевшав інший сегмент"""
+        fastest = lambda: RouteManager(1, self.registry.graph, 'Kyiv', 'Krakow', cache=self.cache,
+                                       budget=1300).get_route()
+        self.assertEqual(fastest().duration, 11)
+        self.write(make_routes(kyiv_krakow=1300))
+        self.registry.reload()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(fastest().duration, 2)
+
+    def test_cache_drops_improved_filtered_routes(self):
+        """Тест що маршрут з фільтром транспорту відкидається, якщо подешевшав дозволений сегмент"""
+        segment = lambda price, transport: {'destination': 'B', 'price': price, 'duration_hours': 5,
+                                            'transport_type': transport}
+        routes = {'A': [segment(100, 'Bus'), segment(50, 'Plane')], 'B': []}
+        self.write(routes)
+        self.registry.reload()
+        cheapest = lambda: RouteManager(2, self.registry.graph, 'A', 'B', cache=self.cache,
+                                        modes=mode_mask('Bus', 'Train')).get_route()
+        self.assertEqual(cheapest().price, 100)
+        routes['A'].append(segment(80, 'Train'))
+        self.write(routes)
+        self.registry.reload()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(cheapest().price, 80)
+
+    def test_cache_drops_budget_routes_improved_on_both_metrics(self):
+        """Тест що маршрут у межах бюджету відкидається, якщо новий сегмент кращий за поєднанням метрик"""
+        segment = lambda price, duration: {'destination': 'B', 'price': price, 'duration_hours': duration,
+                                           'transport_type': 'Bus'}
+        routes = {'A': [segment(100, 10), segment(300, 1)], 'B': []}
+        self.write(routes)
+        self.registry.reload()
+        fastest = lambda: RouteManager(1, self.registry.graph, 'A', 'B', cache=self.cache,
+                                       budget=200).get_route()
+        self.assertEqual(fastest().duration, 10)
+        #новий сегмент не дешевший і не швидший за найкращі старі, але вкладається в бюджет
+        routes['A'].append(segment(150, 2))
+        self.write(routes)
+        self.registry.reload()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual((fastest().price, fastest().duration), (150, 2))
+
+    def test_old_snapshot_does_not_clear_cache(self):
+        """Тест що запит на старому знімку не відкидає кеш нової версії"""
+        old = self.registry.graph
+        self.write(make_routes(kyiv_krakow=900))
+        self.registry.reload()
+        self.cheapest(self.registry.graph)
+        self.assertEqual(self.cheapest(old).price, 1200)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.trees.route(old, 'Kyiv', 'Krakow', 'price').price, 1200)
+        self.assertEqual(self.trees.route(self.registry.graph, 'Kyiv', 'Krakow', 'price').price, 900)
+
+    def test_diff(self):
+        """Тест різниці між версіями"""
+        old = self.registry.graph
+        self.write(make_routes(lviv_krakow=800))
+        self.registry.reload()
+        diff = GraphDiff(old, self.registry.graph)
+        self.assertEqual(len(diff.added), 1)
+        self.assertEqual(len(diff.removed), 1)
+        self.assertEqual(diff.improved, set())
+        self.assertFalse(diff.keep('Kyiv', 'Krakow', (4, 480), []))
+
+    def test_watcher_reloads_and_survives_bad_file(self):
+        """Тест фонового перезавантаження і пошкодженого файлу"""
+        received = []
+        events.subscribe(received.append, events.INFO)
+        self.addCleanup(events.unsubscribe, received.append)
+        self.registry.start()
+        old = self.registry.graph
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('{"Kyiv": [')
+        self.wait_for(lambda: any(event.name == 'graph.reload_failed' for event in received))
+        self.assertIs(self.registry.graph, old)
+
+        self.write(make_routes(kyiv_krakow=900))
+        self.wait_for(lambda: self.registry.reloads == 1)
+        self.assertEqual(self.cheapest(self.registry.graph).price, 900)
+        self.assertEqual([event.name for event in received].count('graph.reload_failed'), 1)
+
+    def test_apply_update(self):
+        """Тест змін сегментів без перечитування файлу"""
+        old = self.registry.graph
+        self.assertEqual(self.trees.route(old, 'Kyiv', 'Krakow', 'price').price, 1200)
+        report = self.registry.apply(GraphUpdate().set_weight('Kyiv', 'Krakow', price=900))
+        self.assertEqual(report.trees_repaired, 1)
+        new = self.registry.graph
+        self.assertGreater(new.version, old.version)
+        self.assertEqual(self.trees.route(new, 'Kyiv', 'Krakow', 'price').price, 900)
+        self.assertEqual(self.trees.misses, 1)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import random
+import unittest
+from graph import DURATION, HOPS, PRICE, compile_graph
+from incremental import GraphUpdate, apply_update
+from route_builder import RouteManager
+from route_cache import RouteCache
+from shortest_paths import ShortestPathTree, TreeCache, dijkstra
+from test_route_builder import make_grid_graph
+
+
+class TestIncrementalUpdates(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(6))
+        self.trees = TreeCache()
+        self.origins = self.graph.names[:3]
+        for origin in self.origins:
+            for metric in (PRICE, DURATION):
+                self.trees.get(self.graph, origin, metric)
+
+    def segment(self, edge):
+        graph = self.graph
+        return graph.names[graph.sources[edge]], graph.names[graph.targets[edge]], \
+            graph.segment(edge)['transport_type']
+
+    def assert_trees_exact(self, graph):
+        for origin in self.origins:
+            for metric in (PRICE, DURATION):
+                tree = self.trees.get(graph, origin, metric)
+                expected, _, _ = dijkstra(graph, graph.weights(metric), graph.index[origin])
+                self.assertEqual(tree.dist, expected)
+                for city in graph.names:
+                    #ребра-батьки дають шлях саме такої вартості
+                    cost = sum(graph.weights(metric)[edge] for edge in tree.edges_to(city))
+                    if city != origin and tree.distance_to(city) != float('inf'):
+                        self.assertAlmostEqual(cost, expected[graph.index[city]])
+
+    def test_weight_change_repairs_trees(self):
+        """Тест подорожчання і здешевлення сегментів"""
+        origin, destination, transport = self.segment(0)
+        update = GraphUpdate().set_weight(origin, destination, transport, price=10_000)
+        origin, destination, transport = self.segment(7)
+        update.set_weight(origin, destination, transport, price=1, duration_hours=0.1)
+        new, report = apply_update(self.graph, update, self.trees)
+        self.assertEqual(report.trees_repaired, 6)
+        self.assertEqual(report.trees_dropped, 0)
+        self.assertLess(report.recomputed, report.full_rebuild)
+        self.assertEqual(self.trees.misses, 6)
+        self.assert_trees_exact(new)
+        self.assertEqual(self.trees.misses, 6)
+        #стара версія графа не змінилась
+        self.assertNotEqual(self.graph.prices[0], 10_000)
+
+    def test_add_and_remove_segments(self):
+        """Тест додавання і видалення сегментів, зокрема нового міста"""
+        tree = self.trees.get(self.graph, self.origins[0], PRICE)
+        used = tree.edges_to(self.graph.names[-1])
+        update = GraphUpdate().remove_segment(*self.segment(used[0]))
+        update.add_segment(self.graph.names[-1], {'destination': 'Uzhhorod', 'price': 50,
+                                                  'duration_hours': 1, 'transport_type': 'Bus'})
+        update.add_segment(self.origins[1], {'destination': self.graph.names[-2], 'price': 1,
+                                            'duration_hours': 0.5, 'transport_type': 'Plane'})
+        new, report = apply_update(self.graph, update, self.trees)
+        self.assertEqual(new.edge_count, self.graph.edge_count + 1)
+        self.assertIn('Uzhhorod', new.index)
+        self.assert_trees_exact(new)
+
+    def test_random_updates(self):
+        """Тест що ремонт дає ті самі відстані, що й повний пошук"""
+        rng = random.Random(3)
+        graph = self.graph
+        for _ in range(10):
+            update = GraphUpdate()
+            for edge in rng.sample(range(graph.edge_count), 3):
+                origin = graph.names[graph.sources[edge]]
+                destination = graph.names[graph.targets[edge]]
+                transport = graph.segment(edge)['transport_type']
+                update.set_weight(origin, destination, transport, price=rng.randint(1, 3000),
+                                  duration_hours=rng.randint(1, 20))
+            graph, report = apply_update(graph, update, self.trees)
+            self.assert_trees_exact(graph)
+
+    def test_hops_trees_are_dropped(self):
+        """Тест що дерева за кількістю пересадок відкидаються"""
+        self.trees.get(self.graph, self.origins[0], HOPS)
+        origin, destination, transport = self.segment(0)
+        _, report = apply_update(self.graph, GraphUpdate().set_weight(origin, destination, transport, price=1),
+                                 self.trees)
+        self.assertEqual(report.trees_dropped, 1)
+        self.assertEqual(len(self.trees), 6)
+
+    def test_route_cache_migration(self):
+        """Тест що кеш маршрутів лишає маршрути, яких зміни не стосуються"""
+        cache = RouteCache()
+        start, end = self.graph.names[0], self.graph.names[-1]
+        route = RouteManager(2, self.graph, start, end, cache=cache).get_route()
+        unused = next(e for e in range(self.graph.edge_count)
+                      if self.graph.names[self.graph.targets[e]] not in route.cities)
+        update = GraphUpdate().set_weight(*self.segment(unused), price=self.graph.prices[unused] + 1)
+        new, report = apply_update(self.graph, update, cache=cache)
+        self.assertEqual(report.routes_kept, 1)
+        self.assertIs(RouteManager(2, new, start, end, cache=cache).get_route(), route)
+
+    def test_unknown_segment(self):
+        """Тест зміни неіснуючого сегмента"""
+        with self.assertRaises(KeyError):
+            GraphUpdate().set_weight('Nowhere', self.graph.names[0], price=1).apply(self.graph)
+        with self.assertRaises(ValueError):
+            GraphUpdate().set_weight(self.graph.names[0], self.graph.names[1])
+
+    def test_from_arrays(self):
+        """Тест дерева з готових масивів"""
+        tree = ShortestPathTree(self.graph, self.origins[0], PRICE)
+        copy = ShortestPathTree.from_arrays(self.graph, tree.origin, PRICE, tree.dist, tree.parents)
+        self.assertEqual(copy.route_to(self.graph.names[-1]).price, tree.route_to(self.graph.names[-1]).price)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import unittest
+from itertools import islice
+from graph import compile_graph, PRICE, DURATION, HOPS
+from k_shortest import k_shortest_paths, metric_weights
+from route import Route
+from route_builder import AlternativeRoutesStrategy, CheapestRouteStrategy, FastestRouteStrategy
+from test_route_builder import make_grid_graph
+
+
+def brute_force_costs(graph, weights, source, target):
+    """Вартості всіх простих шляхів перебором"""
+    costs = []
+
+    def walk(city, visited, cost):
+        if city == target:
+            costs.append(cost)
+            return
+        for edge in range(graph.offsets[city], graph.offsets[city + 1]):
+            neighbor = graph.targets[edge]
+            if neighbor not in visited:
+                walk(neighbor, visited | {neighbor}, cost + weights[edge])
+
+    walk(source, {source}, 0)
+    return sorted(costs)
+
+
+class TestKShortest(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'routes.json'),
+                  'r', encoding='utf-8') as file:
+            self.graph = compile_graph(json.load(file))
+
+    def test_matches_brute_force(self):
+        """Тест що вартості збігаються з перебором усіх простих шляхів"""
+        graph = self.graph
+        for metric in (PRICE, DURATION, HOPS):
+            weights = metric_weights(graph, metric)
+            source, target = graph.index['Kyiv'], graph.index['Prague']
+            expected = brute_force_costs(graph, weights, source, target)
+            found = [cost for cost, _, _ in k_shortest_paths(graph, weights, source, target)]
+            self.assertEqual(len(found), len(expected))
+            for cost, brute in zip(found, expected):
+                self.assertAlmostEqual(cost, brute)
+
+    def test_paths_are_loopless_and_distinct(self):
+        """Тест що шляхи не повторюються і не містять циклів"""
+        graph = compile_graph(make_grid_graph(5))
+        weights = graph.weights(PRICE)
+        paths = [edges for _, edges, _ in islice(k_shortest_paths(graph, weights, 0, graph.node_count - 1), 30)]
+        self.assertEqual(len(paths), 30)
+        self.assertEqual(len({tuple(edges) for edges in paths}), 30)
+        for edges in paths:
+            cities = [graph.sources[edges[0]]] + [graph.targets[edge] for edge in edges]
+            self.assertEqual(len(cities), len(set(cities)))
+            self.assertEqual(cities[-1], graph.node_count - 1)
+
+    def test_strategy(self):
+        """Тест стратегії альтернативних маршрутів"""
+        routes = AlternativeRoutesStrategy(PRICE, k=3).find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertEqual(len(routes), 3)
+        self.assertIsInstance(routes[0], Route)
+        self.assertEqual(routes[0].price, CheapestRouteStrategy().find_route(self.graph, 'Kyiv', 'Prague').price)
+        self.assertEqual([route.price for route in routes], sorted(route.price for route in routes))
+        fastest = AlternativeRoutesStrategy(DURATION, k=1).find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertEqual(fastest[0].duration, FastestRouteStrategy().find_route(self.graph, 'Kyiv', 'Prague').duration)
+
+    def test_lazy_generator(self):
+        """Тест що маршрути обчислюються лише на запит"""
+        graph = compile_graph(make_grid_graph(6))
+        routes = AlternativeRoutesStrategy(PRICE).iter_routes(graph, graph.names[0], graph.names[-1])
+        first = next(routes)
+        second = next(routes)
+        self.assertLessEqual(first.price, second.price)
+        self.assertNotEqual(first.cities, second.cities)
+
+    def test_no_route(self):
+        """Тест відсутності маршруту"""
+        graph = compile_graph({'A': [], 'B': []})
+        self.assertEqual(AlternativeRoutesStrategy().find_route(graph, 'A', 'B'), [])
+        self.assertEqual(AlternativeRoutesStrategy().find_route(graph, 'A', 'A'), [])
+        self.assertEqual(AlternativeRoutesStrategy().find_route(graph, 'Nowhere', 'A'), [])
+        with self.assertRaises(ValueError):
+            AlternativeRoutesStrategy(k=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from graph import compile_graph, PRICE
+from landmarks import Landmarks
+from shortest_paths import INF, dijkstra
+from test_route_builder import make_grid_graph
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(6))
+
+    def test_heuristic_is_admissible(self):
+        """Тест що оцінка не перевищує справжню відстань"""
+        landmarks = Landmarks(self.graph, PRICE, count=3)
+        for target in range(0, self.graph.node_count, 5):
+            estimate = landmarks.heuristic(target)
+            for source in range(self.graph.node_count):
+                dist, _, _ = dijkstra(self.graph, self.graph.prices, source, target)
+                self.assertLessEqual(estimate(source), dist[target])
+            self.assertEqual(estimate(target), 0)
+
+    def test_landmarks_are_distinct(self):
+        """Тест вибору різних орієнтирів"""
+        landmarks = Landmarks(self.graph, PRICE, count=4)
+        self.assertEqual(len(set(landmarks.landmarks)), 4)
+
+    def test_unreachable_target(self):
+        """Тест що недосяжна точка має нескінченну оцінку"""
+        graph = compile_graph({
+            'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}],
+            'Lviv': [],
+            'Lutsk': []
+        })
+        estimate = Landmarks(graph, PRICE, count=3).heuristic(graph.index['Kyiv'])
+        self.assertEqual(estimate(graph.index['Lviv']), INF)
+
+    def test_cached_per_graph(self):
+        """Тест що орієнтири обчислюються один раз для графа"""
+        self.assertIs(Landmarks.for_graph(self.graph, PRICE), Landmarks.for_graph(self.graph, PRICE))
+
+
+if __name__ == '__main__':
+    unittest.main()
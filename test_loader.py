@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from graph import compile_graph
+from loader import GraphBuilder, build_graph, iter_json_segments, iter_ndjson_segments, load_graph
+from route_builder import CheapestRouteStrategy
+
+ROUTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'routes.json')
+
+
+def edge_set(graph):
+    """Множина ребер графа в термінах назв міст"""
+    return sorted((graph.names[graph.sources[edge]], graph.names[graph.targets[edge]],
+                   graph.prices[edge], graph.durations[edge], graph.transports[edge])
+                  for edge in range(graph.edge_count))
+
+
+class TestStreamingLoader(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        with open(ROUTES_PATH, 'r', encoding='utf-8') as file:
+            self.routes = json.load(file)
+        self.expected = compile_graph(self.routes)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_matches_json_load(self):
+        """Тест що потоковий завантажувач будує той самий граф"""
+        graph = load_graph(ROUTES_PATH)
+        self.assertEqual(sorted(graph.names), sorted(self.expected.names))
+        self.assertEqual(edge_set(graph), edge_set(self.expected))
+        self.assertIsNone(graph.segments)
+
+    def test_small_chunks(self):
+        """Тест розбору, коли значення розрізані межами частин"""
+        for chunk_size in (1, 3, 7, 50):
+            graph = load_graph(ROUTES_PATH, chunk_size=chunk_size)
+            self.assertEqual(edge_set(graph), edge_set(self.expected))
+
+    def test_numbers_split_by_chunk(self):
+        """Тест числа, розрізаного межею частини"""
+        text = '{"A": [{"destination": "B", "price": 12345, "duration_hours": 2.75, "transport_type": "Bus"}]}'
+        pairs = list(iter_json_segments(io.StringIO(text), chunk_size=4))
+        self.assertEqual(pairs[0][1]['price'], 12345)
+        self.assertEqual(pairs[0][1]['duration_hours'], 2.75)
+
+    def test_cities_without_segments(self):
+        """Тест міст з порожнім списком сегментів"""
+        pairs = list(iter_json_segments(io.StringIO('{"A": [], "B" : [ ] }')))
+        self.assertEqual(pairs, [('A', None), ('B', None)])
+        self.assertEqual(list(iter_json_segments(io.StringIO('{}'))), [])
+
+    def test_routes_from_streamed_graph(self):
+        """Тест пошуку маршруту по завантаженому графу"""
+        graph = load_graph(ROUTES_PATH)
+        route = CheapestRouteStrategy().find_route(graph, 'Kyiv', 'Prague')
+        expected = CheapestRouteStrategy().find_route(self.expected, 'Kyiv', 'Prague')
+        self.assertEqual(route.price, expected.price)
+        self.assertEqual(route.route_list[0]['destination'], expected.route_list[0]['destination'])
+
+    def test_keep_segments(self):
+        """Тест збереження оригінальних сегментів"""
+        graph = load_graph(ROUTES_PATH, keep_segments=True)
+        self.assertEqual(len(graph.segments), graph.edge_count)
+        self.assertEqual(graph.segment(0)['destination'], graph.names[graph.targets[0]])
+
+    def test_ndjson(self):
+        """Тест файлу сегментів по одному на рядок"""
+        path = os.path.join(self.tmpdir.name, 'routes.ndjson')
+        with open(path, 'w', encoding='utf-8') as file:
+            for city, segments in self.routes.items():
+                if not segments:
+                    file.write(json.dumps({'origin': city}) + '\n')
+                for segment in segments:
+                    file.write(json.dumps(dict(segment, origin=city), ensure_ascii=False) + '\n')
+                file.write('\n')
+        graph = load_graph(path)
+        self.assertEqual(edge_set(graph), edge_set(self.expected))
+
+    def test_ndjson_requires_origin(self):
+        """Тест рядка без міста відправлення"""
+        with self.assertRaises(ValueError):
+            list(iter_ndjson_segments(io.StringIO('{"destination": "B"}\n')))
+
+    def test_malformed_json(self):
+        """Тест пошкодженого файлу"""
+        with self.assertRaises(ValueError):
+            list(iter_json_segments(io.StringIO('{"A": [{"destination": "B"')))
+        with self.assertRaises(ValueError):
+            list(iter_json_segments(io.StringIO('["A"]')))
+
+    def test_builder_groups_by_origin(self):
+        """Тест що ребра групуються за містом відправлення"""
+        graph = build_graph([
+            ('A', {'destination': 'B', 'price': 1, 'duration_hours': 1, 'transport_type': 'Bus'}),
+            ('B', {'destination': 'A', 'price': 2, 'duration_hours': 2, 'transport_type': 'Train'}),
+            ('A', {'destination': 'C', 'price': 3, 'duration_hours': 3, 'transport_type': 'Plane'}),
+        ])
+        self.assertEqual(list(graph.offsets), [0, 2, 3, 3])
+        self.assertEqual(list(graph.prices), [1, 3, 2])
+        self.assertIsInstance(GraphBuilder().build().names, list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import os
+import unittest
+from graph import compile_graph, PRICE, DURATION, HOPS
+from pareto import pareto_paths
+from route import Route
+from route_builder import (
+    CheapestRouteStrategy,
+    FastestRouteStrategy,
+    FewestStopsStrategy,
+    ParetoRouteStrategy
+)
+
+
+def brute_force_front(graph, source, target):
+    """Парето-фронт перебором усіх простих шляхів"""
+    points = set()
+
+    def walk(city, visited, price, duration, hops):
+        if city == target:
+            points.add((price, duration, hops))
+            return
+        for edge in range(graph.offsets[city], graph.offsets[city + 1]):
+            neighbor = graph.targets[edge]
+            if neighbor not in visited:
+                walk(neighbor, visited | {neighbor}, price + graph.prices[edge],
+                     duration + graph.durations[edge], hops + 1)
+
+    walk(source, {source}, 0, 0, 0)
+    return {point for point in points
+            if not any(other != point and all(o <= p for o, p in zip(other, point)) for other in points)}
+
+
+class TestPareto(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'routes.json'),
+                  'r', encoding='utf-8') as file:
+            self.graph = compile_graph(json.load(file))
+
+    def test_front_matches_brute_force(self):
+        """Тест що знайдений фронт збігається з перебором"""
+        for start, end in (('Kyiv', 'Prague'), ('Lutsk', 'Odesa'), ('Kharkiv', 'Warsaw')):
+            source, target = self.graph.index[start], self.graph.index[end]
+            found = {(price, duration, hops)
+                     for price, duration, hops, _ in pareto_paths(self.graph, source, target, 64)}
+            self.assertEqual(found, brute_force_front(self.graph, source, target))
+
+    def test_contains_single_criterion_optima(self):
+        """Тест що фронт містить найдешевший, найшвидший і найкоротший маршрути"""
+        routes = ParetoRouteStrategy(PRICE).find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertTrue(all(isinstance(route, Route) for route in routes))
+        cheapest = CheapestRouteStrategy().find_route(self.graph, 'Kyiv', 'Prague')
+        fastest = FastestRouteStrategy().find_route(self.graph, 'Kyiv', 'Prague')
+        fewest = FewestStopsStrategy().find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertEqual(routes[0].price, cheapest.price)
+        self.assertEqual(min(route.duration for route in routes), fastest.duration)
+        self.assertEqual(min(len(route.route_list) for route in routes), len(fewest.route_list))
+
+    def test_ranking(self):
+        """Тест упорядкування за вибраним критерієм"""
+        by_duration = ParetoRouteStrategy(DURATION).find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertEqual([route.duration for route in by_duration],
+                         sorted(route.duration for route in by_duration))
+        by_hops = ParetoRouteStrategy(HOPS).find_route(self.graph, 'Kyiv', 'Prague')
+        self.assertEqual(len(by_hops[0].route_list), min(len(route.route_list) for route in by_hops))
+
+    def test_label_bound(self):
+        """Тест обмеження кількості міток"""
+        source, target = self.graph.index['Kyiv'], self.graph.index['Prague']
+        self.assertEqual(len(pareto_paths(self.graph, source, target, max_labels_per_city=1)), 1)
+
+    def test_no_route(self):
+        """Тест відсутнього маршруту та некоректного критерію"""
+        graph = compile_graph({'Kyiv': [], 'Lviv': []})
+        self.assertEqual(ParetoRouteStrategy().find_route(graph, 'Kyiv', 'Lviv'), [])
+        self.assertEqual(ParetoRouteStrategy().find_route(graph, 'Kyiv', 'Kyiv'), [])
+        with self.assertRaises(ValueError):
+            ParetoRouteStrategy('comfort')
+
+
+if __name__ == '__main__':
+    unittest.main()
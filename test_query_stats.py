@@ -0,0 +1,97 @@
+import unittest
+import events
+import query_stats
+from graph import compile_graph, PRICE
+from query_stats import Histogram, MemorySink, QueryStats, COUNT_BOUNDS
+from route_builder import (AStarRouteStrategy, AlternativeRoutesStrategy, BidirectionalRouteStrategy,
+                           CheapestRouteStrategy, FewestStopsStrategy, RouteManager)
+from test_route_builder import make_grid_graph
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(8))
+        self.start, self.end = self.graph.names[0], self.graph.names[-1]
+        self.addCleanup(query_stats.disable)
+
+    def test_dijkstra_stats(self):
+        """Тест лічильників Дейкстри"""
+        stats = QueryStats()
+        route = CheapestRouteStrategy().find_route(self.graph, self.start, self.end, stats=stats)
+        self.assertEqual(stats.strategy, 'CheapestRouteStrategy')
+        self.assertTrue(stats.found)
+        self.assertEqual(stats.nodes_popped, route.nodes_settled)
+        self.assertEqual(stats.heap_pushes, stats.edges_relaxed + 1)
+        self.assertGreaterEqual(stats.heap_pushes, stats.nodes_popped + stats.stale_skipped)
+        self.assertGreater(stats.reconstruction_seconds, 0)
+        self.assertGreaterEqual(stats.wall_seconds, stats.reconstruction_seconds)
+        #час відновлення включає побудову сегментів; без статистики маршрут лишається лінивим
+        self.assertIsNotNone(route._route_list)
+        self.assertIsNone(CheapestRouteStrategy().find_route(self.graph, self.start, self.end)._route_list)
+
+    def test_other_strategies(self):
+        """Тест статистики BFS, двонапрямленого пошуку, A* і Йена"""
+        for strategy in (FewestStopsStrategy(), BidirectionalRouteStrategy(PRICE), AStarRouteStrategy(PRICE),
+                         AlternativeRoutesStrategy(PRICE, k=2)):
+            stats = QueryStats()
+            strategy.find_route(self.graph, self.start, self.end, stats=stats)
+            self.assertTrue(stats.found, type(strategy).__name__)
+            self.assertGreater(stats.nodes_popped, 0, type(strategy).__name__)
+            self.assertGreater(stats.wall_seconds, 0)
+
+    def test_not_found(self):
+        """Тест статистики для запиту без маршруту"""
+        stats = QueryStats()
+        graph = compile_graph({'A': [], 'B': []})
+        self.assertEqual(CheapestRouteStrategy().find_route(graph, 'A', 'B', stats=stats), [])
+        self.assertFalse(stats.found)
+        self.assertEqual(stats.nodes_popped, 1)
+
+    def test_disabled_by_default(self):
+        """Тест що без збирача статистика не створюється"""
+        self.assertIsNone(query_stats.metrics())
+        self.assertIsNone(query_stats.begin(CheapestRouteStrategy()))
+
+    def test_histograms_and_sink(self):
+        """Тест зведення в гістограми і експорту через приймач"""
+        sink = MemorySink()
+        metrics = query_stats.enable(sink)
+        for end in self.graph.names[-5:]:
+            RouteManager(2, self.graph, self.start, end).get_route()
+        self.assertEqual(metrics.queries, 5)
+        self.assertEqual(metrics.histogram('CheapestRouteStrategy', 'nodes_popped').count, 5)
+        exported = metrics.export()
+        self.assertEqual(exported, len(query_stats.FIELDS))
+        snapshot = sink.metrics[('route_query_wall_seconds', 'CheapestRouteStrategy')]
+        self.assertEqual(snapshot['count'], 5)
+        self.assertLessEqual(snapshot['p50'], snapshot['p99'])
+
+    def test_events_sink(self):
+        """Тест приймача, що публікує події"""
+        received = []
+        events.subscribe(received.append, events.INFO)
+        self.addCleanup(events.unsubscribe, received.append)
+        metrics = query_stats.enable(query_stats.events_sink)
+        CheapestRouteStrategy().find_route(self.graph, self.start, self.end)
+        metrics.export()
+        names = [event.name for event in received]
+        self.assertEqual(names.count('metrics.histogram'), len(query_stats.FIELDS))
+        self.assertIn('CheapestRouteStrategy', received[-1].render())
+        with self.assertRaises(ValueError):
+            query_stats.QueryMetrics().export()
+
+    def test_histogram(self):
+        """Тест квантилів гістограми"""
+        histogram = Histogram(COUNT_BOUNDS)
+        for value in (1, 2, 3, 100, 10 ** 9):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.quantile(0.5), 4.0)
+        self.assertEqual(histogram.quantile(1.0), 10 ** 9)
+        self.assertEqual(Histogram(COUNT_BOUNDS).quantile(0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
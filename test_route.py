@@ -1,5 +1,9 @@
+import copy
+import pickle
 import unittest
+from graph import compile_graph
 from route import Route
+from shortest_paths import bfs
 
 
 class TestRoute(unittest.TestCase):
@@ -24,14 +28,14 @@ class TestRoute(unittest.TestCase):
     
     def test_route_initialization(self):
         """Тест ініціалізації маршруту"""
-        self.assertEqual(self.route.route_list, self.route_list)
+        self.assertEqual(self.route.route_list, tuple(self.route_list))
         self.assertEqual(len(self.route.cities), 3)
         self.assertEqual(self.route.cities[0], 'Kyiv')
         self.assertEqual(self.route.cities[-1], 'Warsaw')
     
     def test_cities_construction(self):
         """Тест побудови списку міст"""
-        expected_cities = ['Kyiv', 'Lviv', 'Warsaw']
+        expected_cities = ('Kyiv', 'Lviv', 'Warsaw')
         self.assertEqual(self.route.cities, expected_cities)
     
     def test_price_calculation(self):
@@ -69,7 +73,7 @@ class TestRoute(unittest.TestCase):
     def test_empty_route_list(self):
         """Тест маршруту з порожнім списком сегментів"""
         empty_route = Route('Kyiv', [])
-        self.assertEqual(empty_route.cities, ['Kyiv'])
+        self.assertEqual(empty_route.cities, ('Kyiv',))
         self.assertEqual(empty_route.price, 0)
         self.assertEqual(empty_route.duration, 0)
     
@@ -81,6 +85,67 @@ class TestRoute(unittest.TestCase):
         except Exception as e:
             self.fail(f"Метод describe викинув помилку: {e}")
 
+    def test_route_is_immutable(self):
+        """Тест що маршрут не можна змінити після створення"""
+        with self.assertRaises(AttributeError):
+            self.route.price = 0
+        with self.assertRaises(AttributeError):
+            del self.route.cities
+        with self.assertRaises(AttributeError):
+            self.route.route_list.append({})
+
+    def test_lazy_route_from_parents(self):
+        """Тест лінивого маршруту за масивом предків"""
+        graph = compile_graph({'Kyiv': [self.route_list[0]], 'Lviv': [self.route_list[1]], 'Warsaw': []})
+        source, target = graph.index['Kyiv'], graph.index['Warsaw']
+        _, parents, settled = bfs(graph, source)
+        route = Route.from_parents(graph, parents, source, target, settled)
+        self.assertIsNotNone(route._parents)
+        self.assertIsNone(route._route_list)
+        self.assertEqual(route.cities, self.route.cities)
+        self.assertIsNone(route._route_list)
+        self.assertEqual(route.edges, (0, 1))
+        self.assertIsNone(route._parents)
+        self.assertEqual(route.price, 1200)
+        self.assertEqual(route.duration, 20)
+        self.assertIs(route.route_list, route.route_list)
+        self.assertEqual(route.route_list, tuple(self.route_list))
+        self.assertEqual(route.nodes_settled, settled)
+        with self.assertRaises(AttributeError):
+            route.price = 0
+
+    def test_lazy_route_from_edges(self):
+        """Тест маршруту за списком ребер і маршруту без сегментів"""
+        graph = compile_graph({'Kyiv': [self.route_list[0]], 'Lviv': []})
+        route = Route.from_edges(graph, graph.index['Kyiv'], [0])
+        self.assertEqual(route.cities, ('Kyiv', 'Lviv'))
+        self.assertEqual(route.price, 500)
+        empty = Route.from_edges(graph, graph.index['Lviv'], [])
+        self.assertEqual(empty.cities, ('Lviv',))
+        self.assertEqual(empty.price, 0)
+        self.assertIsNone(self.route.edges)
+
+    def test_route_pickle_and_copy(self):
+        """Тест серіалізації і копіювання звичайного та лінивого маршруту"""
+        graph = compile_graph({'Kyiv': [self.route_list[0]], 'Lviv': [self.route_list[1]], 'Warsaw': []})
+        source, target = graph.index['Kyiv'], graph.index['Warsaw']
+        _, parents, settled = bfs(graph, source)
+        lazy = Route.from_parents(graph, parents, source, target, settled)
+        for route in (self.route, lazy):
+            for restored in (pickle.loads(pickle.dumps(route)), copy.copy(route), copy.deepcopy(route)):
+                self.assertIs(type(restored), Route)
+                self.assertEqual(restored.cities, self.route.cities)
+                self.assertEqual(restored.route_list, tuple(self.route_list))
+                self.assertEqual((restored.price, restored.duration), (1200, 20))
+                self.assertEqual(restored.nodes_settled, route.nodes_settled)
+                with self.assertRaises(AttributeError):
+                    restored.price = 0
+        restored = pickle.loads(pickle.dumps(lazy))
+        self.assertEqual(restored.edges, (0, 1))
+        self.assertIsNone(restored._graph)
+        with self.assertRaises(TypeError):
+            restored.route_list[0]['price'] = 0
+
 
 class TestRouteWithFloatDuration(unittest.TestCase):
     """Тести для маршрутів з дробовою тривалістю"""
@@ -106,5 +171,6 @@ class TestRouteWithFloatDuration(unittest.TestCase):
         self.assertEqual(route.price, 1200)
 
 
+
 if __name__ == '__main__':
     unittest.main()
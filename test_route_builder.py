@@ -1,13 +1,42 @@
+import random
 import unittest
+from graph import compile_graph, mode_mask, PRICE, DURATION
 from route import Route
+from route_cache import RouteCache
+from query_stats import QueryStats
+from shortest_paths import dijkstra, TreeCache
 from route_builder import (
     CheapestRouteStrategy, 
     FastestRouteStrategy, 
     FewestStopsStrategy,
+    BidirectionalRouteStrategy,
+    AStarRouteStrategy,
+    AlternativeRoutesStrategy,
+    ConstrainedRouteStrategy,
     RouteManager
 )
 
 
+def make_grid_graph(size: int, seed: int = 7) -> dict:
+    """Сітка size x size з двонапрямленими сегментами випадкової ціни/тривалості"""
+    rng = random.Random(seed)
+    graph_data = {}
+    for row in range(size):
+        for col in range(size):
+            segments = []
+            for d_row, d_col in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                n_row, n_col = row + d_row, col + d_col
+                if 0 <= n_row < size and 0 <= n_col < size:
+                    segments.append({
+                        'destination': f'C{n_row}_{n_col}',
+                        'price': rng.randint(50, 500),
+                        'duration_hours': rng.randint(1, 12),
+                        'transport_type': rng.choice(['Bus', 'Train', 'Plane'])
+                    })
+            graph_data[f'C{row}_{col}'] = segments
+    return graph_data
+
+
 class TestCheapestRouteStrategy(unittest.TestCase):
     
     def setUp(self):
@@ -230,6 +259,51 @@ class TestFewestStopsStrategy(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestPointToPointStrategies(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph = compile_graph(make_grid_graph(12))
+        rng = random.Random(3)
+        self.pairs = [(rng.choice(self.graph.names), rng.choice(self.graph.names)) for _ in range(30)]
+
+    def test_bidirectional_matches_dijkstra(self):
+        """Тест що двонапрямлений пошук дає ту саму вартість"""
+        for start, end in self.pairs:
+            expected = CheapestRouteStrategy().find_route(self.graph, start, end)
+            route = BidirectionalRouteStrategy(PRICE).find_route(self.graph, start, end)
+            self.assertEqual(route.price, expected.price)
+            self.assertEqual(route.cities[0], start)
+            self.assertEqual(route.cities[-1], end)
+
+    def test_astar_matches_dijkstra(self):
+        """Тест що A* з орієнтирами дає ту саму тривалість"""
+        for start, end in self.pairs:
+            expected = FastestRouteStrategy().find_route(self.graph, start, end)
+            route = AStarRouteStrategy(DURATION).find_route(self.graph, start, end)
+            self.assertEqual(route.duration, expected.duration)
+            self.assertEqual(route.cities[-1], end)
+
+    def test_fewer_nodes_settled(self):
+        """Тест що нові алгоритми опрацьовують менше міст для далекої точки"""
+        expected = CheapestRouteStrategy().find_route(self.graph, 'C0_0', 'C11_11')
+        bidirectional = BidirectionalRouteStrategy(PRICE).find_route(self.graph, 'C0_0', 'C11_11')
+        astar = AStarRouteStrategy(PRICE).find_route(self.graph, 'C0_0', 'C11_11')
+        self.assertLess(bidirectional.nodes_settled, expected.nodes_settled)
+        self.assertLess(astar.nodes_settled, expected.nodes_settled)
+
+    def test_no_route(self):
+        """Тест відсутнього маршруту"""
+        graph_data = {'Kyiv': [], 'Lviv': []}
+        self.assertEqual(BidirectionalRouteStrategy().find_route(graph_data, 'Kyiv', 'Lviv'), [])
+        self.assertEqual(AStarRouteStrategy().find_route(graph_data, 'Kyiv', 'Lviv'), [])
+
+    def test_same_start_and_destination(self):
+        """Тест коли початок і кінець однакові"""
+        self.assertEqual(BidirectionalRouteStrategy().find_route(self.graph, 'C1_1', 'C1_1').route_list, ())
+        self.assertEqual(AStarRouteStrategy().find_route(self.graph, 'C1_1', 'C1_1').route_list, ())
+
+
 class TestRouteManager(unittest.TestCase):
     
     def setUp(self):
@@ -294,6 +368,20 @@ class TestRouteManager(unittest.TestCase):
         self.assertEqual(manager.start_point, 'Kyiv')
         self.assertEqual(manager.dest_point, 'Lviv')
     
+    def test_manager_with_algorithm(self):
+        """Тест вибору алгоритму через менеджер"""
+        for algorithm in ('bidirectional', 'astar'):
+            route = RouteManager(1, self.graph_data, 'Kyiv', 'Odesa', algorithm=algorithm).get_route()
+            self.assertEqual(route.duration, 1)
+            self.assertIsNotNone(route.nodes_settled)
+
+    def test_manager_rejects_unknown_algorithm(self):
+        """Тест некоректного алгоритму"""
+        with self.assertRaises(ValueError):
+            RouteManager(3, self.graph_data, 'Kyiv', 'Lviv', algorithm='astar')
+        with self.assertRaises(ValueError):
+            RouteManager(1, self.graph_data, 'Kyiv', 'Lviv', algorithm='magic')
+
     def test_manager_get_route_with_different_strategies(self):
         """Тест отримання маршруту з різними стратегіями"""
         for strategy_type in [1, 2, 3]:
@@ -303,5 +391,124 @@ class TestRouteManager(unittest.TestCase):
             self.assertTrue(isinstance(route, Route) or isinstance(route, list))
 
 
+
+class TestTransportModes(unittest.TestCase):
+    """Тести пошуку з фільтром видів транспорту"""
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = make_grid_graph(6)
+        self.graph = compile_graph(self.graph_data)
+        self.start, self.end = 'C0_0', 'C4_4'
+
+    def filtered(self, *transport_types):
+        #еталон: копія графа лише з дозволеними сегментами
+        return compile_graph({city: [segment for segment in segments
+                                     if segment['transport_type'] in transport_types]
+                              for city, segments in self.graph_data.items()})
+
+    def test_strategies_skip_disallowed_segments(self):
+        """Тест що стратегії з маскою збігаються з пошуком на відфільтрованому графі"""
+        modes = mode_mask('Train', 'Bus')
+        reference = self.filtered('Train', 'Bus')
+        cases = (
+            (CheapestRouteStrategy(modes), CheapestRouteStrategy(), 'price'),
+            (FastestRouteStrategy(modes), FastestRouteStrategy(), 'duration'),
+            (BidirectionalRouteStrategy(PRICE, modes), CheapestRouteStrategy(), 'price'),
+            (AStarRouteStrategy(DURATION, modes=modes), FastestRouteStrategy(), 'duration'),
+            (ConstrainedRouteStrategy(DURATION, PRICE, 10 ** 6, modes), FastestRouteStrategy(), 'duration'),
+        )
+        for strategy, expected, attribute in cases:
+            route = strategy.find_route(self.graph, self.start, self.end)
+            self.assertTrue(route)
+            self.assertNotIn('Plane', [segment['transport_type'] for segment in route.route_list])
+            self.assertEqual(getattr(route, attribute),
+                             getattr(expected.find_route(reference, self.start, self.end), attribute))
+        stops = FewestStopsStrategy(modes).find_route(self.graph, self.start, self.end)
+        self.assertEqual(len(stops.route_list),
+                         len(FewestStopsStrategy().find_route(reference, self.start, self.end).route_list))
+        routes = AlternativeRoutesStrategy(PRICE, k=3, modes=modes).find_route(self.graph, self.start, self.end)
+        self.assertEqual([route.price for route in routes],
+                         [route.price for route in AlternativeRoutesStrategy(PRICE, k=3).find_route(
+                             reference, self.start, self.end)])
+
+    def test_no_route_with_mode(self):
+        """Тест відсутності маршруту лише з одним видом транспорту"""
+        graph = compile_graph({'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5,
+                                         'transport_type': 'Bus'}]})
+        self.assertEqual(CheapestRouteStrategy(mode_mask('Train')).find_route(graph, 'Kyiv', 'Lviv'), [])
+        self.assertEqual(FewestStopsStrategy(mode_mask('Plane')).find_route(graph, 'Kyiv', 'Lviv'), [])
+
+    def test_route_manager_modes(self):
+        """Тест маски в RouteManager, кеші та пошуку на всі міста"""
+        trains = mode_mask('Train')
+        cache = RouteCache()
+        trees = TreeCache()
+        for modes in (None, trains):
+            RouteManager(2, self.graph, self.start, self.end, cache=cache, trees=trees, modes=modes).get_route()
+        self.assertEqual(len(cache), 2)
+        routes = RouteManager(2, self.graph, self.start, 'C0_0', modes=trains).get_routes(['C0_1', 'C1_0'])
+        reference = self.filtered('Train')
+        for end, route in routes.items():
+            expected = CheapestRouteStrategy().find_route(reference, self.start, end)
+            self.assertEqual(route.price if route else None, expected.price if expected else None)
+        with self.assertRaises(ValueError):
+            RouteManager(2, self.graph, self.start, self.end, algorithm='ch', modes=trains)
+
+
+class TestParallelEdgePruning(unittest.TestCase):
+    """Тести пошуку по графу без домінованих паралельних сегментів"""
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        rng = random.Random(11)
+        self.graph_data = {}
+        for city in range(30):
+            segments = []
+            for _ in range(60):
+                segments.append({'destination': f'N{rng.randrange(30)}', 'price': rng.randint(50, 500),
+                                 'duration_hours': rng.randint(1, 12),
+                                 'transport_type': rng.choice(['Bus', 'Train', 'Plane'])})
+            self.graph_data[f'N{city}'] = segments
+        self.graph = compile_graph(self.graph_data)
+
+    def test_same_costs_as_full_graph(self):
+        """Тест що без паралельних ребер вартість маршрутів не змінюється"""
+        cases = ((PRICE, CheapestRouteStrategy()), (DURATION, FastestRouteStrategy()),
+                 (PRICE, BidirectionalRouteStrategy(PRICE)), (DURATION, AStarRouteStrategy(DURATION)))
+        for metric, strategy in cases:
+            dist, _, _ = dijkstra(self.graph, self.graph.weights(metric), self.graph.index['N0'])
+            for end in ('N1', 'N7', 'N29'):
+                route = strategy.find_route(self.graph, 'N0', end)
+                self.assertEqual(route.price if metric == PRICE else route.duration, dist[self.graph.index[end]])
+                for city, segment in zip(route.cities, route.route_list):
+                    self.assertIn(segment, self.graph_data[city])
+
+    def test_fewer_relaxations(self):
+        """Тест що пошук релаксує менше ребер"""
+        self.assertGreater(self.graph.pruned(PRICE).removed_edges, self.graph.edge_count // 2)
+        stats = QueryStats()
+        CheapestRouteStrategy().find_route(self.graph, 'N0', 'N29', stats)
+        full = QueryStats()
+        dijkstra(self.graph, self.graph.prices, self.graph.index['N0'], self.graph.index['N29'], full)
+        self.assertLess(stats.edges_relaxed, full.edges_relaxed)
+
+    def test_original_segments_in_route(self):
+        """Тест що маршрут містить оригінальні словники сегментів"""
+        route = CheapestRouteStrategy().find_route(self.graph, 'N0', 'N29')
+        self.assertTrue(all(any(segment is original for original in self.graph.segments)
+                            for segment in route.route_list))
+
+    def test_edges_index_full_graph(self):
+        """Тест що ребра маршруту - номери ребер переданого графа, а не графа без паралельних"""
+        strategies = (CheapestRouteStrategy(), FastestRouteStrategy(), FewestStopsStrategy(),
+                      BidirectionalRouteStrategy(PRICE), AStarRouteStrategy(DURATION),
+                      ConstrainedRouteStrategy(DURATION, PRICE, 600))
+        for strategy in strategies:
+            route = strategy.find_route(self.graph, 'N0', 'N29')
+            self.assertEqual(tuple(self.graph.segments[edge] for edge in route.edges), route.route_list)
+            self.assertEqual(tuple(self.graph.names[self.graph.targets[edge]] for edge in route.edges),
+                             route.cities[1:])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from graph import compile_graph
+from route import Route
+from route_builder import RouteManager
+from route_cache import RouteCache
+
+
+class TestRouteCache(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.now = 0.0
+        self.cache = RouteCache(maxsize=2, ttl=10, clock=lambda: self.now)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return Route('Kyiv', [
+            {'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}
+        ])
+
+    def test_hit_returns_same_route(self):
+        """Тест що повторний запит береться з кешу"""
+        first = self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        second = self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_lru_eviction(self):
+        """Тест витіснення найдавніше використаного запису"""
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 1, self.compute)
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 1, self.compute)
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 3, self.compute)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.evictions, 1)
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 1, self.compute)
+        self.assertEqual(self.calls, 3)
+
+    def test_ttl_expiry(self):
+        """Тест завершення терміну дії запису"""
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        self.now = 11
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_new_graph_version_invalidates(self):
+        """Тест що зміна версії графа скидає кеш"""
+        self.cache.get_or_compute(1, 'Kyiv', 'Lviv', 2, self.compute)
+        self.cache.get_or_compute(2, 'Kyiv', 'Lviv', 2, self.compute)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.stats()['size'], 1)
+
+    def test_not_found_is_cached(self):
+        """Тест кешування відсутнього маршруту"""
+        self.cache.get_or_compute(1, 'Kyiv', 'Mars', 2, list)
+        self.assertEqual(self.cache.get_or_compute(1, 'Kyiv', 'Mars', 2, self.compute), [])
+        self.assertEqual(self.calls, 0)
+
+    def test_invalid_maxsize(self):
+        """Тест некоректного розміру кешу"""
+        with self.assertRaises(ValueError):
+            RouteCache(maxsize=0)
+
+
+class TestRouteManagerCache(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}],
+            'Lviv': []
+        }
+
+    def test_manager_uses_cache(self):
+        """Тест що RouteManager повертає кешований маршрут"""
+        cache = RouteCache()
+        graph = compile_graph(self.graph_data)
+        first = RouteManager(2, graph, 'Kyiv', 'Lviv', cache=cache).get_route()
+        second = RouteManager(2, graph, 'Kyiv', 'Lviv', cache=cache).get_route()
+        self.assertIs(first, second)
+        self.assertEqual(cache.hits, 1)
+
+    def test_recompiled_graph_misses(self):
+        """Тест що перекомпільований граф не використовує старі записи"""
+        cache = RouteCache()
+        RouteManager(2, self.graph_data, 'Kyiv', 'Lviv', cache=cache).get_route()
+        self.graph_data['Kyiv'][0]['price'] = 300
+        route = RouteManager(2, self.graph_data, 'Kyiv', 'Lviv', cache=cache).get_route()
+        self.assertEqual(route.price, 300)
+        self.assertEqual(cache.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
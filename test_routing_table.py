@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from graph import compile_graph, PRICE, DURATION, HOPS
+from route_builder import (
+    CheapestRouteStrategy,
+    FastestRouteStrategy,
+    FewestStopsStrategy,
+    RouteManager
+)
+from routing_table import RoutingTable, main
+
+
+class TestRoutingTable(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'routes.json'),
+                  'r', encoding='utf-8') as file:
+            self.graph = compile_graph(json.load(file))
+        self.table = RoutingTable.build(self.graph)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'routes.rtbl')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_table_matches_strategies(self):
+        """Тест що таблиця дає ті самі маршрути, що й пошук"""
+        for start in self.graph.names:
+            for end in self.graph.names:
+                if start == end:
+                    continue
+                expected = CheapestRouteStrategy().find_route(self.graph, start, end)
+                self.assertEqual(self.table.route(start, end, PRICE).price, expected.price)
+                expected = FastestRouteStrategy().find_route(self.graph, start, end)
+                self.assertEqual(self.table.route(start, end, DURATION).duration, expected.duration)
+                expected = FewestStopsStrategy().find_route(self.graph, start, end)
+                self.assertEqual(len(self.table.route(start, end, HOPS).route_list),
+                                 len(expected.route_list))
+
+    def test_save_and_mmap_load(self):
+        """Тест збереження таблиці та завантаження через mmap"""
+        self.table.save(self.path)
+        with RoutingTable.load(self.path, self.graph) as loaded:
+            self.assertEqual(loaded.route('Kyiv', 'Prague', PRICE).route_list,
+                             self.table.route('Kyiv', 'Prague', PRICE).route_list)
+            self.assertEqual(set(loaded.matrices), {PRICE, DURATION, HOPS})
+
+    def test_load_rejects_other_graph(self):
+        """Тест що таблиця не застосовується до іншого графа"""
+        self.table.save(self.path)
+        other = compile_graph({'Kyiv': [], 'Lviv': []})
+        with self.assertRaises(ValueError):
+            RoutingTable.load(self.path, other)
+
+    def test_load_rejects_other_file(self):
+        """Тест відмови для файлу іншого формату"""
+        with open(self.path, 'wb') as file:
+            file.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            RoutingTable.load(self.path, self.graph)
+
+    def test_unreachable_route(self):
+        """Тест відсутнього маршруту в таблиці"""
+        graph = compile_graph({'Kyiv': [], 'Lviv': []})
+        self.assertEqual(RoutingTable.build(graph).route('Kyiv', 'Lviv', PRICE), [])
+
+    def test_hops_origin_route_matches_strategy(self):
+        """Тест що таблиця за пересадками до міста відправлення відповідає FewestStopsStrategy"""
+        self.assertEqual(FewestStopsStrategy().find_route(self.graph, 'Kyiv', 'Kyiv'), [])
+        self.assertEqual(self.table.route('Kyiv', 'Kyiv', HOPS), [])
+        self.assertEqual(RouteManager(3, self.graph, 'Kyiv', 'Kyiv', table=self.table).get_route(), [])
+        self.assertEqual(self.table.route('Kyiv', 'Kyiv', PRICE).route_list, ())
+
+    def test_manager_uses_table(self):
+        """Тест RouteManager з таблицею маршрутів"""
+        route = RouteManager(2, self.graph, 'Kyiv', 'Prague', table=self.table).get_route()
+        self.assertEqual(route.price, CheapestRouteStrategy().find_route(self.graph, 'Kyiv', 'Prague').price)
+
+    def test_build_command(self):
+        """Тест утиліти побудови таблиці"""
+        routes_path = os.path.join(self.tmpdir.name, 'routes.json')
+        with open(routes_path, 'w', encoding='utf-8') as file:
+            json.dump({'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5,
+                                 'transport_type': 'Train'}]}, file)
+        self.assertEqual(main(['routing_table.py', routes_path, self.path]), 0)
+        self.assertTrue(os.path.getsize(self.path) > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
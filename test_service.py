@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from service import RouteClient, RouteService
+
+
+GRAPH_DATA = {
+    'Kyiv': [
+        {'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'},
+        {'destination': 'Lviv', 'price': 450, 'duration_hours': 8, 'transport_type': 'Bus'}
+    ],
+    'Lviv': [
+        {'destination': 'Warsaw', 'price': 700, 'duration_hours': 6, 'transport_type': 'Bus'}
+    ],
+    'Warsaw': [],
+    'Lutsk': []
+}
+
+
+class TestRouteService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Запуск сервісу на випадковому локальному порту"""
+        self.service = RouteService(GRAPH_DATA, max_concurrency=2, max_pending=4)
+        await self.service.start()
+        self.client = await RouteClient(*self.service.address).connect()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.service.close()
+
+    async def test_cities(self):
+        """Тест списку міст"""
+        response = await self.client.request({'op': 'cities'})
+        self.assertEqual(response, {'ok': True, 'cities': ['Kyiv', 'Lviv', 'Warsaw', 'Lutsk']})
+
+    async def test_route(self):
+        """Тест пошуку маршруту через сервіс"""
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Warsaw', 'mode': 2})
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['route']['price'], 1150)
+        self.assertEqual(response['route']['cities'], ['Kyiv', 'Lviv', 'Warsaw'])
+
+    async def test_route_filters(self):
+        """Тест бюджету і фільтра видів транспорту в запиті"""
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Lviv', 'mode': 2,
+                                              'modes': ['Train']})
+        self.assertEqual(response['route']['price'], 500)
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Warsaw', 'mode': 1,
+                                              'budget': 1150})
+        self.assertEqual(response['route']['duration'], 14)
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Lviv', 'modes': ['Ship']})
+        self.assertFalse(response['ok'])
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Lviv', 'modes': 'Train'})
+        self.assertFalse(response['ok'])
+        self.assertIn("modes", response['error'])
+
+    async def test_route_not_found(self):
+        """Тест відсутнього маршруту"""
+        response = await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Lutsk', 'mode': 1})
+        self.assertEqual(response, {'ok': True, 'route': None})
+
+    async def test_ticket(self):
+        """Тест оформлення квитка через сервіс"""
+        response = await self.client.request({'op': 'ticket', 'start': 'Kyiv', 'end': 'Lviv', 'mode': 2,
+                                              'baggage': True})
+        self.assertEqual(response['ticket']['price'], 950.0)
+        self.assertIn("Багаж", response['ticket']['description'])
+        for value in ("false", 1, None):
+            response = await self.client.request({'op': 'ticket', 'start': 'Kyiv', 'end': 'Lviv',
+                                                  'insurance': value})
+            self.assertFalse(response['ok'])
+            self.assertIn("insurance", response['error'])
+
+    async def test_errors(self):
+        """Тест помилок у запитах"""
+        self.assertFalse((await self.client.request({'op': 'route', 'start': 'Mars', 'end': 'Kyiv'}))['ok'])
+        self.assertFalse((await self.client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Lviv',
+                                                     'mode': 9}))['ok'])
+        self.assertFalse((await self.client.request({'op': 'fly'}))['ok'])
+        self.assertFalse((await self.client.request([1, 2]))['ok'])
+
+    async def test_concurrent_clients_share_graph(self):
+        """Тест кількох одночасних клієнтів"""
+        async def ask():
+            async with RouteClient(*self.service.address) as client:
+                return await client.request({'op': 'route', 'start': 'Kyiv', 'end': 'Warsaw', 'mode': 1})
+        responses = await asyncio.gather(*(ask() for _ in range(4)))
+        self.assertTrue(all(response['route']['duration'] == 11 for response in responses))
+        self.assertGreaterEqual(self.service.cache.hits, 1)
+
+
+class TestBackpressure(unittest.IsolatedAsyncioTestCase):
+
+    async def test_busy_when_queue_is_full(self):
+        """Тест що переповнена черга отримує busy, а не блокує цикл подій"""
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        service = RouteService(GRAPH_DATA, max_concurrency=1, max_pending=2, executor=executor)
+        await service.start()
+        original = service._route
+        service._route = lambda request: (release.wait(5), original(request))[1]
+        request = {'op': 'route', 'start': 'Kyiv', 'end': 'Lviv', 'mode': 2}
+        try:
+            first = asyncio.create_task(service.handle_request(request))
+            second = asyncio.create_task(service.handle_request(request))
+            await asyncio.sleep(0.05)
+            self.assertEqual(await service.handle_request(request), {'ok': False, 'error': 'busy'})
+            self.assertEqual((await service.handle_request({'op': 'cities'}))['ok'], True)
+            release.set()
+            self.assertTrue((await first)['ok'])
+            self.assertTrue((await second)['ok'])
+            self.assertEqual(service.rejected, 1)
+        finally:
+            release.set()
+            await service.close()
+            executor.shutdown()
+
+    def test_invalid_limits(self):
+        """Тест некоректних обмежень"""
+        with self.assertRaises(ValueError):
+            RouteService(GRAPH_DATA, max_concurrency=4, max_pending=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from graph import compile_graph, PRICE, DURATION, HOPS
+from route import Route
+from route_cache import RouteCache
+from route_builder import CheapestRouteStrategy, FastestRouteStrategy, FewestStopsStrategy, RouteManager
+from shortest_paths import INF, ShortestPathTree, TreeCache
+
+
+class TestShortestPathTree(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [
+                {'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'},
+                {'destination': 'Odesa', 'price': 1200, 'duration_hours': 1, 'transport_type': 'Plane'},
+                {'destination': 'Odesa', 'price': 650, 'duration_hours': 6, 'transport_type': 'Train'}
+            ],
+            'Lviv': [
+                {'destination': 'Warsaw', 'price': 700, 'duration_hours': 6, 'transport_type': 'Bus'}
+            ],
+            'Odesa': [
+                {'destination': 'Warsaw', 'price': 300, 'duration_hours': 20, 'transport_type': 'Bus'}
+            ],
+            'Warsaw': [],
+            'Lutsk': []
+        }
+        self.graph = compile_graph(self.graph_data)
+
+    def test_tree_matches_point_to_point(self):
+        """Тест що дерево дає ті самі маршрути, що й стратегії"""
+        cheapest = ShortestPathTree(self.graph, 'Kyiv', PRICE)
+        fastest = ShortestPathTree(self.graph, 'Kyiv', DURATION)
+        for city in ('Lviv', 'Odesa', 'Warsaw'):
+            self.assertEqual(cheapest.route_to(city).price,
+                             CheapestRouteStrategy().find_route(self.graph, 'Kyiv', city).price)
+            self.assertEqual(fastest.route_to(city).duration,
+                             FastestRouteStrategy().find_route(self.graph, 'Kyiv', city).duration)
+
+    def test_hops_tree(self):
+        """Тест дерева за кількістю сегментів"""
+        tree = ShortestPathTree(self.graph, 'Kyiv', HOPS)
+        self.assertEqual(tree.distance_to('Warsaw'), 2)
+        self.assertEqual(len(tree.route_to('Warsaw').route_list), 2)
+
+    def test_unreachable_destination(self):
+        """Тест недосяжного міста"""
+        tree = ShortestPathTree(self.graph, 'Kyiv', PRICE)
+        self.assertEqual(tree.distance_to('Lutsk'), INF)
+        self.assertEqual(tree.route_to('Lutsk'), [])
+
+    def test_origin_route_is_empty(self):
+        """Тест маршруту до міста відправлення"""
+        route = ShortestPathTree(self.graph, 'Kyiv', PRICE).route_to('Kyiv')
+        self.assertIsInstance(route, Route)
+        self.assertEqual(route.route_list, ())
+
+    def test_hops_origin_route_matches_strategy(self):
+        """Тест що дерево за пересадками до міста відправлення відповідає FewestStopsStrategy"""
+        self.assertEqual(FewestStopsStrategy().find_route(self.graph, 'Kyiv', 'Kyiv'), [])
+        self.assertEqual(ShortestPathTree(self.graph, 'Kyiv', HOPS).route_to('Kyiv'), [])
+        self.assertEqual(TreeCache().route(self.graph, 'Kyiv', 'Kyiv', HOPS), [])
+
+
+class TestTreeCache(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train'}],
+            'Lviv': [{'destination': 'Lutsk', 'price': 150, 'duration_hours': 2, 'transport_type': 'Bus'}],
+            'Lutsk': []
+        }
+        self.graph = compile_graph(self.graph_data)
+
+    def test_tree_reused_across_destinations(self):
+        """Тест що одне дерево обслуговує кілька міст призначення"""
+        trees = TreeCache()
+        self.assertEqual(trees.route(self.graph, 'Kyiv', 'Lviv', PRICE).price, 500)
+        self.assertEqual(trees.route(self.graph, 'Kyiv', 'Lutsk', PRICE).price, 650)
+        self.assertEqual(trees.misses, 1)
+        self.assertEqual(trees.hits, 1)
+
+    def test_graph_change_invalidates(self):
+        """Тест що новий граф скидає збережені дерева"""
+        trees = TreeCache()
+        trees.get(self.graph, 'Kyiv', PRICE)
+        self.graph_data['Kyiv'][0]['price'] = 100
+        tree = trees.get(self.graph_data, 'Kyiv', PRICE)
+        self.assertEqual(tree.distance_to('Lutsk'), 250)
+        self.assertEqual(trees.misses, 2)
+        self.assertEqual(len(trees), 1)
+
+    def test_lru_bound(self):
+        """Тест обмеження кількості дерев"""
+        trees = TreeCache(maxsize=1)
+        trees.get(self.graph, 'Kyiv', PRICE)
+        trees.get(self.graph, 'Lviv', PRICE)
+        self.assertEqual(len(trees), 1)
+
+    def test_manager_uses_trees(self):
+        """Тест RouteManager з деревами найкоротших шляхів"""
+        trees = TreeCache()
+        routes = RouteManager(2, self.graph, 'Kyiv', 'Lutsk', trees=trees).get_routes(['Lviv', 'Lutsk'])
+        self.assertEqual(routes['Lutsk'].price, 650)
+        route = RouteManager(2, self.graph, 'Kyiv', 'Lviv', trees=trees).get_route()
+        self.assertEqual(route.price, 500)
+        self.assertEqual(trees.misses, 1)
+
+    def test_cached_route_drops_parents(self):
+        """Тест що маршрут з дерева потрапляє в кеш без масиву предків"""
+        route = RouteManager(2, self.graph, 'Kyiv', 'Lutsk', cache=RouteCache(), trees=TreeCache()).get_route()
+        self.assertIsNone(route._parents)
+        self.assertEqual(route.edges, tuple(ShortestPathTree(self.graph, 'Kyiv', PRICE).edges_to('Lutsk')))
+        self.assertEqual(route.price, 650)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,15 @@ from ticket import (
     BaggageDecorator,
     InsuranceDecorator,
     PriorityBoardingDecorator,
-    TicketManager
+    TicketManager,
+    CompactTicket,
+    ADDONS,
+    BAGGAGE,
+    INSURANCE,
+    PRIORITY,
+    register_addon
 )
+import bench_ticket
 
 
 class TestSimpleTicket(unittest.TestCase):
@@ -224,5 +231,55 @@ class TestTicketManager(unittest.TestCase):
         self.assertEqual(manager.route, self.route)
 
 
+class TestCompactTicket(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.route = Route('Kyiv', [
+            {'destination': 'Lviv', 'price': 499.9, 'duration_hours': 5, 'transport_type': 'Train'}
+        ])
+
+    def test_matches_decorator_chain(self):
+        """Тест що компактний квиток збігається з ланцюжком декораторів"""
+        for mask in range(8):
+            flags = dict(baggage=bool(mask & 1), insurance=bool(mask & 2), priority=bool(mask & 4))
+            chain = TicketManager(route=self.route, **flags).get_ticket()
+            compact = TicketManager(route=self.route, compact=True, **flags).get_ticket()
+            self.assertIsInstance(compact, CompactTicket)
+            self.assertEqual(compact.get_price(), chain.get_price())
+            self.assertEqual(compact.get_description(), chain.get_description())
+
+    def test_price_and_description_are_cached(self):
+        """Тест що ціна й опис обчислюються один раз"""
+        ticket = CompactTicket(1000.0, "Kyiv - Lviv", BAGGAGE | PRIORITY)
+        description = ticket.get_description()
+        self.assertIs(ticket.get_description(), description)
+        self.assertEqual(ticket.get_price(), 1650.0)
+        self.assertFalse(hasattr(ticket, '__dict__'))
+
+    def test_custom_fees(self):
+        """Тест перевизначених цін послуг"""
+        ticket = CompactTicket(1000.0, "Kyiv - Lviv", BAGGAGE | INSURANCE, fees={BAGGAGE: 300.0})
+        self.assertEqual(ticket.get_price(), 1550.0)
+
+    def test_register_addon(self):
+        """Тест нової послуги"""
+        meal = register_addon('meal', "Харчування", 120.0)
+        self.addCleanup(ADDONS.pop)
+        self.assertEqual(meal, 8)
+        ticket = CompactTicket(1000.0, "Kyiv - Lviv", meal | BAGGAGE)
+        self.assertEqual(ticket.get_price(), 1620.0)
+        self.assertEqual(ticket.get_description(), "Квиток (Kyiv - Lviv), +Багаж, +Харчування")
+        with self.assertRaises(ValueError):
+            register_addon('meal', "Харчування", 120.0)
+
+    def test_benchmark(self):
+        """Тест порівняльного бенчмарку"""
+        results = dict(bench_ticket.run(count=50))
+        for result in results.values():
+            self.assertGreater(result['tickets_per_second'], 0)
+            self.assertGreater(result['allocations'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
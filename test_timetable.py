@@ -0,0 +1,95 @@
+import unittest
+from graph import compile_graph
+from route_builder import EarliestArrivalStrategy, RouteManager
+from timetable import Timetable, TimetableRoute, format_time, parse_time
+
+
+class TestTimetable(unittest.TestCase):
+
+    def setUp(self):
+        """Ініціалізація тестових даних"""
+        self.graph_data = {
+            'Kyiv': [
+                {'destination': 'Lviv', 'price': 500, 'duration_hours': 5, 'transport_type': 'Train',
+                 'departures': ['07:00', '12:00']},
+                {'destination': 'Warsaw', 'price': 1800, 'duration_hours': 1.5, 'transport_type': 'Plane',
+                 'departures': ['18:00']}
+            ],
+            'Lviv': [
+                {'destination': 'Warsaw', 'price': 700, 'duration_hours': 6, 'transport_type': 'Bus',
+                 'departures': ['13:00', '19:00']}
+            ],
+            'Warsaw': [],
+            'Lutsk': []
+        }
+        self.graph = compile_graph(self.graph_data)
+        self.timetable = Timetable.from_graph(self.graph, days=2, transfer_minutes=30)
+
+    def test_time_helpers(self):
+        """Тест перетворення часу"""
+        self.assertEqual(parse_time('09:30'), 570)
+        self.assertEqual(parse_time(15), 15)
+        self.assertEqual(format_time(570), '09:30')
+        self.assertEqual(format_time(1440 + 60), '01:00 (+1)')
+
+    def test_connections_sorted(self):
+        """Тест що сполучення відсортовані за часом відправлення"""
+        self.assertEqual(len(self.timetable), 10)
+        self.assertEqual(list(self.timetable.dep_times), sorted(self.timetable.dep_times))
+
+    def test_earliest_arrival_with_waiting(self):
+        """Тест що враховується очікування на пересадці"""
+        route = self.timetable.journey('Kyiv', 'Warsaw', '06:00')
+        self.assertIsInstance(route, TimetableRoute)
+        #07:00-12:00 потягом, 13:00-19:00 автобусом
+        self.assertEqual(route.arrival, parse_time('19:00'))
+        self.assertEqual(route.travel_minutes, 13 * 60)
+        self.assertEqual(route.route_list[1]['departure'], '13:00')
+
+    def test_transfer_time_respected(self):
+        """Тест мінімального часу пересадки"""
+        #потяг о 12:00 і автобус о 19:00 прибувають лише вночі, тож кращий - літак о 18:00
+        route = self.timetable.journey('Kyiv', 'Warsaw', '11:00')
+        self.assertEqual(route.arrival, parse_time('19:30'))
+        self.assertEqual(route.cities, ('Kyiv', 'Warsaw'))
+        strict = Timetable.from_graph(self.graph, days=2, transfer_minutes=90)
+        self.assertEqual(strict.journey('Kyiv', 'Warsaw', '06:00').arrival, parse_time('19:30'))
+
+    def test_overnight(self):
+        """Тест подорожі на наступну добу"""
+        route = self.timetable.journey('Kyiv', 'Lviv', '20:00')
+        self.assertEqual(route.route_list[0]['departure'], '07:00 (+1)')
+
+    def test_no_connection(self):
+        """Тест відсутнього сполучення"""
+        self.assertEqual(self.timetable.journey('Kyiv', 'Lutsk', '06:00'), [])
+
+    def test_profile(self):
+        """Тест профільного запиту"""
+        source, target = self.graph.index['Kyiv'], self.graph.index['Warsaw']
+        profile = self.timetable.profile(source, target, parse_time('06:00'), parse_time('23:59'))
+        self.assertEqual(profile, [(parse_time('07:00'), parse_time('19:00')),
+                                   (parse_time('18:00'), parse_time('19:30'))])
+        for departure, arrival in profile:
+            self.assertEqual(self.timetable.earliest_arrival(source, target, departure)[0], arrival)
+
+    def test_default_departures(self):
+        """Тест розкладу за замовчуванням для сегментів без рейсів"""
+        graph = compile_graph({'Kyiv': [{'destination': 'Lviv', 'price': 500, 'duration_hours': 5,
+                                         'transport_type': 'Train'}]})
+        route = Timetable.from_graph(graph).journey('Kyiv', 'Lviv', '09:00')
+        self.assertEqual(route.route_list[0]['departure'], '14:00')
+
+    def test_route_manager_mode(self):
+        """Тест пошуку за розкладом через RouteManager"""
+        route = RouteManager(4, self.graph, 'Kyiv', 'Warsaw', departure='06:00',
+                             timetable=self.timetable).get_route()
+        self.assertEqual(route.arrival, parse_time('19:00'))
+        self.assertEqual(EarliestArrivalStrategy('11:00', self.timetable)
+                         .find_route(self.graph, 'Kyiv', 'Warsaw').arrival, parse_time('19:30'))
+        with self.assertRaises(ValueError):
+            RouteManager(4, self.graph, 'Kyiv', 'Warsaw')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
 from route import Route
+import events
+from events import DEBUG
+
+#ціни додаткових послуг, з якими TicketManager оформлює квиток
+BAGGAGE_PRICE = 500.0
+INSURANCE_PRICE = 250.0
+PRIORITY_PRICE = 150.0
 
 
 class ITicket(ABC):
+    #порожні __slots__, щоб CompactTicket не мав __dict__
+    __slots__ = ()
+
     @abstractmethod
     def get_price(self) -> float:
         pass
@@ -73,22 +84,97 @@ class PriorityBoardingDecorator(TicketDecorator):
         return f"{super().get_description()}, +Пріоритетна посадка"
     
 
+class Addon(NamedTuple):
+    """Додаткова послуга компактного квитка: біт у масці, позначка в описі, ціна."""
+    flag: int
+    name: str
+    label: str
+    price: float
+
+
+#зареєстровані послуги в порядку, в якому їх додає TicketManager
+ADDONS: List[Addon] = []
+
+
+def register_addon(name: str, label: str, price: float) -> int:
+    """Реєструє нову послугу і повертає її біт для маски CompactTicket."""
+    if any(addon.name == name for addon in ADDONS):
+        raise ValueError(f"Послуга {name} вже зареєстрована")
+    flag = 1 << len(ADDONS)
+    ADDONS.append(Addon(flag, name, label, price))
+    return flag
+
+
+BAGGAGE = register_addon('baggage', "Багаж", BAGGAGE_PRICE)
+INSURANCE = register_addon('insurance', "Страхування", INSURANCE_PRICE)
+PRIORITY = register_addon('priority', "Пріоритетна посадка", PRIORITY_PRICE)
+
+
+def addon_mask(baggage: bool = False, insurance: bool = False, priority: bool = False) -> int:
+    return (BAGGAGE if baggage else 0) | (INSURANCE if insurance else 0) | (PRIORITY if priority else 0)
+
+
+class CompactTicket(ITicket):
+    """Квиток без ланцюжка декораторів: базова ціна і маска послуг.
+
+    Ціна й опис обчислюються один раз і кешуються. Збори додаються в порядку
+    реєстрації послуг, тож ціна збігається з відповідним ланцюжком декораторів.
+    ``fees`` перевизначає ціни окремих послуг (біт -> ціна).
+    """
+
+    __slots__ = ('base_price', 'route', 'flags', 'fees', '_price', '_description')
+
+    def __init__(self, base_price: float, route: str, flags: int = 0, fees: Optional[Dict[int, float]] = None):
+        self.base_price = base_price
+        self.route = route
+        self.flags = flags
+        self.fees = fees
+        self._price = None
+        self._description = None
+
+    def get_price(self) -> float:
+        if self._price is None:
+            price = self.base_price
+            flags = self.flags
+            fees = self.fees
+            for addon in ADDONS:
+                if flags & addon.flag:
+                    price += addon.price if fees is None else fees.get(addon.flag, addon.price)
+            self._price = price
+        return self._price
+
+    def get_description(self) -> str:
+        if self._description is None:
+            labels = [f", +{addon.label}" for addon in ADDONS if self.flags & addon.flag]
+            self._description = f"Квиток ({self.route})" + ''.join(labels)
+        return self._description
+
+
 class TicketManager:
-    def __init__(self, baggage: bool, insurance: bool, priority: bool, route: Route):
+    def __init__(self, baggage: bool, insurance: bool, priority: bool, route: Route, compact: bool = False):
         self.baggage = baggage
         self.insurance = insurance
         self.priority = priority
         self.route = route
+        #компактний квиток замість ланцюжка декораторів
+        self.compact = compact
     
     def get_ticket(self):
-        ticket = SimpleTicket(self.route.get_price(), route = f"{self.route.cities[0]} - {self.route.cities[-1]}")
-        print(self.baggage + self.insurance)
+        route = f"{self.route.cities[0]} - {self.route.cities[-1]}"
+        if events.enabled(DEBUG):
+            events.emit(DEBUG, 'ticket.addons', "Додаткові послуги: багаж={baggage}, страхування={insurance}, "
+                        "пріоритетна посадка={priority}", baggage=self.baggage, insurance=self.insurance,
+                        priority=self.priority)
+        if self.compact:
+            return CompactTicket(self.route.get_price(), route,
+                                 addon_mask(self.baggage, self.insurance, self.priority))
+        ticket = SimpleTicket(self.route.get_price(), route = route)
         if self.baggage:
-            ticket =  BaggageDecorator(ticket, baggage_price=500.0)
+            ticket =  BaggageDecorator(ticket, baggage_price=BAGGAGE_PRICE)
         if self.insurance:
-            ticket = InsuranceDecorator(ticket, insurance_price=250.0)
+            ticket = InsuranceDecorator(ticket, insurance_price=INSURANCE_PRICE)
         if self.priority:
-            ticket = PriorityBoardingDecorator(ticket, priority_price=150.0)
+            ticket = PriorityBoardingDecorator(ticket, priority_price=PRIORITY_PRICE)
         
         return ticket 
 
@@ -0,0 +1,182 @@
+from array import array
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import List, Optional, Sequence, Tuple, Union
+
+from graph import CompiledGraph, compile_graph
+from route import Route
+
+INF = float('inf')
+MINUTES_PER_DAY = 24 * 60
+
+#розклад за замовчуванням для сегментів без поля "departures"
+DEFAULT_DEPARTURES = ('08:00', '14:00', '20:00')
+
+
+def parse_time(value: Union[str, int]) -> int:
+    """'HH:MM' -> хвилини від початку першої доби; ціле число повертається як є."""
+    if isinstance(value, int):
+        return value
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def format_time(minutes: int) -> str:
+    day, minute = divmod(int(minutes), MINUTES_PER_DAY)
+    text = f"{minute // 60:02d}:{minute % 60:02d}"
+    return f"{text} (+{day})" if day else text
+
+
+class TimetableRoute(Route):
+    """Маршрут за розкладом: сегменти доповнені часом відправлення та прибуття."""
+
+    __slots__ = ('departure', 'arrival')
+
+    def __init__(self, start_city: str, route_list: List, departure: int, arrival: int,
+                 nodes_settled: Optional[int] = None):
+        super().__init__(start_city, route_list, nodes_settled)
+        object.__setattr__(self, 'departure', departure)
+        object.__setattr__(self, 'arrival', arrival)
+
+    @property
+    def travel_minutes(self) -> int:
+        #разом з очікуванням на пересадках
+        return self.arrival - self.departure
+
+
+class Timetable:
+    """Розклад як масиви сполучень, відсортовані за часом відправлення (для CSA).
+
+    Кожне сполучення - один рейс сегмента графа: ``dep_stops[i] -> arr_stops[i]``
+    з ``dep_times[i]`` до ``arr_times[i]`` (хвилини), ``edges[i]`` - ребро графа.
+    """
+
+    def __init__(self, graph: CompiledGraph, connections: Sequence[Tuple[int, int, int]],
+                 transfer_minutes: int = 0):
+        self.graph = graph
+        self.transfer_minutes = transfer_minutes
+        ordered = sorted(connections)
+        self.dep_times = array('l', (dep for dep, _, _ in ordered))
+        self.arr_times = array('l', (arr for _, arr, _ in ordered))
+        self.edges = array('l', (edge for _, _, edge in ordered))
+        self.dep_stops = array('l', (graph.sources[edge] for _, _, edge in ordered))
+        self.arr_stops = array('l', (graph.targets[edge] for _, _, edge in ordered))
+
+    @classmethod
+    def from_graph(cls, graph_data, days: int = 2, default_departures=DEFAULT_DEPARTURES,
+                   transfer_minutes: int = 0) -> 'Timetable':
+        """Будує розклад з поля ``departures`` сегментів, повторюючи його ``days`` діб."""
+        graph = compile_graph(graph_data)
+        connections = []
+        for edge in range(graph.edge_count):
+            segment = graph.segment(edge)
+            departures = segment.get('departures', default_departures) or ()
+            travel = round(graph.durations[edge] * 60)
+            for departure in departures:
+                start = parse_time(departure)
+                for day in range(days):
+                    dep = start + day * MINUTES_PER_DAY
+                    connections.append((dep, dep + travel, edge))
+        return cls(graph, connections, transfer_minutes)
+
+    @classmethod
+    def for_graph(cls, graph_data) -> 'Timetable':
+        graph = compile_graph(graph_data)
+        return graph.cached('timetable', cls.from_graph)
+
+    def __len__(self) -> int:
+        return len(self.dep_times)
+
+    def earliest_arrival(self, source: int, target: int, departure: int):
+        """CSA: найраніше прибуття, якщо вирушити з source не раніше departure.
+
+        Повертає (час прибуття, номери сполучень шляху, переглянуто сполучень).
+        """
+        dep_times = self.dep_times
+        arr_times = self.arr_times
+        dep_stops = self.dep_stops
+        arr_stops = self.arr_stops
+        transfer = self.transfer_minutes
+
+        #час, з якого можна вирушати з міста (з урахуванням пересадки)
+        ready = [INF] * self.graph.node_count
+        arrival = [INF] * self.graph.node_count
+        incoming = [-1] * self.graph.node_count
+        ready[source] = departure
+        arrival[source] = departure
+
+        scanned = 0
+        for i in range(bisect_left(dep_times, departure), len(dep_times)):
+            dep = dep_times[i]
+            if dep >= arrival[target]:
+                break
+            scanned += 1
+            if ready[dep_stops[i]] <= dep:
+                stop = arr_stops[i]
+                arr = arr_times[i]
+                if arr < arrival[stop]:
+                    arrival[stop] = arr
+                    ready[stop] = arr + transfer
+                    incoming[stop] = i
+
+        if arrival[target] == INF:
+            return INF, None, scanned
+        connections = []
+        stop = target
+        while stop != source:
+            i = incoming[stop]
+            connections.append(i)
+            stop = dep_stops[i]
+        connections.reverse()
+        return arrival[target], connections, scanned
+
+    def profile(self, source: int, target: int, earliest: int = 0, latest: Optional[int] = None):
+        """Профільний CSA: усі Парето-оптимальні пари (відправлення, прибуття) у вікні часу."""
+        dep_times = self.dep_times
+        arr_times = self.arr_times
+        dep_stops = self.dep_stops
+        arr_stops = self.arr_stops
+        transfer = self.transfer_minutes
+        #профіль міста: пари (відправлення, прибуття в target) зі спадним часом відправлення
+        profiles = [[] for _ in range(self.graph.node_count)]
+
+        last = len(dep_times) if latest is None else bisect_left(dep_times, latest + 1)
+        first = bisect_left(dep_times, earliest)
+        for i in range(last - 1, first - 1, -1):
+            stop = arr_stops[i]
+            if stop == target:
+                best = arr_times[i]
+            else:
+                best = INF
+                ready = arr_times[i] + transfer
+                for dep, arr in reversed(profiles[stop]):
+                    if dep >= ready:
+                        best = arr
+                        break
+            if best == INF:
+                continue
+            origin = profiles[dep_stops[i]]
+            if origin and origin[-1][1] <= best:
+                continue
+            if origin and origin[-1][0] == dep_times[i]:
+                origin[-1] = (dep_times[i], best)
+            else:
+                origin.append((dep_times[i], best))
+
+        return list(reversed(profiles[source]))
+
+    def journey(self, start_point: str, end_point: str, departure: Union[str, int]):
+        graph = self.graph
+        source = graph.index[start_point]
+        target = graph.index[end_point]
+        departure = parse_time(departure)
+        arrival, connections, scanned = self.earliest_arrival(source, target, departure)
+        if connections is None:
+            return []
+        segments = []
+        for i in connections:
+            segment = dict(graph.segment(self.edges[i]))
+            segment['departure'] = format_time(self.dep_times[i])
+            segment['arrival'] = format_time(self.arr_times[i])
+            segments.append(MappingProxyType(segment))
+        return TimetableRoute(start_point, segments, departure, arrival, scanned)